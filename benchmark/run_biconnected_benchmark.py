@@ -0,0 +1,73 @@
+"""
+Measure the search of articulation points, bridges and biconnected
+components on the integer dovetail adjacency.
+
+For each size given, build a chain of that many segments with a
+tenth as many random overlaps added, directly as CSR lists (as a
+FrozenGFA keeps them), and report the time of the search with and
+without the biconnected components.
+For each GFA file given, report the time of
+`dovetails_articulation_points` on the graph and on the frozen graph.
+
+Usage: python3 run_biconnected_benchmark.py size1 [size2 ...] [graph1.gfa ...]
+"""
+import sys
+import time
+sys.path.insert(1, '../')
+import numpy as np
+import pygfa
+from pygfa import frozen_gfa
+from pygfa.dovetail_operations.components import biconnected
+
+def adjacency(size, seed=0):
+    random = np.random.RandomState(seed)
+    chain = np.arange(size - 1)
+    extra = random.randint(0, size, size=(size // 10, 2))
+    ends = np.concatenate((np.stack((chain, chain + 1), axis=1), extra))
+    pointers, columns, edges = frozen_gfa._incidences(\
+                                    size, ends, np.arange(len(ends)))
+    return pointers.tolist(), columns.tolist(), edges.tolist()
+
+def run_array_benchmark(size):
+    lists = adjacency(size)
+    ts = time.time()
+    articulation_points, bridges, _ = biconnected.biconnected_ids(*lists)
+    te_points = time.time()
+    _, _, components = biconnected.biconnected_ids(*lists, components=True)
+    te = time.time()
+    data = [size, \
+            len(articulation_points), \
+            len(bridges), \
+            len(components), \
+            "{0:f}".format(te_points - ts), \
+            "{0:f}".format(te - te_points)]
+    return str.join("\t", [str(x) for x in data])
+
+def run_graph_benchmark(file_path):
+    gfa_ = pygfa.gfa.GFA.from_file(file_path)
+    frozen = gfa_.freeze()
+    ts = time.time()
+    count = len(list(pygfa.dovetails_articulation_points(gfa_)))
+    te_graph = time.time()
+    list(pygfa.dovetails_articulation_points(frozen))
+    te = time.time()
+    data = [file_path, \
+            len(gfa_.nodes()), \
+            count, \
+            "{0:f}".format(te_graph - ts), \
+            "{0:f}".format(te - te_graph)]
+    return str.join("\t", [str(x) for x in data])
+
+if __name__ == "__main__":
+    sizes = [arg for arg in sys.argv[1:] if arg.isdigit()]
+    files = [arg for arg in sys.argv[1:] if not arg.isdigit()]
+    if sizes:
+        print(str.join("\t", ["segments", "articulation_points", "bridges", \
+                              "components", "points_s", "components_s"]))
+        for size in sizes:
+            print(run_array_benchmark(int(size)))
+    if files:
+        print(str.join("\t", ["file", "segments", "articulation_points", \
+                              "graph_s", "frozen_s"]))
+        for file_ in files:
+            print(run_graph_benchmark(file_))
@@ -0,0 +1,58 @@
+"""
+Measure the scaling of the parallel dump.
+
+For each file given, load it once, then serialize it with an
+increasing number of processes and report the dump time and the
+speedup with respect to the sequential `GFA.dump`. The time of the
+sequential dump with the `trusted` validation level, that uses the
+copy-free serializers, is reported too.
+Graphs with more than a million elements can be generated with
+randomgraph.py, for example:
+
+    python3 randomgraph.py -s 500000 -w > random_500k.gfa
+
+Usage: python3 run_dump_benchmark.py max_workers gfa_version graph1.gfa [graph2.gfa ...]
+"""
+import os
+import sys
+import time
+sys.path.insert(1, '../')
+import pygfa
+
+def dump_time(gfa_, gfa_version, workers, validation=None):
+    ts = time.time()
+    dump_ = gfa_.dump(gfa_version, workers=workers, validation=validation)
+    te = time.time()
+    return te - ts, dump_
+
+def run_dump_benchmark(file_path, max_workers, gfa_version):
+    gfa_ = pygfa.gfa.GFA.from_file(file_path, mode="records")
+    sequential, sequential_dump = dump_time(gfa_, gfa_version, None)
+    trusted, trusted_dump = dump_time(gfa_, gfa_version, None, "trusted")
+    results = []
+    workers = 2
+    while workers <= max_workers:
+        elapsed, dump_ = dump_time(gfa_, gfa_version, workers)
+        data = [file_path, \
+                len(gfa_.nodes()), \
+                len(gfa_.edges()), \
+                gfa_version, \
+                workers, \
+                "{0:f}".format(sequential), \
+                "{0:f}".format(trusted), \
+                "{0:f}".format(elapsed), \
+                "{0:.2f}".format(sequential / elapsed if elapsed else 0), \
+                dump_ == sequential_dump == trusted_dump]
+        results.append(str.join("\t", [str(x) for x in data]))
+        workers *= 2
+    return str.join("\n", results)
+
+if __name__ == "__main__":
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    gfa_version = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    print(str.join("\t", ["file", "nodes", "edges", "gfa_version", \
+                          "workers", "sequential_s", "trusted_s", \
+                          "parallel_s", \
+                          "speedup", "same_output"]))
+    for file_ in sys.argv[3:]:
+        print(run_dump_benchmark(file_, max_workers, gfa_version))
@@ -0,0 +1,70 @@
+"""
+Measure the memory and the construction time of the graph elements.
+
+For each class (Field, OptField, Node and Edge, built both from
+their values and from a parsed line) build many objects, then report
+the memory allocated for each object, with its attribute dictionary
+if it has one, and the time to build one of them.
+
+Usage: python3 run_element_benchmark.py [objects]
+"""
+import sys
+import time
+import tracemalloc
+sys.path.insert(1, '../')
+import pygfa
+from pygfa.graph_element import node, edge as ge
+from pygfa.graph_element.parser import line, segment, edge
+
+SEGMENT_LINE = "S\ts1\t8\tACGTACGT\tRC:i:12\tKC:i:40"
+EDGE_LINE = "E\te1\ts1+\ts2-\t4\t8$\t0\t4\t4M\tRC:i:3\tzz:Z:tag"
+
+def factories():
+    segment_line = segment.SegmentV2.from_string(SEGMENT_LINE)
+    edge_line = edge.Edge.from_string(EDGE_LINE)
+    opt_fields = {"RC": line.OptField("RC", "3", "i"), \
+                  "zz": line.OptField("zz", "tag", "Z")}
+    return [("Field", lambda: line.Field("eid", "e1")), \
+            ("OptField", lambda: line.OptField("RC", "12", "i")), \
+            ("Node", lambda: node.Node("s1", "ACGTACGT", 8, opt_fields)), \
+            ("Node.from_line", lambda: node.Node.from_line(segment_line)), \
+            ("Edge", lambda: ge.Edge("e1", "s1", "+", "s2", "-", \
+                                     ("4", "8$"), ("0", "4"), "4M", \
+                                     opt_fields=opt_fields, \
+                                     is_dovetail=True)), \
+            ("Edge.from_line", lambda: ge.Edge.from_line(edge_line))]
+
+def object_memory(factory, objects):
+    """Return the bytes allocated for each object, with its
+    attributes that are not shared with the other objects.
+    """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    kept = [factory() for _ in range(objects)]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del kept
+    return size / objects
+
+def construction_time(factory, objects):
+    ts = time.time()
+    for _ in range(objects):
+        factory()
+    te = time.time()
+    return (te - ts) / objects
+
+def run_element_benchmark(objects):
+    results = []
+    for name, factory in factories():
+        data = [name, \
+                objects, \
+                "{0:.1f}".format(object_memory(factory, objects)), \
+                "{0:.3f}".format(construction_time(factory, objects) * 1e6)]
+        results.append(str.join("\t", [str(x) for x in data]))
+    return str.join("\n", results)
+
+if __name__ == "__main__":
+    objects = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(str.join("\t", ["class", "objects", "bytes_per_object", \
+                          "construction_us"]))
+    print(run_element_benchmark(objects))
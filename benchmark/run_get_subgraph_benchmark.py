@@ -0,0 +1,54 @@
+"""
+Measure `get_subgraph` on a path with thousands of segments.
+
+For each size given, build a linear graph of that many segments,
+with an O group that goes through all its segments and edges, then
+report the time of `get_subgraph` on the group and the time of a
+thousand membership tests of keys that are not in the graph (that
+used to scan all the edges).
+
+Usage: python3 run_get_subgraph_benchmark.py size1 [size2 ...]
+"""
+import sys
+import time
+sys.path.insert(1, '../')
+import pygfa
+
+def linear_graph(size):
+    lines = ["H\tVN:Z:2.0"]
+    elements = []
+    for nid in range(size):
+        lines.append("S\ts{0}\t8\tACGTACGT".format(nid))
+        elements.append("s{0}+".format(nid))
+        if nid > 0:
+            lines.append("E\te{0}\ts{1}+\ts{0}+\t4\t8$\t0\t4\t4M"\
+                         .format(nid, nid - 1))
+            elements.append("e{0}+".format(nid))
+    lines.append("O\tpath\t" + str.join(" ", elements))
+    gfa_ = pygfa.gfa.GFA()
+    gfa_.from_string(str.join("\n", lines))
+    return gfa_, len(elements)
+
+def run_get_subgraph_benchmark(size):
+    gfa_, elements = linear_graph(size)
+    ts = time.time()
+    subgraph_ = gfa_.get_subgraph("path")
+    te = time.time()
+    ts_contains = time.time()
+    for key in range(1000):
+        key in gfa_
+    te_contains = time.time()
+    data = [size, \
+            elements, \
+            len(subgraph_.nodes()), \
+            len(subgraph_.edges()), \
+            "{0:f}".format(te - ts), \
+            "{0:f}".format(te_contains - ts_contains)]
+    return str.join("\t", [str(x) for x in data])
+
+if __name__ == "__main__":
+    print(str.join("\t", ["segments", "path_elements", "subgraph_nodes", \
+                          "subgraph_edges", "get_subgraph_s", \
+                          "1000_misses_s"]))
+    for size in sys.argv[1:]:
+        print(run_get_subgraph_benchmark(int(size)))
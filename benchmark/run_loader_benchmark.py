@@ -0,0 +1,51 @@
+"""
+Measure the throughput of the streaming loader.
+
+For each file given report the number of lines and bytes read,
+the loading time, the throughput (lines/s and MB/s) and the
+peak of memory allocated while loading, so it's possible to check
+that memory usage follows the graph size and not the file size.
+
+Usage: python3 run_loader_benchmark.py graph1.gfa [graph2.gfa ...]
+"""
+import os
+import sys
+import time
+import tracemalloc
+sys.path.insert(1, '../')
+import pygfa
+
+MEGABYTE = 1024 * 1024
+
+def count_lines(file_path):
+    with open(file_path) as file_handler:
+        return sum(1 for _ in file_handler)
+
+def run_loader_benchmark(file_path, end=""):
+    lines = count_lines(file_path)
+    size = os.path.getsize(file_path)
+
+    tracemalloc.start()
+    ts = time.time()
+    gfa_ = pygfa.gfa.GFA.from_file(file_path)
+    te = time.time()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    elapsed = te - ts
+    data = [file_path, \
+            lines, \
+            size, \
+            "{0:f}".format(elapsed), \
+            "{0:.1f}".format(lines / elapsed if elapsed else 0), \
+            "{0:.3f}".format(size / MEGABYTE / elapsed if elapsed else 0), \
+            "{0:.3f}".format(peak / MEGABYTE), \
+            len(gfa_.nodes()), \
+            len(gfa_.edges())]
+    return str.join("\t", [str(x) for x in data]) + end
+
+if __name__ == "__main__":
+    print(str.join("\t", ["file", "lines", "bytes", "seconds", \
+                          "lines/s", "MB/s", "peak_MB", "nodes", "edges"]))
+    for file_ in sys.argv[1:]:
+        print(run_loader_benchmark(file_))
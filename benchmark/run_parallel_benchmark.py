@@ -0,0 +1,48 @@
+"""
+Measure the scaling of the parallel loader.
+
+For each file given, load it with an increasing number of
+processes and report the loading time and the speedup with
+respect to the sequential loader.
+
+Usage: python3 run_parallel_benchmark.py max_workers graph1.gfa [graph2.gfa ...]
+"""
+import os
+import sys
+import time
+sys.path.insert(1, '../')
+import pygfa
+
+MEGABYTE = 1024 * 1024
+
+def load_time(file_path, workers):
+    ts = time.time()
+    gfa_ = pygfa.gfa.GFA.from_file(file_path, workers=workers)
+    te = time.time()
+    return te - ts, gfa_
+
+def run_parallel_benchmark(file_path, max_workers):
+    size = os.path.getsize(file_path)
+    sequential, _ = load_time(file_path, None)
+    results = []
+    workers = 1
+    while workers <= max_workers:
+        elapsed, gfa_ = load_time(file_path, workers)
+        data = [file_path, \
+                size, \
+                workers, \
+                "{0:f}".format(elapsed), \
+                "{0:.3f}".format(size / MEGABYTE / elapsed if elapsed else 0), \
+                "{0:.2f}".format(sequential / elapsed if elapsed else 0), \
+                len(gfa_.nodes()), \
+                len(gfa_.edges())]
+        results.append(str.join("\t", [str(x) for x in data]))
+        workers *= 2
+    return str.join("\n", results)
+
+if __name__ == "__main__":
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    print(str.join("\t", ["file", "bytes", "workers", "seconds", \
+                          "MB/s", "speedup", "nodes", "edges"]))
+    for file_ in sys.argv[2:]:
+        print(run_parallel_benchmark(file_, max_workers))
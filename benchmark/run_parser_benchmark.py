@@ -0,0 +1,49 @@
+"""
+Compare the load time of the two parse modes.
+
+`lines` mode builds Line and Field objects for every line before
+converting them into graph elements, `records` mode builds the
+graph attributes directly from the fields of the line.
+The records mode is also measured with the `trusted` validation
+level, that skips the checks of the fields, and the `lazy` mode,
+that decodes the optional fields only when accessed.
+Graphs can be generated with randomgraph.py, for example:
+
+    python3 randomgraph.py -s 100000 -w > random_100k.gfa
+
+Usage: python3 run_parser_benchmark.py graph1.gfa [graph2.gfa ...]
+"""
+import os
+import sys
+import time
+sys.path.insert(1, '../')
+import pygfa
+
+def load_time(file_path, mode, validation=None):
+    ts = time.time()
+    gfa_ = pygfa.gfa.GFA.from_file(file_path, mode=mode, validation=validation)
+    te = time.time()
+    return te - ts, gfa_
+
+def run_parser_benchmark(file_path, end=""):
+    lines_time, lines_gfa = load_time(file_path, "lines")
+    records_time, _ = load_time(file_path, "records")
+    trusted_time, _ = load_time(file_path, "records", "trusted")
+    lazy_time, _ = load_time(file_path, "lazy")
+    data = [file_path, \
+            os.path.getsize(file_path), \
+            len(lines_gfa.nodes()), \
+            len(lines_gfa.edges()), \
+            "{0:f}".format(lines_time), \
+            "{0:f}".format(records_time), \
+            "{0:f}".format(trusted_time), \
+            "{0:f}".format(lazy_time), \
+            "{0:.2f}".format(lines_time / records_time if records_time else 0)]
+    return str.join("\t", [str(x) for x in data]) + end
+
+if __name__ == "__main__":
+    print(str.join("\t", ["file", "bytes", "nodes", "edges", \
+                          "lines_s", "records_s", \
+                          "trusted_s", "lazy_s", "speedup"]))
+    for file_ in sys.argv[1:]:
+        print(run_parser_benchmark(file_))
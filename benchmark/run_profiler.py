@@ -44,6 +44,10 @@ def compute_linear_paths(gfa_):
     linear_paths = list(pygfa.dovetails_linear_paths(gfa_))
     return len(linear_paths)
 
+@timeit
+def freeze_graph(gfa_):
+    return gfa_.freeze()
+
 @timeit
 def compute_overlap_consistency(gfa_):
     edges_no_consistency, edges_no_calculate = pygfa.gfa.GFA.overlap_consistency(gfa_)
@@ -69,6 +73,10 @@ def run_profiler(file_, end=""):
     nodes, edges = compute_elements(gfa_, log_data=data)
     cc, dov_cc = compute_connected_components(gfa_, log_data=data)
     lin_paths = compute_linear_paths(gfa_, log_data=data)
+    # the same operations on the frozen graph
+    frozen_gfa = freeze_graph(gfa_, log_data=data)
+    compute_connected_components(frozen_gfa, log_data=data)
+    compute_linear_paths(frozen_gfa, log_data=data)
     data.extend([nodes, edges, cc, dov_cc, lin_paths, asizeof.asizeof(gfa_)])
     return str.join("\t", [str(x) for x in data]) + end
 
@@ -0,0 +1,53 @@
+"""
+Compare the time to load a graph from its GFA file with the time to
+load it from a binary snapshot.
+
+The GFA files are parsed both with the default `lines` mode and the
+faster `records` mode; the snapshot is written next to each file
+(with the `.snapshot` extension) and removed at the end.
+Graphs can be generated with randomgraph.py, for example:
+
+    python3 randomgraph.py -s 100000 -w > random_100k.gfa
+
+Usage: python3 run_snapshot_benchmark.py graph1.gfa [graph2.gfa ...]
+"""
+import os
+import sys
+import time
+sys.path.insert(1, '../')
+import pygfa
+
+def timed(function, *args, **kwargs):
+    ts = time.time()
+    result = function(*args, **kwargs)
+    te = time.time()
+    return te - ts, result
+
+def run_snapshot_benchmark(file_path, end=""):
+    snapshot_path = file_path + ".snapshot"
+    lines_time, gfa_ = timed(pygfa.gfa.GFA.from_file, file_path)
+    records_time, _ = timed(pygfa.gfa.GFA.from_file, file_path, \
+                            mode="records")
+    save_time, _ = timed(gfa_.save_snapshot, snapshot_path)
+    load_time, snapshot_gfa = timed(pygfa.gfa.GFA.load_snapshot, \
+                                    snapshot_path)
+    data = [file_path, \
+            os.path.getsize(file_path), \
+            os.path.getsize(snapshot_path), \
+            len(snapshot_gfa.nodes()), \
+            len(snapshot_gfa.edges()), \
+            "{0:f}".format(lines_time), \
+            "{0:f}".format(records_time), \
+            "{0:f}".format(save_time), \
+            "{0:f}".format(load_time), \
+            "{0:.2f}".format(lines_time / load_time if load_time else 0)]
+    os.remove(snapshot_path)
+    return str.join("\t", [str(x) for x in data]) + end
+
+if __name__ == "__main__":
+    print(str.join("\t", ["file", "bytes", "snapshot_bytes", \
+                          "nodes", "edges", \
+                          "lines_s", "records_s", \
+                          "save_s", "load_s", "speedup"]))
+    for file_ in sys.argv[1:]:
+        print(run_snapshot_benchmark(file_))
@@ -0,0 +1,66 @@
+"""
+Measure the tip clipping.
+
+For each size given, build a chain of that many segments of 100bp
+with a tenth as many tips of up to three 5bp segments attached to it,
+some of them with a shorter tip attached in turn, and report the
+time of `dovetails_clip_tips` and of calling `dovetails_remove_dead_ends`
+until nothing is removed, with the number of calls needed.
+
+Usage: python3 run_tip_benchmark.py size1 [size2 ...]
+"""
+import sys
+import time
+sys.path.insert(1, '../')
+import numpy as np
+import pygfa
+
+def tips_graph(size, seed=0):
+    random = np.random.RandomState(seed)
+    lines = ["S\ts{0}\t*\tLN:i:100".format(x) for x in range(size)]
+    lines += ["L\ts{0}\t+\ts{1}\t+\t*".format(x, x + 1) \
+              for x in range(size - 1)]
+    for tip in range(size // 10):
+        previous = "s{0}".format(random.randint(1, size - 1))
+        for segment in range(random.randint(1, 4)):
+            nid = "t{0}_{1}".format(tip, segment)
+            lines.append("S\t{0}\t*\tLN:i:5".format(nid))
+            lines.append("L\t{0}\t+\t{1}\t+\t*".format(previous, nid))
+            previous = nid
+        if random.rand() < 0.3:
+            lines.append("S\tu{0}\t*\tLN:i:5".format(tip))
+            lines.append("L\tt{0}_0\t+\tu{0}\t+\t*".format(tip))
+    gfa_ = pygfa.gfa.GFA()
+    gfa_.from_string(str.join("\n", lines))
+    return gfa_
+
+def run_benchmark(size):
+    gfa_ = tips_graph(size)
+    ts = time.time()
+    pygfa.dovetails_clip_tips(gfa_, 50)
+    te_clip = time.time()
+    clipped = len(gfa_.nodes())
+
+    gfa_ = tips_graph(size)
+    rounds = 0
+    before = None
+    ts_rounds = time.time()
+    while before != len(gfa_.nodes()):
+        before = len(gfa_.nodes())
+        pygfa.dovetails_remove_dead_ends(gfa_, 50)
+        rounds += 1
+    te = time.time()
+    data = [size, \
+            clipped, \
+            len(gfa_.nodes()), \
+            rounds, \
+            "{0:f}".format(te_clip - ts), \
+            "{0:f}".format(te - ts_rounds)]
+    return str.join("\t", [str(x) for x in data])
+
+if __name__ == "__main__":
+    print(str.join("\t", ["segments", "clip_nodes_left", \
+                          "dead_ends_nodes_left", "dead_ends_calls", \
+                          "clip_s", "dead_ends_s"]))
+    for size in sys.argv[1:]:
+        print(run_benchmark(int(size)))
@@ -0,0 +1,58 @@
+"""
+Compare a full load with a topology only load, where the sequences
+are read from the file when accessed.
+
+For each load the time and the memory allocated by Python that is
+still held by the graph at the end (measured with tracemalloc, so
+both loads are slower than usual) are reported, with the time of
+`dovetails_nodes_connected_components` on the loaded graph.
+Graphs with long sequences can be generated with randomgraph.py,
+for example:
+
+    python3 randomgraph.py -s 20000 -l 5000 -w > random_20k_5k.gfa
+
+Usage: python3 run_topology_benchmark.py graph1.gfa [graph2.gfa ...]
+"""
+import sys
+import time
+import tracemalloc
+sys.path.insert(1, '../')
+import pygfa
+
+def measured_load(file_path, **kwargs):
+    tracemalloc.start()
+    ts = time.time()
+    gfa_ = pygfa.gfa.GFA.from_file(file_path, mode="records", **kwargs)
+    te = time.time()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    ts_components = time.time()
+    components = list(pygfa.dovetails_nodes_connected_components(gfa_))
+    te_components = time.time()
+    return te - ts, memory, te_components - ts_components, len(components)
+
+def run_topology_benchmark(file_path, end=""):
+    full_time, full_memory, full_components_time, components = \
+      measured_load(file_path)
+    topology_time, topology_memory, topology_components_time, _ = \
+      measured_load(file_path, topology_only=True)
+    data = [file_path, \
+            components, \
+            "{0:f}".format(full_time), \
+            full_memory, \
+            "{0:f}".format(full_components_time), \
+            "{0:f}".format(topology_time), \
+            topology_memory, \
+            "{0:f}".format(topology_components_time), \
+            "{0:.2f}".format(full_memory / topology_memory \
+                             if topology_memory else 0)]
+    return str.join("\t", [str(x) for x in data]) + end
+
+if __name__ == "__main__":
+    print(str.join("\t", ["file", "components", \
+                          "full_load_s", "full_bytes", \
+                          "full_components_s", \
+                          "topology_load_s", "topology_bytes", \
+                          "topology_components_s", "memory_ratio"]))
+    for file_ in sys.argv[1:]:
+        print(run_topology_benchmark(file_))
@@ -0,0 +1,69 @@
+"""
+Measure the union-find labelling of the connected components.
+
+For each size given, build that many random edges among as many
+nodes and report the time to label the components with a single
+process and with the given number of workers.
+For each GFA file given, report the time of
+`dovetails_component_labels` compared with
+`dovetails_nodes_connected_components`.
+
+Usage: python3 run_union_find_benchmark.py [-w workers] size1 [size2 ...] [graph1.gfa ...]
+"""
+import sys
+import time
+sys.path.insert(1, '../')
+import numpy as np
+import pygfa
+from pygfa.dovetail_operations.components import union_find
+
+def run_array_benchmark(size, workers):
+    random = np.random.RandomState(0)
+    from_nodes = random.randint(0, size, size=size)
+    to_nodes = random.randint(0, size, size=size)
+    ts = time.time()
+    roots = union_find.union_find_labels(size, from_nodes, to_nodes)
+    te_single = time.time()
+    union_find.union_find_labels(size, from_nodes, to_nodes, \
+                                 workers=workers, \
+                                 chunk_size=max(1, size // (4 * workers)))
+    te = time.time()
+    data = [size, \
+            len(np.unique(roots)), \
+            "{0:f}".format(te_single - ts), \
+            "{0:f}".format(te - te_single)]
+    return str.join("\t", [str(x) for x in data])
+
+def run_graph_benchmark(file_path):
+    gfa_ = pygfa.gfa.GFA.from_file(file_path)
+    ts = time.time()
+    _, _, sizes, _ = pygfa.dovetails_component_labels(gfa_)
+    te_labels = time.time()
+    components = len(list(pygfa.dovetails_nodes_connected_components(gfa_)))
+    te = time.time()
+    data = [file_path, \
+            len(gfa_.nodes()), \
+            len(sizes), \
+            components, \
+            "{0:f}".format(te_labels - ts), \
+            "{0:f}".format(te - te_labels)]
+    return str.join("\t", [str(x) for x in data])
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    workers = 4
+    if args[:1] == ["-w"]:
+        workers = int(args[1])
+        args = args[2:]
+    sizes = [arg for arg in args if arg.isdigit()]
+    files = [arg for arg in args if not arg.isdigit()]
+    if sizes:
+        print(str.join("\t", ["edges", "components", "single_s", \
+                              "workers_s"]))
+        for size in sizes:
+            print(run_array_benchmark(int(size), workers))
+    if files:
+        print(str.join("\t", ["file", "segments", "components", \
+                              "bfs_components", "labels_s", "bfs_s"]))
+        for file_ in files:
+            print(run_graph_benchmark(file_))
@@ -0,0 +1,86 @@
+"""
+Measure the unitig engine.
+
+For each size given, build the dovetail overlaps of that many
+segments arranged in chains of about a hundred segments, with random
+orientations, directly as arrays (as a FrozenGFA keeps them), and
+report the time to find the partners of the segment ends and to walk
+all the unitigs.
+For each GFA file given, report the time of freezing the graph and of
+`dovetails_unitigs`, compared with `dovetails_linear_paths` on the
+graph.
+
+Usage: python3 run_unitig_benchmark.py size1 [size2 ...] [graph1.gfa ...]
+"""
+import sys
+import time
+sys.path.insert(1, '../')
+import numpy as np
+import pygfa
+from pygfa.dovetail_operations import unitigs
+
+def chains(size, seed=0):
+    """Return the end nodes and the segment ends of the dovetail
+    overlaps of size segments in chains.
+    """
+    random = np.random.RandomState(seed)
+    orientations = random.randint(0, 2, size=size)
+    from_nodes = np.flatnonzero(random.rand(size - 1) > 0.01)
+    ends = np.stack((from_nodes, from_nodes + 1), axis=1)
+    # each segment leaves from its right end if oriented `+` and
+    # the next one is entered from its left end if oriented `+`
+    segment_ends = np.stack((1 - orientations[from_nodes], \
+                             orientations[from_nodes + 1]), axis=1)
+    return ends, segment_ends
+
+def run_array_benchmark(size):
+    ends, segment_ends = chains(size)
+    ts = time.time()
+    partners = unitigs.end_partners(size, ends, segment_ends)
+    te_partners = time.time()
+    count = 0
+    segments = 0
+    for unitig in unitigs.unitig_ids(partners):
+        count += 1
+        segments += len(unitig)
+    te = time.time()
+    data = [size, \
+            len(ends), \
+            count, \
+            segments, \
+            "{0:f}".format(te_partners - ts), \
+            "{0:f}".format(te - te_partners)]
+    return str.join("\t", [str(x) for x in data])
+
+def run_graph_benchmark(file_path):
+    gfa_ = pygfa.gfa.GFA.from_file(file_path)
+    ts = time.time()
+    frozen = gfa_.freeze()
+    te_freeze = time.time()
+    count = len(list(pygfa.dovetails_unitigs(frozen)))
+    te_unitigs = time.time()
+    paths = len(list(pygfa.dovetails_linear_paths(gfa_)))
+    te_paths = time.time()
+    data = [file_path, \
+            len(gfa_.nodes()), \
+            count, \
+            paths, \
+            "{0:f}".format(te_freeze - ts), \
+            "{0:f}".format(te_unitigs - te_freeze), \
+            "{0:f}".format(te_paths - te_unitigs)]
+    return str.join("\t", [str(x) for x in data])
+
+if __name__ == "__main__":
+    sizes = [arg for arg in sys.argv[1:] if arg.isdigit()]
+    files = [arg for arg in sys.argv[1:] if not arg.isdigit()]
+    if sizes:
+        print(str.join("\t", ["segments", "dovetails", "unitigs", \
+                              "unitig_segments", "partners_s", "walk_s"]))
+        for size in sizes:
+            print(run_array_benchmark(int(size)))
+    if files:
+        print(str.join("\t", ["file", "segments", "unitigs", \
+                              "linear_paths", "freeze_s", "unitigs_s", \
+                              "linear_paths_s"]))
+        for file_ in files:
+            print(run_graph_benchmark(file_))
@@ -1,6 +1,7 @@
 import sys
 
 import pygfa
+from pygfa.serializer import converter
 import networkx as nx
 import matplotlib.pyplot as plt
 import argparse
@@ -23,6 +24,20 @@ if __name__ == '__main__':
     try:
         args = parser.parse_args()
         
+        if args.convert:
+            version = 1
+            if args.convert[0] in ("2", "gfa2", "GFA2"):
+                version = 2
+            elif args.convert[0] in ("1", "gfa1", "GFA1"):
+                version = 1
+            else:
+                raise ValueError("Invalid GFA version given")
+
+            # a whole file is converted without building the graph
+            if not (args.subgraph or args.display):
+                converter.convert(args.file[0], args.convert[1], version)
+                sys.exit()
+
         tmp_pygfa = pygfa.gfa.GFA.from_file (args.file[0])
         node_color = "r"
         
@@ -41,14 +56,6 @@ if __name__ == '__main__':
             plt.show ()
 
         if args.convert:
-            version = 1
-            if args.convert[0] in ("2", "gfa2", "GFA2"):
-                version = 2
-            elif args.convert[0] in ("1", "gfa1", "GFA1"):
-                version = 1
-            else:
-                raise ValueError("Invalid GFA version given")
-
             tmp_pygfa.dump(gfa_version=version, out=args.convert[1])
     except SystemExit:
         pass
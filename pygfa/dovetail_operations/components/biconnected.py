@@ -13,56 +13,120 @@ networkx/networkx/algorithms/components/biconnected.py
 #    All rights reserved.
 #    BSD license.
 
-def _dovetails_biconnected_dfs(gfa_, components=True):
-    visited = set()
-    for start in gfa_.nodes():
-        if start in visited:
+import numpy as np
+
+from pygfa import frozen_gfa
+
+def dovetail_adjacency(gfa_):
+    """Return the dovetail overlaps of the graph on integer ids.
+
+    :returns: The list of the nodes, the list of the keys of the
+        edges, the array with the end nodes of each edge and the
+        CSR lists (pointers, columns, edges) of the adjacency, where
+        the edges are the positions of the edges in the list of the
+        keys and self loops are listed once.
+    """
+    names = gfa_.nodes()
+    if isinstance(gfa_, frozen_gfa.FrozenGFA):
+        return names, gfa_._keys, gfa_.edge_ends, gfa_._lists["dovetails"]
+    ids = {nid: id_ for id_, nid in enumerate(names)}
+    keys = []
+    ends = []
+    for from_node, to_node, key in gfa_.dovetails_iter(keys=True):
+        keys.append(key)
+        ends.append((ids[from_node], ids[to_node]))
+    ends = np.array(ends, dtype=np.int64).reshape(-1, 2)
+    pointers, columns, edges = frozen_gfa._incidences(\
+                                    len(names), \
+                                    ends, \
+                                    np.arange(len(keys), dtype=np.int64))
+    return names, keys, ends, \
+           (pointers.tolist(), columns.tolist(), edges.tolist())
+
+def biconnected_ids(pointers, columns, edges, components=False):
+    """Find the articulation points, the bridges and optionally the
+    biconnected components of the graph given by its CSR adjacency
+    lists (see `dovetail_adjacency`), with an iterative depth-first
+    search.
+
+    Each node keeps its position in its adjacency list, so the search
+    state is only the stack of the nodes, and for each node the
+    length of the edge stack when the edge leading to it is pushed,
+    so a component is cut off the edge stack without searching it.
+    The edge leading to a node is skipped by its id, so parallel
+    edges are cycles, while self loops are ignored.
+
+    :returns: The list of the articulation points, the list of the
+        bridges and, if components is set, the list of the
+        biconnected components, all as integer ids, where each
+        component is the list of its edges.
+    """
+    size = len(pointers) - 1
+    discovery = [-1] * size
+    low = [0] * size
+    parent_edge = [-1] * size
+    position = [0] * size
+    stack_start = [0] * size
+    articulation = bytearray(size)
+    bridges = []
+    found = []
+    edge_stack = []
+    time = 0
+    for start in range(size):
+        if discovery[start] != -1:
             continue
-        discovery = {start:0} # "time" of first discovery of node during search
-        low = {start:0}
+        discovery[start] = low[start] = time
+        time += 1
+        position[start] = pointers[start]
         root_children = 0
-        visited.add(start)
-        edge_stack = []
-        # stack = [(start, start, iter(G[start]))] # networkx (gfa_ should be G)
-        stack = [(start, start, iter(gfa_.dovetails_neighbors(start)))] # PyGFA
+        stack = [start]
         while stack:
-            grandparent, parent, children = stack[-1]
-            try:
-                child = next(children)
-                if grandparent == child:
+            node = stack[-1]
+            index = position[node]
+            if index < pointers[node + 1]:
+                position[node] = index + 1
+                child = columns[index]
+                edge = edges[index]
+                if edge == parent_edge[node] or child == node:
                     continue
-                if child in visited:
-                    if discovery[child] <= discovery[parent]: # back edge
-                        low[parent] = min(low[parent],discovery[child])
-                        if components:
-                            edge_stack.append((parent,child))
-                else:
-                    low[child] = discovery[child] = len(discovery)
-                    visited.add(child)
-                    # stack.append((parent, child, iter(G[child]))) # networkx
-                    stack.append((parent, child, iter(gfa_.dovetails_neighbors(child)))) # PyGFA
+                if discovery[child] == -1:
+                    discovery[child] = low[child] = time
+                    time += 1
+                    parent_edge[child] = edge
+                    position[child] = pointers[child]
+                    if components:
+                        stack_start[child] = len(edge_stack)
+                        edge_stack.append(edge)
+                    stack.append(child)
+                elif discovery[child] < discovery[node]: # back edge
+                    if discovery[child] < low[node]:
+                        low[node] = discovery[child]
                     if components:
-                        edge_stack.append((parent,child))
-            except StopIteration:
-                stack.pop()
+                        edge_stack.append(edge)
+                continue
+            stack.pop()
+            if not stack:
+                break
+            parent = stack[-1]
+            if low[node] < low[parent]:
+                low[parent] = low[node]
+            if low[node] >= discovery[parent]:
                 if len(stack) > 1:
-                    if low[parent] >= discovery[grandparent]:
-                        if components:
-                            ind = edge_stack.index((grandparent,parent))
-                            yield edge_stack[ind:]
-                            edge_stack=edge_stack[:ind]
-                        else:
-                            yield grandparent
-                    low[grandparent] = min(low[parent], low[grandparent])
-                elif stack: # length 1 so grandparent is root
+                    articulation[parent] = 1
+                else:
                     root_children += 1
-                    if components:
-                        ind = edge_stack.index((grandparent,parent))
-                        yield edge_stack[ind:]
-        if not components:
-            # root node is articulation point if it has more than 1 child
-            if root_children > 1:
-                yield start
+                if components:
+                    found.append(edge_stack[stack_start[node]:])
+                    del edge_stack[stack_start[node]:]
+                if low[node] > discovery[parent]:
+                    bridges.append(parent_edge[node])
+        # root node is articulation point if it has more than 1 child
+        if root_children > 1:
+            articulation[start] = 1
+    articulation_points = np.flatnonzero(\
+                            np.frombuffer(articulation, dtype=np.uint8))
+    return articulation_points.tolist(), bridges, \
+           found if components else None
 
 def dovetails_articulation_points(gfa_):
     """Redefinition of articulation point
@@ -74,4 +138,35 @@ def dovetails_articulation_points(gfa_):
     articulation points is biconnected. Articulation points belong to
     more than one biconnected component of a graph.
     """
-    return _dovetails_biconnected_dfs(gfa_, components=False)
+    names, _, _, adjacency = dovetail_adjacency(gfa_)
+    articulation_points, _, _ = biconnected_ids(*adjacency)
+    return (names[id_] for id_ in articulation_points)
+
+def dovetails_bridges(gfa_, keys=False):
+    """Return a generator of the dovetail overlaps whose removal
+    increases the number of dovetails connected components.
+
+    Two parallel dovetail overlaps between the same nodes are not
+    bridges.
+
+    :param keys: If set return the edge key with the edge itself.
+    """
+    names, keys_, ends, adjacency = dovetail_adjacency(gfa_)
+    _, bridges, _ = biconnected_ids(*adjacency)
+    for edge in bridges:
+        from_id, to_id = ends[edge].tolist()
+        yield (names[from_id], names[to_id], keys_[edge]) if keys \
+          else (names[from_id], names[to_id])
+
+def dovetails_biconnected_components(gfa_):
+    """Return a generator of sets with the nodes of each
+    biconnected component, considering only dovetail overlaps.
+
+    Nodes without dovetail overlaps (or with self loops only) are
+    not in any component.
+    """
+    names, _, ends, adjacency = dovetail_adjacency(gfa_)
+    _, _, components = biconnected_ids(*adjacency, components=True)
+    for component in components:
+        yield set(names[id_] for id_ in \
+                  np.unique(ends[component]).tolist())
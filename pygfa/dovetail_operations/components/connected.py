@@ -13,6 +13,8 @@ networkx/networkx/algorithms/components/connected.py
 #    All rights reserved.
 #    BSD license.
 
+from pygfa import frozen_gfa
+
 def _plain_bfs_dovetails(gfa_, source):
     if source not in gfa_:
         return ()
@@ -52,6 +54,10 @@ def _plain_bfs_dovetails_with_edges(gfa_, source, keys=False):
                 queue.append(to_)
 
 def dovetails_nodes_connected_component(gfa_, source):
+    if isinstance(gfa_, frozen_gfa.FrozenGFA):
+        return gfa_.dovetails_nodes_connected_component(source)
+    if gfa_._dovetails_components is not None and source in gfa_._graph:
+        return gfa_._dovetails_components.component(source)
     return set(_plain_bfs_dovetails(gfa_, source))
 
 def dovetails_nodes_connected_components(gfa_, with_sequence=True):
@@ -61,6 +67,10 @@ def dovetails_nodes_connected_components(gfa_, with_sequence=True):
         only nodes where the 'sequence' propery is present. Consider
         every nodes in the graph otherwise.
     """
+    if isinstance(gfa_, frozen_gfa.FrozenGFA):
+        yield from gfa_.dovetails_nodes_connected_components(\
+                                            with_sequence=with_sequence)
+        return
     seen = set()
     nodes = gfa_.nodes(with_sequence=with_sequence)
     for v in nodes:
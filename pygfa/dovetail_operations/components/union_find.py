@@ -0,0 +1,141 @@
+"""
+Connected components of the dovetail overlaps labelled with a
+union-find forest.
+
+The edges are read once: the end nodes of each edge, numbered with
+contiguous integers, join their trees, so that the root of each tree
+is its smallest node. With more processes, the edges are split in
+chunks, each worker builds the forest of its chunk and gives back the
+node-root pairs of the nodes that are not roots, which are joined in
+the same way into the forest of the whole graph.
+"""
+import multiprocessing
+
+import numpy as np
+
+from pygfa import frozen_gfa
+
+# Default number of edges given to a worker in a single task.
+DEFAULT_CHUNK_SIZE = 1000000
+
+# state of the worker processes
+_worker = {}
+
+
+def _find(parent, node):
+    while parent[node] != node:
+        # path halving
+        parent[node] = parent[parent[node]]
+        node = parent[node]
+    return node
+
+
+def _union(parent, from_nodes, to_nodes):
+    """Join the trees of the end nodes of each edge, keeping the
+    smallest node as root.
+    """
+    for from_node, to_node in zip(from_nodes, to_nodes):
+        from_root = _find(parent, from_node)
+        to_root = _find(parent, to_node)
+        if from_root < to_root:
+            parent[to_root] = from_root
+        elif to_root < from_root:
+            parent[from_root] = to_root
+
+
+def forest_pairs(from_nodes, to_nodes):
+    """Return the nodes that are not roots in the forest of the given
+    edges and their roots, as two arrays.
+    """
+    nodes, local = np.unique(np.concatenate((from_nodes, to_nodes)), \
+                             return_inverse=True)
+    parent = list(range(len(nodes)))
+    local = local.tolist()
+    _union(parent, local[:len(from_nodes)], local[len(from_nodes):])
+    roots = np.array([_find(parent, node) for node in range(len(nodes))], \
+                     dtype=np.int64)
+    not_roots = roots != np.arange(len(nodes))
+    # the nodes are sorted, so the local roots are the smallest too
+    return nodes[not_roots], nodes[roots[not_roots]]
+
+
+def _init_worker(from_nodes, to_nodes):
+    _worker['from_nodes'] = from_nodes
+    _worker['to_nodes'] = to_nodes
+
+
+def _label_chunk(task):
+    """Worker function: the forest of a range of edges."""
+    start, end = task
+    return forest_pairs(_worker['from_nodes'][start:end], \
+                        _worker['to_nodes'][start:end])
+
+
+def union_find_labels(size, from_nodes, to_nodes, workers=None, \
+                      chunk_size=DEFAULT_CHUNK_SIZE):
+    """Label each node with the smallest node of its connected
+    component.
+
+    :param size: The number of nodes.
+    :param from_nodes: The integer ids of the first end nodes of
+        the edges.
+    :param to_nodes: The integer ids of the other end nodes.
+    :param workers: If greater than 1, the number of processes that
+        build the forests of the chunks of edges.
+    :param chunk_size: The number of edges given to a worker in a
+        single task.
+    """
+    from_nodes = np.asarray(from_nodes, dtype=np.int64)
+    to_nodes = np.asarray(to_nodes, dtype=np.int64)
+    parent = list(range(size))
+    if workers is None or workers < 2 or len(from_nodes) <= chunk_size:
+        _union(parent, from_nodes.tolist(), to_nodes.tolist())
+    else:
+        tasks = [(start, start + chunk_size) \
+                 for start in range(0, len(from_nodes), chunk_size)]
+        with multiprocessing.Pool(workers, initializer=_init_worker, \
+                                  initargs=(from_nodes, to_nodes)) as pool:
+            for nodes, roots in pool.imap_unordered(_label_chunk, tasks):
+                _union(parent, nodes.tolist(), roots.tolist())
+    return np.array([_find(parent, node) for node in range(size)], \
+                    dtype=np.int64)
+
+
+def dovetails_component_labels(gfa_, workers=None, \
+                               chunk_size=DEFAULT_CHUNK_SIZE):
+    """Label the connected components of the graph, considering only
+    dovetail overlaps.
+
+    The components are numbered from 0, in the order of their first
+    node in the graph.
+
+    :param gfa_: A GFA graph or a FrozenGFA.
+    :param workers: See `union_find_labels`.
+    :returns: The list of the nodes, the array with the component
+        of each node, the array with the number of nodes of each
+        component and the array with the total sequence length of
+        each component, where unknown lengths count as 0.
+    """
+    nodes = gfa_.nodes()
+    if isinstance(gfa_, frozen_gfa.FrozenGFA):
+        ends = gfa_.dovetail_ends
+        slen = np.maximum(gfa_.slen, 0)
+    else:
+        ids = {nid: id_ for id_, nid in enumerate(nodes)}
+        ends = np.array([(ids[from_node], ids[to_node]) \
+                         for from_node, to_node in gfa_.dovetails_iter()], \
+                        dtype=np.int64).reshape(-1, 2)
+        slen = [gfa_._graph.node[nid].get('slen') for nid in nodes]
+        slen = np.array([length if isinstance(length, int) else 0 \
+                         for length in slen], dtype=np.int64)
+    roots = union_find_labels(len(nodes), ends[:, 0], ends[:, 1], \
+                              workers, chunk_size)
+    _, labels = np.unique(roots, return_inverse=True)
+    sizes = np.bincount(labels, minlength=labels.max(initial=-1) + 1)
+    lengths = np.zeros(len(sizes), dtype=np.int64)
+    np.add.at(lengths, labels, slen)
+    return nodes, labels, sizes, lengths
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
@@ -92,10 +92,10 @@ class DovetailIterator:
         """
         return list(to_ for from_, to_ in self.dovetails_neighbors_iter(nbunch))
 
-    def right_end_iter(self, nbunch, keys=False, data=False):
-        """Return an iterator over dovetail edges where
-        nodes id  right-segment end is taken into account
-        in the overlap
+    def _segment_end_iter(self, nbunch, end, keys=False, data=False):
+        """Return an iterator over the dovetail edges on the given
+        end of the nodes in nbunch, read from the index of the
+        segment ends kept by the GFA graph.
         """
         try:
             if nbunch is None:
@@ -108,23 +108,26 @@ class DovetailIterator:
             nids = set()
             nids.add(nbunch)
         for nid in nids:
-            for from_node, to_node, key, edge_ in self.dovetails_neighbors_iter(nid, keys=True, data=True):
-                if nid == edge_["from_node"] \
-                  and edge_["from_segment_end"] == "R":
-                    if data is True:
-                        yield (from_node, to_node, key, edge_) if keys \
-                          else (from_node, to_node, edge_)
-                    else:
-                        yield (from_node, to_node, key) if keys \
-                          else (from_node, to_node)
-                if nid == edge_["to_node"] \
-                  and edge_["to_segment_end"] == "R":
-                    if data is True:
-                        yield (from_node, to_node, key, edge_) if keys \
-                          else (from_node, to_node, edge_)
-                    else:
-                        yield (from_node, to_node, key) if keys \
-                          else (from_node, to_node)
+            # copied, so the graph can change while iterating
+            for to_node, key, _ in tuple(self._dovetail_ends.get(\
+                                            (nid, end), ())):
+                if data is True:
+                    edge_ = self._graph.adj[nid][to_node][key]
+                    yield (nid, to_node, key, edge_) if keys \
+                      else (nid, to_node, edge_)
+                else:
+                    yield (nid, to_node, key) if keys \
+                      else (nid, to_node)
+
+    def _segment_end_degree(self, nid, end):
+        return len(self._dovetail_ends.get((nid, end), ()))
+
+    def right_end_iter(self, nbunch, keys=False, data=False):
+        """Return an iterator over dovetail edges where
+        nodes id  right-segment end is taken into account
+        in the overlap
+        """
+        return self._segment_end_iter(nbunch, "R", keys, data)
 
     def right(self, nbunch=None):
         """Return all the nodes connected to the right
@@ -133,11 +136,12 @@ class DovetailIterator:
         return list(to_ for from_, to_ in self.right_end_iter(nbunch))
 
     def right_degree_iter(self, nbunch=None):
-        return ((x, len(self.right(x))) for x in self._graph.nbunch_iter(nbunch))
+        return ((x, self._segment_end_degree(x, "R")) \
+                for x in self._graph.nbunch_iter(nbunch))
 
     def right_degree(self, nbunch=None):
         if nbunch in self:      # return a single node
-            return next(self.right_degree_iter(nbunch))[1]
+            return self._segment_end_degree(nbunch, "R")
         else:           # return a dict
             return dict(self.right_degree_iter(nbunch))
 
@@ -146,37 +150,7 @@ class DovetailIterator:
         left segment-end of the nodes ids given are taken into account
         in the overlap
         """
-        try:
-            if nbunch is None:
-                nids = set(self.nodes())
-            elif isinstance(nbunch, str):
-                raise TypeError
-            else:
-                nids = set(nbunch)
-        except TypeError:
-            nids = set()
-            nids.add(nbunch)
-
-        for nid in nids:
-            for from_node, to_node, key, edge_ in self.dovetails_neighbors_iter(nid, keys=True, data=True):
-
-                if nid == edge_["from_node"] \
-                  and edge_["from_segment_end"] == "L":
-                    if data is True:
-                        yield (from_node, to_node, key, edge_) if keys \
-                          else (from_node, to_node, edge_)
-                    else:
-                        yield (from_node, to_node, key) if keys \
-                          else (from_node, to_node)
-
-                if nid == edge_["to_node"] \
-                  and edge_["to_segment_end"] == "L":
-                    if data is True:
-                        yield (from_node, to_node, key, edge_) if keys \
-                          else (from_node, to_node, edge_)
-                    else:
-                        yield (from_node, to_node, key) if keys \
-                          else (from_node, to_node)
+        return self._segment_end_iter(nbunch, "L", keys, data)
 
     def left(self, nbunch=None):
         """Return all the nodes connected to the left
@@ -185,11 +159,12 @@ class DovetailIterator:
         return list(to_ for from_, to_ in self.left_end_iter(nbunch))
 
     def left_degree_iter(self, nbunch=None):
-        return ((x, len(self.left(x))) for x in self._graph.nbunch_iter(nbunch))
+        return ((x, self._segment_end_degree(x, "L")) \
+                for x in self._graph.nbunch_iter(nbunch))
 
     def left_degree(self, nbunch=None):
         if nbunch in self:      # return a single node
-            return next(self.left_degree_iter(nbunch))[1]
+            return self._segment_end_degree(nbunch, "L")
         else:           # return a dict
             return dict(self.left_degree_iter(nbunch))
 
@@ -2,6 +2,8 @@
 Module that contain operation to find linearh paths
 in a GFA graph.
 """
+from pygfa import frozen_gfa
+
 def dovetails_linear_path(gfa_, node_, keys=False):
     """Return the oriented edges involved in a linear path
     where that contain the given node.
@@ -9,6 +11,9 @@ def dovetails_linear_path(gfa_, node_, keys=False):
     return gfa_.dovetails_linear_path_iter(node_, keys=keys)
 
 def dovetails_linear_paths(gfa_, components=False, keys=False):
+    if isinstance(gfa_, frozen_gfa.FrozenGFA):
+        yield from gfa_.dovetails_linear_paths(keys=keys)
+        return
     seen = set(gfa_.nodes())
     while len(seen):
         source = seen.pop() # source is removed
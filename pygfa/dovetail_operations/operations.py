@@ -1,10 +1,18 @@
+import collections
+
+import numpy as np
+
 from pygfa.dovetail_operations.components.connected import dovetails_nodes_connected_components
 from pygfa.dovetail_operations.components.connected import dovetails_nodes_connected_component
 from pygfa.dovetail_operations.components.connected import dovetails_connected_components_subgraphs
 
 from pygfa.dovetail_operations.components.biconnected import dovetails_articulation_points
+from pygfa.dovetail_operations.components.biconnected import dovetails_bridges
+from pygfa.dovetail_operations.components.biconnected import dovetails_biconnected_components
+from pygfa.dovetail_operations.components.union_find import dovetails_component_labels
 from pygfa.dovetail_operations.linear_paths import *
 from pygfa.dovetail_operations.simple_paths import *
+from pygfa.dovetail_operations.unitigs import dovetails_unitigs
 
 from ..operations import nodes_connected_component
 
@@ -12,9 +20,8 @@ def dovetails_remove_small_components(gfa_, min_length):
     """Remove all the connected components where
     the sequences length is less than min_length.
 
-    Find all the connected components nodes,
-    for each component obtain the sum of the
-    sequences length.
+    Label the connected components of the nodes with a union-find
+    forest, obtaining the sum of the sequences length of each one.
     If length is less than the given length remove the connected
     component nodes.
 
@@ -27,17 +34,17 @@ def dovetails_remove_small_components(gfa_, min_length):
     """
     if min_length < 0:
         raise ValueError("min_length must be >= 0")
-    for conn_comp in dovetails_nodes_connected_components(gfa_):
-        length = 0
-        for nid in conn_comp:
-            node_ = gfa_.node(nid)
-            try:
-                length += node_['slen']
-            except (TypeError, KeyError):
-                pass
-        if length < min_length:
-            for nid in conn_comp:
-                gfa_.remove_node(nid)
+    nodes, labels, _, lengths = dovetails_component_labels(gfa_)
+    # as dovetails_nodes_connected_components, only the components
+    # with a node with a sequence are considered
+    with_sequence = np.bincount(\
+        labels, \
+        weights=['sequence' in gfa_.node(nid) for nid in nodes], \
+        minlength=len(lengths)) > 0
+    small = ((lengths < min_length) & with_sequence).tolist()
+    for nid, label in zip(nodes, labels.tolist()):
+        if small[label]:
+            gfa_.remove_node(nid)
 
 def dovetails_remove_dead_ends(\
                       gfa_, \
@@ -81,3 +88,139 @@ def dovetails_remove_dead_ends(\
 
     for nid in to_remove:
         gfa_.remove_node(nid)
+
+_OTHER_END = {"L": "R", "R": "L"}
+
+def _adjacent_end(gfa_, nid, end):
+    """Return the segment end joined to the given one by its only
+    dovetail overlap.
+    """
+    to_node, key, side = next(iter(gfa_._dovetail_ends[(nid, end)]))
+    edge_ = gfa_._graph.adj[nid][to_node][key]
+    return to_node, \
+           edge_['to_segment_end'] if side == 0 else edge_['from_segment_end']
+
+def _node_length(node_):
+    length = node_.get('slen')
+    return length if isinstance(length, int) else 0
+
+def _tip(gfa_, start, min_length, max_segments):
+    """Walk the chain of segments starting from the dead end of the
+    given node, while each segment is joined to the next one by the
+    only dovetail overlap of both the segment ends.
+
+    :returns: The nodes of the tip and the segment end where it is
+        attached, if the chain is shorter than min_length and
+        reaches a segment end with more overlaps. Otherwise None and
+        the segment end with more overlaps that stopped the walk, if
+        any, since the chain could become a tip once the other
+        overlaps on it are clipped.
+    """
+    left_deg = gfa_._segment_end_degree(start, "L")
+    right_deg = gfa_._segment_end_degree(start, "R")
+    if left_deg == 0 and right_deg > 0:
+        end = "R"
+    elif right_deg == 0 and left_deg > 0:
+        end = "L"
+    else:
+        return None, None
+    tip = [start]
+    nodes = {start}
+    length = _node_length(gfa_.node(start))
+    nid = start
+    while length < min_length:
+        if gfa_._segment_end_degree(nid, end) > 1:
+            return None, (nid, end)
+        next_node, next_end = _adjacent_end(gfa_, nid, end)
+        if next_node in nodes:
+            # circular chain
+            return None, None
+        if gfa_._segment_end_degree(next_node, next_end) > 1:
+            return tip, (next_node, next_end)
+        end = _OTHER_END[next_end]
+        if len(tip) == max_segments \
+          or gfa_._segment_end_degree(next_node, end) == 0:
+            # too long, or a whole linear component
+            return None, None
+        tip.append(next_node)
+        nodes.add(next_node)
+        length += _node_length(gfa_.node(next_node))
+        nid = next_node
+    return None, None
+
+def _tip_coverage(gfa_, tip, coverage_tag):
+    """Return the count of the given tag over the length of the tip,
+    where nodes without the tag count as 0.
+    """
+    count = 0
+    length = 0
+    for nid in tip:
+        node_ = gfa_.node(nid)
+        if coverage_tag in node_:
+            count += node_[coverage_tag].value
+        length += _node_length(node_)
+    return count / length if length > 0 else 0
+
+def dovetails_clip_tips(\
+                gfa_, \
+                min_length, \
+                max_segments=None, \
+                coverage_tag=None, \
+                min_coverage=0):
+    """Remove the tips of the graph shorter than min_length, until
+    no more tips can be removed.
+
+    A tip is a chain of segments starting from a segment with
+    dovetail overlaps on one end only, where each segment is joined
+    to the next one by the only overlap on both the segment ends, up
+    to a segment end with other overlaps, which keeps them after the
+    tip is removed, so a tip never splits its connected component.
+    Segments without overlaps and whole linear components are not
+    tips.
+
+    Removing a tip can turn the segment where it was attached into
+    a dead end, or the chains stopped at the same segment end into
+    longer tips: only these are checked again, so the work done is
+    proportional to the region removed and to the number of dead
+    ends of the graph.
+
+    :param min_length: The length that a tip must reach to be kept,
+        unknown lengths count as 0.
+    :param max_segments: If given, tips with more segments are kept.
+    :param coverage_tag: If given, the optional field of the segments
+        used as count for the coverage of the tip (such as `RC`
+        or `KC`), which is the sum of the counts over the length of
+        the tip.
+    :param min_coverage: If coverage_tag is given, the coverage that
+        a tip must reach to be kept.
+
+    :note:
+        Using the right and left degree, only dovetails overlaps
+        are considered.
+    """
+    if min_length < 0:
+        raise ValueError("min_length must be >= 0")
+    if max_segments is not None and max_segments < 1:
+        raise ValueError("max_segments must be >= 1")
+    worklist = collections.deque(nid for nid in gfa_.nodes_iter() \
+                                 if gfa_._segment_end_degree(nid, "L") == 0 \
+                                   or gfa_._segment_end_degree(nid, "R") == 0)
+    queued = set(worklist)
+    # segment end -> dead ends whose chain stopped there
+    waiting = {}
+    while worklist:
+        start = worklist.popleft()
+        queued.discard(start)
+        if not start in gfa_._graph:
+            continue
+        tip, end = _tip(gfa_, start, min_length, max_segments)
+        if tip is not None and (coverage_tag is None or \
+            _tip_coverage(gfa_, tip, coverage_tag) < min_coverage):
+            for nid in tip:
+                gfa_.remove_node(nid)
+            for nid in waiting.pop(end, []) + [end[0]]:
+                if not nid in queued:
+                    queued.add(nid)
+                    worklist.append(nid)
+        elif end is not None:
+            waiting.setdefault(end, []).append(start)
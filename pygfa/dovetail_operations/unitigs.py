@@ -0,0 +1,108 @@
+"""
+Unitigs: the maximal paths of oriented segments where each segment
+is joined to the next one by the only dovetail overlap on the
+segment ends involved.
+
+The segment ends are numbered `2 * id` for the left end and
+`2 * id + 1` for the right end of the segment with the given integer
+id, and an oriented segment is numbered the same way, `2 * id` for
+`+` and `2 * id + 1` for `-`. This way an oriented segment enters
+from the segment end with its own number and leaves from the
+other one, so the segment following it is given by the partner of
+the segment end `number ^ 1`, and the whole graph is walked once.
+"""
+import array
+
+import numpy as np
+
+from pygfa import frozen_gfa
+
+ORIENTATIONS = ("+", "-")
+
+
+def end_partners(size, dovetail_ends, dovetail_segment_ends):
+    """Return, for each segment end, the segment end joined to it
+    by its only dovetail overlap if it's the only one of that end
+    too, -1 otherwise.
+
+    :param size: The number of segments.
+    :param dovetail_ends: The integer ids of the end nodes of the
+        dovetail overlaps, an array of shape (edges, 2).
+    :param dovetail_segment_ends: The segment ends of the dovetail
+        overlaps (0 for `L`, 1 for `R`), of the same shape.
+    """
+    ends = 2 * np.asarray(dovetail_ends, dtype=np.int64) \
+           + np.asarray(dovetail_segment_ends, dtype=np.int64)
+    ends = ends.reshape(-1, 2)
+    # a self loop on a single segment end counts twice
+    degrees = np.bincount(ends.ravel(), minlength=2 * size)
+    unique = ends[(degrees[ends[:, 0]] == 1) & (degrees[ends[:, 1]] == 1)]
+    partners = np.full(2 * size, -1, dtype=np.int64)
+    partners[unique[:, 0]] = unique[:, 1]
+    partners[unique[:, 1]] = unique[:, 0]
+    return partners
+
+
+def unitig_ids(partners):
+    """Return a generator of the unitigs given by the partners of the
+    segment ends (see `end_partners`), as lists of oriented segment
+    numbers.
+
+    Each segment is in one unitig only, walked in the direction
+    that starts from the smallest number. A circular unitig starts
+    from its segment with the smallest id, oriented `+`.
+    """
+    partners = np.asarray(partners, dtype=np.int64)
+    size = len(partners) // 2
+    # the oriented segment that follows each one
+    successors = array.array("q")
+    successors.frombytes(partners.reshape(-1, 2)[:, ::-1].tobytes())
+    visited = bytearray(size)
+
+    # linear unitigs start from a segment end without partner
+    for start in np.flatnonzero(partners == -1).tolist():
+        if visited[start >> 1]:
+            continue
+        unitig = []
+        oriented = start
+        while oriented != -1:
+            unitig.append(oriented)
+            visited[oriented >> 1] = 1
+            oriented = successors[oriented]
+        yield unitig
+
+    # the segments left are in circular unitigs
+    for id_ in np.flatnonzero(np.frombuffer(visited, dtype=np.uint8) == 0)\
+                 .tolist():
+        if visited[id_]:
+            continue
+        unitig = []
+        oriented = 2 * id_
+        while oriented != -1 and not visited[oriented >> 1]:
+            unitig.append(oriented)
+            visited[oriented >> 1] = 1
+            oriented = successors[oriented]
+        yield unitig
+
+
+def dovetails_unitigs(gfa_):
+    """Return a generator of the unitigs of the graph, as lists of
+    (node id, orientation) tuples.
+
+    Every segment is in a unitig, so segments without dovetail
+    overlaps are unitigs of a single segment.
+
+    :param gfa_: A FrozenGFA, or a GFA graph that is frozen first.
+    """
+    if not isinstance(gfa_, frozen_gfa.FrozenGFA):
+        gfa_ = gfa_.freeze()
+    names = gfa_.nodes()
+    partners = end_partners(len(names), gfa_.dovetail_ends, \
+                            gfa_.dovetail_segment_ends)
+    for unitig in unitig_ids(partners):
+        yield [(names[oriented >> 1], ORIENTATIONS[oriented & 1]) \
+               for oriented in unitig]
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
@@ -0,0 +1,147 @@
+"""
+Connected components kept up to date while the graph changes.
+
+The components are the trees of a union-find forest: adding an edge
+joins the trees of its end nodes, while removing an edge or a node
+can split a component, so the component is only marked as invalid
+and it's computed again, with a visit limited to its own nodes, the
+first time one of its nodes is queried. Between the changes of the
+graph, finding the component of a node costs the same as finding
+its root.
+"""
+
+
+class DynamicComponents:
+    """Union-find forest of the connected components of a graph.
+
+    The graph must notify every node added (`add_node`), every edge
+    added (`union`), every edge removed (`invalidate`) and every node
+    removed (`invalidate`, before removing it).
+    """
+
+    def __init__(self, nodes, neighbors):
+        """
+        :param nodes: A container of the nodes of the graph, used to
+            discard the removed nodes.
+        :param neighbors: A function that given a node returns
+            an iterable of its adjacent nodes, considering only
+            the edges joining the nodes of a component.
+        """
+        self._nodes = nodes
+        self._neighbors = neighbors
+        self._parent = {}
+        # root -> nodes of its component, removed nodes included
+        # until the component is computed again
+        self._members = {}
+        # roots of the components to compute again
+        self._invalid = set()
+
+    def clear(self):
+        self._parent = {}
+        self._members = {}
+        self._invalid = set()
+
+    def _find(self, nid):
+        """Return the root of the tree of the given node.
+
+        :raises KeyError: If the node is not in the forest.
+        """
+        parent = self._parent
+        while parent[nid] != nid:
+            # path halving
+            parent[nid] = parent[parent[nid]]
+            nid = parent[nid]
+        return nid
+
+    def add_node(self, nid):
+        """Add the node as a component on its own, if it's not
+        in the forest yet.
+        """
+        if not nid in self._parent:
+            self._parent[nid] = nid
+            self._members[nid] = {nid}
+
+    def union(self, from_node, to_node):
+        """Join the components of the end nodes of an edge.
+
+        The nodes of the smallest component are added to the biggest
+        one, and the result is invalid if any of them was.
+        """
+        self.add_node(from_node)
+        self.add_node(to_node)
+        from_root = self._find(from_node)
+        to_root = self._find(to_node)
+        if from_root == to_root:
+            return
+        if len(self._members[from_root]) < len(self._members[to_root]):
+            from_root, to_root = to_root, from_root
+        self._parent[to_root] = from_root
+        self._members[from_root].update(self._members.pop(to_root))
+        if to_root in self._invalid:
+            self._invalid.discard(to_root)
+            self._invalid.add(from_root)
+
+    def invalidate(self, nid):
+        """Mark the component of the given node as invalid."""
+        if nid in self._parent:
+            self._invalid.add(self._find(nid))
+
+    def _compute(self, root):
+        """Compute again the components of the nodes of an invalid
+        component, visiting only them, since removing edges and nodes
+        can only split a component.
+        """
+        self._invalid.discard(root)
+        members = self._members.pop(root)
+        for nid in members:
+            del self._parent[nid]
+        for nid in members:
+            if nid in self._parent or not nid in self._nodes:
+                continue
+            self._parent[nid] = nid
+            component = {nid}
+            queue = [nid]
+            while queue:
+                for neighbor in self._neighbors(queue.pop()):
+                    if not neighbor in component:
+                        component.add(neighbor)
+                        self._parent[neighbor] = nid
+                        queue.append(neighbor)
+            self._members[nid] = component
+
+    def find(self, nid):
+        """Return the root of the component of the given node,
+        computing the component again if it's invalid.
+
+        :raises KeyError: If the node is not in the graph.
+        """
+        root = self._find(nid)
+        if root in self._invalid:
+            self._compute(root)
+            root = self._find(nid)
+        return root
+
+    def component(self, nid):
+        """Return a set with the nodes of the component of the
+        given node.
+
+        :raises KeyError: If the node is not in the graph.
+        """
+        return set(self._members[self.find(nid)])
+
+    def same_component(self, from_node, to_node):
+        return self.find(from_node) == self.find(to_node)
+
+    def components(self):
+        """Return a generator of sets with the nodes of each
+        component.
+        """
+        for root in list(self._invalid):
+            if root in self._invalid:
+                self._compute(root)
+        for members in list(self._members.values()):
+            yield set(members)
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
@@ -0,0 +1,515 @@
+"""
+Immutable GFA graph for read-only analytics.
+
+A FrozenGFA is built from a GFA graph with `GFA.freeze()`. The nodes
+are mapped to contiguous integers and the graph is kept in NumPy
+arrays:
+
+* the edges in columns: end nodes, orientations, segment ends,
+  overlap length and type;
+* the dovetail overlaps of each segment end (left and right) in CSR
+  layout, such as the dovetail overlaps and all the edges of each
+  node, where a self loop is listed once.
+
+The DovetailIterator API works on the arrays, and the traversals
+used by the dovetail operations (connected components, linear paths,
+articulation points) run on integers, so they are much faster than
+on the networkx graph.
+
+The attributes of nodes and edges are read-only views of the ones of
+the graph, the structure of the frozen graph doesn't change when the
+original graph does.
+"""
+import types
+
+import numpy as np
+
+from pygfa.dovetail_operations.iterator import DovetailIterator
+from pygfa.serializer import converter
+
+# edge types
+DOVETAIL = 0
+CONTAINMENT = 1
+INTERNAL = 2
+GAP = 3
+FRAGMENT = 4
+
+# orientations and segment ends, -1 if undefined
+ORIENTATIONS = {'+': 0, '-': 1}
+SEGMENT_ENDS = {'L': 0, 'R': 1}
+
+
+class FrozenGFAError(Exception):
+    pass
+
+
+def _edge_type(attributes):
+    if attributes.get('is_dovetail'):
+        return DOVETAIL
+    if 'pos' in attributes:
+        return CONTAINMENT
+    if attributes.get('distance') is not None:
+        return GAP
+    if attributes.get('eid') is None:
+        return FRAGMENT
+    return INTERNAL
+
+
+def _overlap_length(attributes):
+    """Return the length of the overlap on the first segment of
+    the edge, -1 if it's not known.
+    """
+    beg, end = attributes.get('from_positions') or (None, None)
+    try:
+        if beg is not None and end is not None:
+            return int(str(end).rstrip("$")) - int(str(beg).rstrip("$"))
+        lengths = converter.cigar_lengths(attributes.get('alignment'))
+    except (TypeError, ValueError):
+        return -1
+    return lengths[0] if lengths is not None else -1
+
+
+def _csr(size, rows, columns, edges):
+    """Return the CSR arrays (pointers, columns, edges) of the given
+    entries, keeping their order within each row.
+    """
+    order = np.argsort(rows, kind='stable')
+    pointers = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=pointers[1:])
+    return pointers, columns[order], edges[order]
+
+
+def _incidences(size, ends, edges):
+    """Return the CSR arrays of the edges of each node, with self
+    loops listed once.
+    """
+    not_loops = ends[:, 0] != ends[:, 1]
+    return _csr(size, \
+                np.concatenate((ends[:, 0], ends[not_loops, 1])), \
+                np.concatenate((ends[:, 1], ends[not_loops, 0])), \
+                np.concatenate((edges, edges[not_loops])))
+
+
+def component_labels(size, ends):
+    """Label each node with the smallest node of its connected
+    component, given the end nodes of the edges.
+
+    Components are merged by hooking the root of each tree onto the
+    smallest root of its neighbours and then compressing the paths,
+    both on whole arrays, until no edge joins two trees.
+    """
+    parent = np.arange(size, dtype=np.int64)
+    from_nodes, to_nodes = ends[:, 0], ends[:, 1]
+    while True:
+        from_roots = parent[from_nodes]
+        to_roots = parent[to_nodes]
+        joining = from_roots != to_roots
+        if not joining.any():
+            return parent
+        from_roots, to_roots = from_roots[joining], to_roots[joining]
+        smallest = np.minimum(from_roots, to_roots)
+        np.minimum.at(parent, from_roots, smallest)
+        np.minimum.at(parent, to_roots, smallest)
+        while True:
+            grandparent = parent[parent]
+            if (grandparent == parent).all():
+                break
+            parent = grandparent
+
+
+class FrozenGFA(DovetailIterator):
+    """Read-only GFA graph stored in arrays.
+
+    :param gfa_: The GFA graph to freeze.
+    """
+
+    def __init__(self, gfa_):
+        graph = gfa_._graph
+        self._names = list(graph.nodes_iter())
+        self._ids = {nid: id_ for id_, nid in enumerate(self._names)}
+        self._nodes = [types.MappingProxyType(graph.node[nid]) \
+                       for nid in self._names]
+        self._subgraphs = types.MappingProxyType(dict(gfa_.subgraphs()))
+        self.slen = np.array([data_.get('slen') \
+                              if isinstance(data_.get('slen'), int) else -1 \
+                              for data_ in self._nodes], dtype=np.int64)
+        self.has_sequence = np.array([('sequence' in data_) \
+                                      for data_ in self._nodes], dtype=bool)
+
+        self._keys = []
+        self._edges = []
+        ends = []
+        orientations = []
+        segment_ends = []
+        overlaps = []
+        types_ = []
+        for from_node, to_node, key, data_ in \
+          graph.edges_iter(keys=True, data=True):
+            self._keys.append(key)
+            self._edges.append(types.MappingProxyType(data_))
+            # the ends of the edge as given by its attributes, since
+            # orientations and segment ends refer to them
+            if data_.get('from_node') in self._ids \
+              and data_.get('to_node') in self._ids \
+              and set((data_['from_node'], data_['to_node'])) == \
+                  set((from_node, to_node)):
+                from_node, to_node = data_['from_node'], data_['to_node']
+            ends.append((self._ids[from_node], self._ids[to_node]))
+            orientations.append((ORIENTATIONS.get(data_.get('from_orn'), -1), \
+                                 ORIENTATIONS.get(data_.get('to_orn'), -1)))
+            segment_ends.append(\
+                (SEGMENT_ENDS.get(data_.get('from_segment_end'), -1), \
+                 SEGMENT_ENDS.get(data_.get('to_segment_end'), -1)))
+            overlaps.append(_overlap_length(data_))
+            types_.append(_edge_type(data_))
+        self._key_ids = {key: id_ for id_, key in enumerate(self._keys)}
+
+        size = len(self._names)
+        self.edge_ends = np.array(ends, dtype=np.int64).reshape(-1, 2)
+        self.edge_orientations = np.array(orientations, dtype=np.int8)\
+                                   .reshape(-1, 2)
+        self.edge_segment_ends = np.array(segment_ends, dtype=np.int8)\
+                                   .reshape(-1, 2)
+        self.edge_overlaps = np.array(overlaps, dtype=np.int64)
+        self.edge_types = np.array(types_, dtype=np.uint8)
+
+        edges = np.arange(len(self._keys), dtype=np.int64)
+        self._incidences = _incidences(size, self.edge_ends, edges)
+        dovetails = edges[self.edge_types == DOVETAIL]
+        self.dovetail_ends = self.edge_ends[dovetails]
+        self.dovetail_segment_ends = self.edge_segment_ends[dovetails]
+        self._dovetail_incidences = _incidences(size, self.dovetail_ends, \
+                                                dovetails)
+        # for each segment end, the dovetail overlaps on it from
+        # both sides of the edges, so a self loop on a single
+        # end is listed twice
+        self._segment_ends = {}
+        for end, value in SEGMENT_ENDS.items():
+            rows = []
+            columns = []
+            end_edges = []
+            for side in (0, 1):
+                on_end = self.edge_segment_ends[dovetails, side] == value
+                rows.append(self.dovetail_ends[on_end, side])
+                columns.append(self.dovetail_ends[on_end, 1 - side])
+                end_edges.append(dovetails[on_end])
+            self._segment_ends[end] = _csr(size, np.concatenate(rows), \
+                                           np.concatenate(columns), \
+                                           np.concatenate(end_edges))
+
+        # plain lists, faster than arrays when traversing
+        # a node at a time
+        self._lists = {}
+        for name, (pointers, columns, edges_) in \
+          [('edges', self._incidences), \
+           ('dovetails', self._dovetail_incidences)] \
+          + [(end, arrays) for end, arrays in self._segment_ends.items()]:
+            self._lists[name] = (pointers.tolist(), columns.tolist(), \
+                                 edges_.tolist())
+        # nodes with at most a dovetail overlap on each end
+        self._linear = ((np.diff(self._segment_ends["L"][0]) <= 1) \
+                        & (np.diff(self._segment_ends["R"][0]) <= 1)).tolist()
+
+    ############################################################################
+    # integer primitives
+    ############################################################################
+    def _adjacent(self, id_, kind):
+        """Return the adjacent nodes and the edges of the node with the
+        given integer id: `edges` for all the edges, `dovetails` for
+        the dovetail overlaps, `L` or `R` for the dovetail overlaps on
+        that segment end.
+        """
+        pointers, columns, edges = self._lists[kind]
+        start, end = pointers[id_], pointers[id_ + 1]
+        return columns[start:end], edges[start:end]
+
+    def dovetails_neighbor_ids(self, id_):
+        """Return the integer ids of the nodes that share a dovetail
+        overlap with the node with the given integer id.
+        """
+        return self._adjacent(id_, "dovetails")[0]
+
+    def _degree(self, id_, kind):
+        pointers = self._lists[kind][0]
+        return pointers[id_ + 1] - pointers[id_]
+
+    def _is_linear(self, id_):
+        return self._linear[id_]
+
+    def _node_ids(self, nbunch):
+        """Return the integer ids of the nodes in nbunch, all the nodes
+        if None.
+        """
+        if nbunch is None:
+            return range(len(self._names))
+        if isinstance(nbunch, str) or not hasattr(nbunch, '__iter__'):
+            return [self._ids[nbunch]] if nbunch in self._ids else []
+        return [self._ids[nid] for nid in nbunch if nid in self._ids]
+
+    ############################################################################
+    # graph interface
+    ############################################################################
+    def __contains__(self, id_):
+        try:
+            return id_ in self._ids or id_ in self._key_ids \
+                   or id_ in self._subgraphs
+        except TypeError:
+            return False
+
+    def __len__(self):
+        return len(self._names)
+
+    def nodes_iter(self, data=False, with_sequence=False):
+        for id_, nid in enumerate(self._names):
+            if with_sequence and not self.has_sequence[id_]:
+                continue
+            yield (nid, self._nodes[id_]) if data else nid
+
+    def nodes(self, data=False, with_sequence=False):
+        return list(self.nodes_iter(data=data, with_sequence=with_sequence))
+
+    def node(self, identifier=None):
+        if identifier is None:
+            return types.MappingProxyType(dict(zip(self._names, \
+                                                   self._nodes)))
+        if identifier in self._ids:
+            return self._nodes[self._ids[identifier]]
+
+    def nbunch_iter(self, nbunch=None):
+        return (self._names[id_] for id_ in self._node_ids(nbunch))
+
+    def _edge_tuple(self, from_id, to_id, edge_, keys, data):
+        from_node, to_node = self._names[from_id], self._names[to_id]
+        if data:
+            return (from_node, to_node, self._keys[edge_], \
+                    self._edges[edge_]) if keys \
+                   else (from_node, to_node, self._edges[edge_])
+        return (from_node, to_node, self._keys[edge_]) if keys \
+               else (from_node, to_node)
+
+    def _edges_iter(self, kind, nbunch, keys, data):
+        """Iterate over the edges of the given kind (see _adjacent) of
+        the nodes in nbunch, each one once, like networkx does.
+        """
+        if nbunch is None:
+            edges = range(len(self._keys)) if kind == "edges" \
+                    else np.flatnonzero(self.edge_types == DOVETAIL).tolist()
+            ends = self.edge_ends.tolist()
+            for edge_ in edges:
+                yield self._edge_tuple(ends[edge_][0], ends[edge_][1], \
+                                       edge_, keys, data)
+            return
+        seen = set()
+        for id_ in self._node_ids(nbunch):
+            columns, edges = self._adjacent(id_, kind)
+            for to_id, edge_ in zip(columns, edges):
+                if not to_id in seen:
+                    yield self._edge_tuple(id_, to_id, edge_, keys, data)
+            seen.add(id_)
+
+    def edges_iter(self, nbunch=None, data=False, keys=False, default=None):
+        return self._edges_iter("edges", nbunch, keys, data)
+
+    def edges(self, nbunch=None, data=False, keys=False):
+        return list(self.edges_iter(nbunch, data=data, keys=keys))
+
+    def edge(self, identifier):
+        """Return the attributes of the edge with the given key, or of
+        the edges between the nodes given in a tuple (with the key as
+        third element to select a single edge).
+        """
+        if isinstance(identifier, tuple):
+            if len(identifier) < 2:
+                raise FrozenGFAError("At least two values are required.")
+            if identifier[0] in self._ids and identifier[1] in self._ids:
+                to_id = self._ids[identifier[1]]
+                columns, edges = self._adjacent(self._ids[identifier[0]], \
+                                                "edges")
+                found = {self._keys[edge_]: self._edges[edge_] \
+                         for column, edge_ in zip(columns, edges) \
+                         if column == to_id}
+                if len(identifier) > 2:
+                    return found.get(identifier[2])
+                return found or None
+            return None
+        if identifier in self._key_ids:
+            return self._edges[self._key_ids[identifier]]
+
+    def subgraphs(self, identifier=None):
+        if identifier is None:
+            return self._subgraphs
+        return self._subgraphs.get(identifier)
+
+    def neighbors(self, nid):
+        if not nid in self._ids:
+            raise FrozenGFAError("The source node is not in the graph.")
+        columns, _ = self._adjacent(self._ids[nid], "edges")
+        return [self._names[id_] for id_ in dict.fromkeys(columns)]
+
+    ############################################################################
+    # DovetailIterator
+    ############################################################################
+    def dovetails_iter(self, nbunch=None, keys=False, data=False):
+        return self._edges_iter("dovetails", nbunch, keys, data)
+
+    def _segment_end_iter(self, nbunch, end, keys=False, data=False):
+        for id_ in self._node_ids(nbunch):
+            columns, edges = self._adjacent(id_, end)
+            for to_id, edge_ in zip(columns, edges):
+                yield self._edge_tuple(id_, to_id, edge_, keys, data)
+
+    def _segment_end_degree(self, nid, end):
+        return self._degree(self._ids[nid], end) if nid in self._ids else 0
+
+    def right_degree_iter(self, nbunch=None):
+        return ((self._names[id_], self._degree(id_, "R")) \
+                for id_ in self._node_ids(nbunch))
+
+    def left_degree_iter(self, nbunch=None):
+        return ((self._names[id_], self._degree(id_, "L")) \
+                for id_ in self._node_ids(nbunch))
+
+    def _linear_path_nodes(self, source):
+        """Return the integer ids of the nodes found by
+        `dovetails_linear_path_traverse_nodes_iter`.
+        """
+        seen = []
+        seen_set = set()
+        nextlevel = {source}
+        while nextlevel:
+            thislevel = nextlevel
+            nextlevel = set()
+            for id_ in thislevel:
+                if not id_ in seen_set and self._is_linear(id_):
+                    seen.append(id_)
+                    seen_set.add(id_)
+                    nextlevel.update(self._adjacent(id_, "R")[0])
+                    nextlevel.update(self._adjacent(id_, "L")[0])
+        return seen
+
+    def _linear_path_edges(self, source):
+        """Return the edges found by
+        `dovetails_linear_path_traverse_edges_iter` as
+        (from, to, edge) tuples of integers.
+        """
+        if not self._is_linear(source):
+            return
+        seen = {source}
+        queue = [source]
+        while queue:
+            from_id = queue.pop()
+            for to_id, edge_ in zip(*self._adjacent(from_id, "dovetails")):
+                if not to_id in seen and self._is_linear(to_id):
+                    yield from_id, to_id, edge_
+                    seen.add(to_id)
+                    queue.append(to_id)
+
+    def _linear_path(self, path_nodes):
+        """Return the edges of the linear path through the given
+        nodes, as integer tuples, or None if the path is circular.
+        """
+        path_set = set(path_nodes)
+        for id_ in path_nodes:
+            for to_id in self._adjacent(id_, "dovetails")[0]:
+                if not to_id in path_set:
+                    return self._linear_path_edges(id_)
+        return None
+
+    def dovetails_linear_path_traverse_nodes_iter(self, source):
+        if not source in self._ids:
+            return iter(())
+        return (self._names[id_] \
+                for id_ in self._linear_path_nodes(self._ids[source]))
+
+    def dovetails_linear_path_traverse_edges_iter(self, source, keys=False):
+        if not source in self._ids:
+            return iter(())
+        return (self._edge_tuple(from_id, to_id, edge_, keys, False) \
+                for from_id, to_id, edge_ in \
+                  self._linear_path_edges(self._ids[source]))
+
+    def dovetails_linear_path_iter(self, source, keys=False):
+        if not source in self._ids:
+            return iter(())
+        path_nodes = self._linear_path_nodes(self._ids[source])
+        if not path_nodes:
+            return iter(())
+        path_ = self._linear_path(path_nodes)
+        if path_ is None:
+            # circular path
+            return DovetailIterator.dovetails_linear_path_iter(self, source, \
+                                                               keys=keys)
+        return (self._edge_tuple(from_id, to_id, edge_, keys, False) \
+                for from_id, to_id, edge_ in path_)
+
+    ############################################################################
+    # dovetail operations
+    ############################################################################
+    def _components(self, ends, with_sequence=False):
+        labels = component_labels(len(self._names), ends)
+        order = np.argsort(labels, kind='stable')
+        bounds = np.flatnonzero(np.diff(labels[order])) + 1
+        for members in np.split(order, bounds):
+            if len(members) == 0:
+                continue
+            if with_sequence and not self.has_sequence[members].any():
+                continue
+            yield set(self._names[id_] for id_ in members.tolist())
+
+    def _reachable(self, source, kind):
+        seen = {source}
+        queue = [source]
+        while queue:
+            for to_id in self._adjacent(queue.pop(), kind)[0]:
+                if not to_id in seen:
+                    seen.add(to_id)
+                    queue.append(to_id)
+        return set(self._names[id_] for id_ in seen)
+
+    def nodes_connected_components(self):
+        """Return a generator of sets with the nodes of each
+        connected component of the graph.
+        """
+        return self._components(self.edge_ends)
+
+    def nodes_connected_component(self, nid):
+        return self._reachable(self._ids[nid], "edges")
+
+    def dovetails_nodes_connected_components(self, with_sequence=True):
+        """Return a generator of sets with the nodes of each connected
+        component, considering only dovetail overlaps.
+
+        :param with_sequence: If set only the components with at least
+            a node with a `sequence` property are given.
+        """
+        return self._components(self.dovetail_ends, with_sequence)
+
+    def dovetails_nodes_connected_component(self, source):
+        if not source in self._ids:
+            return set()
+        return self._reachable(self._ids[source], "dovetails")
+
+    def dovetails_linear_paths(self, keys=False):
+        """Return a generator of the linear paths of the graph, see
+        `dovetail_operations.linear_paths`.
+        """
+        done = bytearray(len(self._names))
+        for source in range(len(self._names)):
+            if done[source] or not self._linear[source]:
+                continue
+            path_nodes = self._linear_path_nodes(source)
+            path_ = self._linear_path(path_nodes)
+            if path_ is None:
+                path_ = list(DovetailIterator.dovetails_linear_path_iter(\
+                                self, self._names[source], keys=keys))
+            else:
+                path_ = [self._edge_tuple(from_id, to_id, edge_, keys, False) \
+                         for from_id, to_id, edge_ in path_]
+            if path_:
+                yield path_
+            for id_ in path_nodes:
+                done[id_] = 1
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
@@ -10,6 +10,7 @@ dovetail overlaps edges.
 """
 import logging
 import copy
+import io
 import re
 import os
 
@@ -17,9 +18,20 @@ import networkx as nx
 from networkx.classes.function import all_neighbors as nx_all_neighbors
 
 from pygfa.graph_element.parser import header, segment, link, containment, path
+from pygfa.graph_element.parser import line
 from pygfa.graph_element.parser import edge, gap, fragment, group
+from pygfa.graph_element.parser import field_validator as fv
 from pygfa.graph_element import node, edge as ge, subgraph as sg
 from pygfa.serializer import gfa1_serializer as gs1, gfa2_serializer as gs2
+from pygfa.serializer import writer, parallel as parallel_serializer
+from pygfa.serializer import compressed_writer
+from pygfa.loader import stream, parallel, compressed, segment_index
+from pygfa.loader import records
+from pygfa.loader import topology
+from pygfa.storage.sequence_store import SequenceHandle
+from pygfa.storage import snapshot, file_sequences
+from pygfa import frozen_gfa
+from pygfa.dynamic_components import DynamicComponents
 
 from pygfa.dovetail_operations.iterator import DovetailIterator
 
@@ -62,6 +74,18 @@ def _index(obj, other):
             index += 1
     return found, index
 
+def _copy_attributes(attributes):
+    """Return a copy of the attributes of a node or of an edge.
+
+    The values are shared, apart from the fields whose value can
+    be changed, and the optional fields not decoded yet stay so.
+    """
+    copied = attributes.copy()
+    for key, value in dict.items(copied):
+        if isinstance(value, line.Field):
+            copied[key] = line.copy_field(value)
+    return copied
+
 class GFA(DovetailIterator):
     """GFA will use a networkx MultiGraph as structure to contain
     the elements of the specification.
@@ -70,7 +94,7 @@ class GFA(DovetailIterator):
     undirectly by accessing the `_graph` attribute.
     """
 
-    def __init__(self, base_graph=None):
+    def __init__(self, base_graph=None, sequence_store=None):
         """Creates a GFA graph.
 
         If :param base_graph: is not `None` use the graph provided
@@ -82,6 +106,10 @@ class GFA(DovetailIterator):
         by `next_virtual_id`.
 
         :param base graph: An instance of a networkx.MultiGraph.
+        :param sequence_store: If given, the sequences of the nodes
+            added to the graph are kept into this store (such as
+            a storage.sequence_store.PackedSequenceStore) and the
+            nodes only hold a handle to them.
         """
         if base_graph != None and not isinstance(base_graph, nx.MultiGraph):
             raise GFAError("{0} ".format(type(base_graph)) \
@@ -89,18 +117,28 @@ class GFA(DovetailIterator):
                             + "graph, "\
                             + "use networkx.MultiGraph instead.")
         self._graph = nx.MultiGraph(base_graph)
+        # edge key -> (from_node, to_node), to find an edge by its key
+        # without scanning all the edges
+        self._edge_ends = self._make_edge_table()
+        # (nid, 'L'|'R') -> dovetail overlaps of that segment end,
+        # see _index_dovetail
+        self._dovetail_ends = {}
+        for from_node, to_node, key, data_ in \
+          self._graph.edges_iter(keys=True, data=True):
+            self._index_dovetail(key, data_)
         self._subgraphs = {}
+        self._sequence_store = sequence_store
         self._next_virtual_id = 0 if base_graph is None else \
                                 self._find_max_virtual_id()
+        # connected components kept up to date, see track_components
+        self._components = None
+        self._dovetails_components = None
 
     def __contains__(self, id_):
         try:
             if id_ in self._graph.node:
                 return True
-            edge_keys = (key for from_node in self._graph.adj \
-                            for to_node in self._graph.adj[from_node] \
-                                for key in self._graph.adj[from_node][to_node])
-            if id_ in edge_keys:
+            if self._get_edge_end_nodes(id_) != (None, None):
                 return True
             if id_ in self._subgraphs:
                 return True
@@ -116,8 +154,62 @@ class GFA(DovetailIterator):
         delete all the subgraphs.
         """
         self._graph.clear()
+        self._edge_ends = {}
+        self._dovetail_ends = {}
         self._next_virtual_id = 0
         self._subgraphs = {}
+        if self._components is not None:
+            self._components.clear()
+            self._dovetails_components.clear()
+
+
+    def track_components(self, enable=True):
+        """Keep the connected components of the graph up to date
+        while nodes and edges are added and removed, so that finding
+        the component of a node doesn't need to visit it each time.
+
+        Adding an edge joins two components at once, while removing
+        an edge or a node invalidates its component, which is visited
+        again only when one of its nodes is queried.
+        `nodes_connected_component`, `nodes_connected_components` and
+        `dovetails_nodes_connected_component` use the components
+        kept by the graph when they are tracked.
+
+        :param enable: If False stop tracking the components.
+        :note:
+            Nodes and edges added to or removed from the networkx
+            graph directly are not tracked.
+        """
+        if not enable:
+            self._components = None
+            self._dovetails_components = None
+            return
+        self._components = DynamicComponents(\
+                                self._graph.node, \
+                                self._neighbor_nodes)
+        self._dovetails_components = DynamicComponents(\
+                                self._graph.node, \
+                                self._dovetail_neighbor_nodes)
+        for nid in self._graph.nodes_iter():
+            self._components.add_node(nid)
+            self._dovetails_components.add_node(nid)
+        for from_node, to_node, data_ in self._graph.edges_iter(data=True):
+            self._components.union(from_node, to_node)
+            if data_.get('is_dovetail'):
+                self._dovetails_components.union(from_node, to_node)
+
+
+    def _neighbor_nodes(self, nid):
+        return self._graph.adj[nid]
+
+
+    def _dovetail_neighbor_nodes(self, nid):
+        """Return an iterator over the nodes joined to the given one
+        by a dovetail overlap, read from the index of the segment ends.
+        """
+        for end in ((nid, "L"), (nid, "R")):
+            for to_node, _, _ in self._dovetail_ends.get(end, ()):
+                yield to_node
 
 
     def _get_virtual_id(self, increment=True):
@@ -140,7 +232,7 @@ class GFA(DovetailIterator):
         regexp = re.compile(virtual_rxp)
         virtual_keys = [0]
 
-        for from_, to_, key in self.edges_iter(keys=True):
+        for key in self._edge_ends:
             match = regexp.fullmatch(key)
             if match:
                 virtual_keys.append(int(match.group(1)))
@@ -241,13 +333,67 @@ class GFA(DovetailIterator):
     def _get_edge_end_nodes(self, edge_key):
         """Given an edge key return a tuple that contains
         the end nodes for that edge.
+
+        The end nodes are taken from the index of the edge keys,
+        so edges added directly to the networkx graph are not found.
         """
-        for from_node, to_node, key in self.edges_iter(keys=True):
-            if key == edge_key:
-                return from_node, to_node
+        ends = self._edge_ends.get(edge_key)
+        if ends is not None and \
+          edge_key in self._graph.adj.get(ends[0], {}).get(ends[1], ()):
+            return ends
         return None, None
 
 
+    def _dovetail_entries(self, key, attributes):
+        """Return the segment ends of a dovetail overlap, each one with
+        its entry in the index of the segment ends: the node at the
+        other end, the edge key and the side of the edge (0 from,
+        1 to), so a self loop on a single end is listed twice.
+        """
+        if not attributes.get('is_dovetail'):
+            return ()
+        from_node = attributes.get('from_node')
+        to_node = attributes.get('to_node')
+        return (((from_node, attributes.get('from_segment_end')), \
+                 (to_node, key, 0)), \
+                ((to_node, attributes.get('to_segment_end')), \
+                 (from_node, key, 1)))
+
+
+    def _index_dovetail(self, key, attributes):
+        """Add a dovetail overlap to the index of the segment ends,
+        that maps each end of a segment to the overlaps on it.
+        Other edges are ignored.
+        """
+        for end, entry in self._dovetail_entries(key, attributes):
+            if not end in self._dovetail_ends:
+                self._dovetail_ends[end] = {}
+            self._dovetail_ends[end][entry] = None
+
+
+    def _unindex_dovetail(self, key, attributes):
+        for end, entry in self._dovetail_entries(key, attributes):
+            entries = self._dovetail_ends.get(end)
+            if entries is not None:
+                entries.pop(entry, None)
+                if not entries:
+                    del self._dovetail_ends[end]
+
+
+    def _unindex_edge(self, key, from_node, to_node, attributes):
+        """Remove the edge between the given nodes from the index
+        of the edge keys and from the index of the segment ends.
+        """
+        if self._edge_ends.get(key) in ((from_node, to_node), \
+                                        (to_node, from_node)):
+            del self._edge_ends[key]
+        self._unindex_dovetail(key, attributes)
+        if self._components is not None:
+            self._components.invalidate(from_node)
+            if attributes.get('is_dovetail'):
+                self._dovetails_components.invalidate(from_node)
+
+
     def get(self, key):
         """Return the element pointed by the specified key."""
         if key in self._graph.node:
@@ -272,15 +418,19 @@ class GFA(DovetailIterator):
         if sg.is_subgraph(element):
             return copy.deepcopy(element)
 
-        tmp_list = copy.deepcopy(element)
+        # the fields are copied by the graph element
+        tmp_list = element.copy()
         try:
             if 'nid' in element:
                 tmp_list.pop('nid')
                 tmp_list.pop('sequence')
                 tmp_list.pop('slen')
+                sequence = element['sequence']
+                if isinstance(sequence, SequenceHandle):
+                    sequence = str(sequence)
                 return node.Node(\
                                 element['nid'], \
-                                element['sequence'], \
+                                sequence, \
                                 element['slen'], \
                                 opt_fields=tmp_list)
             if 'eid' in element:
@@ -349,15 +499,36 @@ class GFA(DovetailIterator):
         if safe and new_node.nid in self:
             raise GFAError("An element with the same id already exists.")
 
-        self._graph.add_node(\
-                              new_node.nid, \
-                              nid=new_node.nid, \
-                              sequence=new_node.sequence, \
-                              slen=new_node.slen, \
-                              **new_node.opt_fields)
+        _, nid, attributes = records.node_record(new_node)
+        self._add_node_attributes(nid, attributes)
         return True
 
 
+    def _add_node_attributes(self, nid, attributes):
+        """Add a node to the networkx graph given its id and the
+        dictionary of its attributes, the dictionary is used as is.
+
+        Every node added to the GFA graph pass through this method.
+        """
+        if 'sequence' in attributes:
+            attributes['sequence'] = \
+              self._store_sequence(attributes['sequence'])
+        self._graph.add_node(nid, attr_dict=attributes)
+        if self._components is not None:
+            self._components.add_node(nid)
+            self._dovetails_components.add_node(nid)
+
+
+    def _store_sequence(self, sequence):
+        """Return the value to keep as the sequence of a node:
+        its handle if the graph has a sequence store, the sequence
+        itself otherwise.
+        """
+        if self._sequence_store is None:
+            return sequence
+        return self._sequence_store.add(sequence)
+
+
     def remove_node(self, nid):
         """Remove a node with nid as its node id.
 
@@ -368,10 +539,18 @@ class GFA(DovetailIterator):
         :raise InvalidNodeError: If `nid` doesn't point to any node.
         """
         try:
+            edges = [(neighbor, key, data_) \
+                     for neighbor, keydict in self._graph.adj[nid].items() \
+                     for key, data_ in keydict.items()]
             self._graph.remove_node(nid)
         except:
             raise node.InvalidNodeError("{0} doesn't point".format(nid) \
                                         + " to any node in the graph.")
+        for neighbor, key, data_ in edges:
+            self._unindex_edge(key, nid, neighbor, data_)
+        if self._components is not None:
+            self._components.invalidate(nid)
+            self._dovetails_components.invalidate(nid)
 
 
     def nodes_iter(self, data=False, with_sequence=False):
@@ -439,10 +618,7 @@ class GFA(DovetailIterator):
         if not ge.is_edge(new_edge):
             raise ge.InvalidEdgeError("The object is not a valid edge.")
 
-        key = new_edge.eid
-        if new_edge.eid is None or new_edge.eid == '*':
-            key = "virtual_{0}".format(self._get_virtual_id())
-
+        key = self._edge_key(new_edge.eid)
         if safe:
             edge_exists = key in self
             node1_exists = new_edge.from_node in self
@@ -453,23 +629,59 @@ class GFA(DovetailIterator):
                        node2_exists):
                 raise GFAError("From/To node are not already in the graph.")
 
-        self._graph.add_edge( \
-                               new_edge.from_node, new_edge.to_node, key=key, \
-                               eid=new_edge.eid, \
-                               from_node=new_edge.from_node, \
-                               from_orn=new_edge.from_orn, \
-                               to_node=new_edge.to_node, \
-                               to_orn=new_edge.to_orn, \
-                               from_positions=new_edge.from_positions, \
-                               to_positions=new_edge.to_positions, \
-                               alignment=new_edge.alignment, \
-                               distance=new_edge.distance, \
-                               variance=new_edge.variance, \
-                               is_dovetail=new_edge.is_dovetail, \
-                               from_segment_end=new_edge.from_segment_end, \
-                               to_segment_end=new_edge.to_segment_end, \
-                               **new_edge.opt_fields \
-                               )
+        _, from_node, to_node, attributes = records.edge_record(new_edge)
+        self._add_edge_attributes(from_node, to_node, key, attributes)
+
+
+    def _edge_key(self, eid):
+        """Return the key to use for an edge with the given id,
+        giving a new virtual id to edges without id.
+        """
+        if eid is None or eid == '*':
+            return "virtual_{0}".format(self._get_virtual_id())
+        return eid
+
+
+    def _add_edge_attributes(self, from_node, to_node, key, attributes):
+        """Add an edge to the networkx graph given its end nodes,
+        its key and the dictionary of its attributes.
+
+        Every edge added to the GFA graph pass through this method.
+        """
+        adj = self._graph.adj
+        keydict = adj[from_node].get(to_node) if from_node in adj else None
+        self._edge_ends[key] = (from_node, to_node)
+        if keydict is not None and key in keydict:
+            # the attributes are merged with the existing ones
+            self._unindex_dovetail(key, keydict[key])
+            if self._components is not None \
+              and keydict[key].get('is_dovetail'):
+                self._dovetails_components.invalidate(from_node)
+            self._graph.add_edge(from_node, to_node, key=key, \
+                                 attr_dict=attributes)
+            self._index_dovetail(key, keydict[key])
+            self._union_components(from_node, to_node, keydict[key])
+            return
+        # networkx would copy the attributes into a new dictionary
+        # (decoding all the optional fields of a LazyOptFields),
+        # so the dictionary is stored as is
+        for nid in (from_node, to_node):
+            if not nid in adj:
+                self._graph.add_node(nid)
+        if keydict is None:
+            keydict = self._graph.edge_key_dict_factory()
+            adj[from_node][to_node] = keydict
+            adj[to_node][from_node] = keydict
+        keydict[key] = attributes
+        self._index_dovetail(key, attributes)
+        self._union_components(from_node, to_node, attributes)
+
+
+    def _union_components(self, from_node, to_node, attributes):
+        if self._components is not None:
+            self._components.union(from_node, to_node)
+            if attributes.get('is_dovetail'):
+                self._dovetails_components.union(from_node, to_node)
 
 
     def remove_edge(self, identifier):
@@ -494,14 +706,21 @@ class GFA(DovetailIterator):
                 if len(identifier) == 2:
                     self.remove_edges(identifier[0], identifier[1])
                 else:
+                    data_ = self._search_edge_by_nodes(identifier)
                     self._graph.remove_edge(identifier[0], \
                                             identifier[1], \
                                             identifier[2])
+                    self._unindex_edge(identifier[2], \
+                                       identifier[0], \
+                                       identifier[1], \
+                                       data_)
             else:
                 from_node, to_node = self._get_edge_end_nodes(identifier)
+                data_ = self._search_edge_by_key(identifier)
                 self._graph.remove_edge(from_node, \
                                         to_node, \
                                         identifier)
+                self._unindex_edge(identifier, from_node, to_node, data_)
         except nx.NetworkXError as nxe:
             raise ge.InvalidEdgeError(nxe)
 
@@ -514,9 +733,11 @@ class GFA(DovetailIterator):
         the number of edges between the given nodes,
         removing all the edges indeed.
         """
-        num_edges = len(self.edge((from_node, to_node)))
-        for edge_ in range(0, num_edges):
+        edges = list(self.edge((from_node, to_node)).items())
+        for edge_ in range(0, len(edges)):
             self._graph.remove_edge(from_node, to_node)
+        for key, data_ in edges:
+            self._unindex_edge(key, from_node, to_node, data_)
 
 
     def edges_iter(self, nbunch=None, data=False, keys=False, default=None):
@@ -531,7 +752,9 @@ class GFA(DovetailIterator):
         """Add a Subgraph object to the graph.
 
         The object is not altered in any way.
-        A deepcopy of the object given is attached to the graph.
+        A copy of the object given is attached to the graph, that
+        shares the elements with it until one of the two accesses
+        them.
         """
         if isinstance(subgraph, str):
             if subgraph[0] == "P":
@@ -593,11 +816,25 @@ class GFA(DovetailIterator):
             raise sg.InvalidSubgraphError(\
                 "There is no subgraph pointed by this key.")
         subgraph = self._subgraphs[sub_key]
-        sub_gfa = GFA()
-        for id_, orn in subgraph.elements.items():
-            # creating a new GFA graph and the add method,
-            # the virtual id are recomputed
-            sub_gfa.add_graph_element(self.as_graph_element(id_))
+        sub_gfa = GFA(sequence_store=self._sequence_store)
+        for id_ in subgraph.elements:
+            # the attributes are copied as they are, without building
+            # the graph elements, the virtual ids are recomputed
+            if id_ in self._graph.node:
+                sub_gfa._add_node_attributes(\
+                    id_, _copy_attributes(self._graph.node[id_]))
+            elif id_ in self._subgraphs:
+                sub_gfa.add_subgraph(self._subgraphs[id_])
+            else:
+                from_node, to_node = self._get_edge_end_nodes(id_)
+                if from_node is None:
+                    raise InvalidElementError(\
+                        "No graph element has the given key: {0}".format(id_))
+                attributes = self._graph.adj[from_node][to_node][id_]
+                sub_gfa._add_edge_attributes(\
+                    from_node, to_node, \
+                    sub_gfa._edge_key(attributes['eid']), \
+                    _copy_attributes(attributes))
         return sub_gfa
 
 
@@ -728,72 +965,151 @@ class GFA(DovetailIterator):
         return retval
 
 
-    def from_string(self, string):
+    def from_string(self, string, mode=stream.LINES, validation=None):
         """Add a GFA string to the graph once it has been
         converted.
 
-        :TODO:
-            Maybe this could be used instead of checking for line type
-            in the add_xxx methods...
-        """
-        lines = re.split("\n", string)
-        for line_ in lines:
-            line_ = line_.strip()
-            if len(line_) < 1:
-                continue
-            if line_[0] == 'S':
-                if segment.is_segmentv1(line_):
-                    self.add_graph_element(\
-                        node.Node.from_line(\
-                            segment.SegmentV1.from_string(line_)))
-                else:
-                    self.add_graph_element(\
-                        node.Node.from_line(\
-                            segment.SegmentV2.from_string(line_)))
-            elif line_[0] == 'L':
-                self.add_graph_element(\
-                    ge.Edge.from_line(\
-                        link.Link.from_string(line_)))
-            elif line_[0] == 'C':
-                self.add_graph_element(\
-                    ge.Edge.from_line(\
-                        containment.Containment.from_string(line_)))
-            elif line_[0] == 'E':
-                self.add_graph_element(\
-                    ge.Edge.from_line(\
-                        edge.Edge.from_string(line_)))
-            elif line_[0] == 'G':
-                self.add_graph_element(\
-                    ge.Edge.from_line(\
-                        gap.Gap.from_string(line_)))
-            elif line_[0] == 'F':
-                self.add_graph_element(\
-                    ge.Edge.from_line(\
-                        fragment.Fragment.from_string(line_)))
-            elif line_[0] == 'P':
-                self.add_graph_element(\
-                    sg.Subgraph.from_line(\
-                        path.Path.from_string(line_)))
-            elif line_[0] == 'O':
-                self.add_graph_element(\
-                    sg.Subgraph.from_line(\
-                        group.OGroup.from_string(line_)))
-            elif line_[0] == 'U':
-                self.add_graph_element(\
-                    sg.Subgraph.from_line(\
-                        group.UGroup.from_string(line_)))
+        The string is consumed line by line through the
+        streaming loader.
+
+        :param mode: `lines` to parse each line through the Line
+            classes, validating every field, `records` to use
+            the faster record parser or `lazy` to also decode the
+            optional fields only when they are accessed.
+        :param validation: The validation level of the fields
+            (see field_validator), if None the current one is used.
+        """
+        stream.load_lines(self, io.StringIO(string), mode, validation)
 
 
     # This method has been checked manually
     @classmethod
-    def from_file(cls, filepath): # pragma: no cover
+    def from_file(cls, filepath, workers=None, mode=stream.LINES, \
+                  validation=None, sequence_store=None, \
+                  topology_only=False, cache_size=0): # pragma: no cover
         """Parse the given file and return a GFA object.
+
+        The file is read incrementally, one line at a time, so the
+        memory required depends on the graph and not on the
+        size of the file.
+
+        gzip, BGZF and (if a zstd module is available) zstd
+        compressed files are detected and decompressed in a
+        background thread while the lines are parsed.
+
+        :param workers: If greater than 1, the file is parsed by
+            the given number of processes; the resulting graph is
+            the same obtained by a sequential load.
+        :param mode: `lines` to parse each line through the Line
+            classes, validating every field, `records` to use
+            the faster record parser or `lazy` to also decode the
+            optional fields only when they are accessed.
+        :param validation: The validation level of the fields
+            (see field_validator), if None the current one is used.
+            Use `trusted` to skip the checks on files known to be
+            valid, such as the ones written by pygfa.
+        :param sequence_store: If given, the store where the
+            sequences of the segments are kept.
+        :param topology_only: If True, the segments keep only the
+            offset and the length of their sequence in the file,
+            that is read back from it when accessed (see
+            file_sequences); the file is loaded sequentially and must
+            be uncompressed and left unchanged.
+        :param cache_size: With topology_only, the maximum number of
+            characters of the sequences kept in memory once read.
+        :raises CompressionError: With topology_only, if the file
+            is compressed.
+        """
+        if topology_only:
+            if sequence_store is not None:
+                raise GFAError("A sequence store can't be used with " \
+                               + "a topology only load.")
+            if compressed.detect_compression(filepath) != compressed.PLAIN:
+                raise compressed.CompressionError(\
+                    "Topology only loading requires an uncompressed file.")
+            pygfa_ = GFA()
+            source = file_sequences.FileSequenceSource(filepath, cache_size)
+            topology.load_file(pygfa_, filepath, source, mode, validation)
+            return pygfa_
+
+        pygfa_ = GFA(sequence_store=sequence_store)
+        if workers is not None and workers > 1:
+            parallel.load_file(pygfa_, filepath, workers, \
+                               mode=mode, validation=validation)
+            return pygfa_
+
+        compression = compressed.detect_compression(filepath)
+        if compression == compressed.PLAIN:
+            with open(filepath) as file_handler:
+                stream.load_lines(pygfa_, file_handler, mode, validation)
+        else:
+            with compressed.open_lines(filepath, compression) as lines:
+                stream.load_lines(pygfa_, lines, mode, validation)
+        return pygfa_
+
+
+    def save_snapshot(self, path):
+        """Write a binary snapshot of the graph to the given path,
+        that can be loaded back with `load_snapshot` much faster
+        than parsing the GFA file again.
+
+        :raises SnapshotError: If the graph can't be stored.
+        """
+        snapshot.save_snapshot(self, path)
+
+
+    @classmethod
+    def load_snapshot(cls, path, sequence_store=None):
+        """Load a graph from a snapshot written by `save_snapshot`.
+
+        The fields are not validated again and the optional fields
+        are decoded only when they are accessed. Snapshots hold only
+        data, loading one never runs code, but since nothing is
+        validated they should come from trusted sources.
+
+        :param sequence_store: If given, the store where the
+            sequences of the segments are kept.
+        :raises SnapshotError: If the file is not a valid snapshot.
         """
-        pygfa_ = GFA()
-        file_handler = open(filepath)
-        file_content = file_handler.read()
-        file_handler.close()
-        pygfa_.from_string(file_content)
+        pygfa_ = GFA(sequence_store=sequence_store)
+        snapshot.load_snapshot(pygfa_, path, sequence_store)
+        return pygfa_
+
+
+    def freeze(self):
+        """Return an immutable copy of the graph, stored in arrays,
+        where the dovetail operations run much faster.
+
+        Changes made to the graph after it has been frozen are not
+        seen by the frozen graph, apart from the attributes of nodes
+        and edges.
+        """
+        return frozen_gfa.FrozenGFA(self)
+
+
+    @classmethod
+    def load_region(cls, filepath, seeds, radius=1, mode=stream.LINES, \
+                    validation=None, index_path=None, sequence_store=None):
+        """Load only the segments within radius dovetail overlaps
+        from the seeds and the edges between them.
+
+        The lines are found through the `.gfai` index of the file
+        (see segment_index), which is built if it doesn't exist or
+        is out of date. Only plain and BGZF files are supported.
+
+        :param seeds: A segment name or an iterable of segment names.
+        :param radius: The number of dovetail overlaps from the seeds.
+        :param mode: The parse mode, as in `from_file`.
+        :param validation: The validation level of the fields.
+        :param index_path: The path of the index, if None the file
+            path with the `.gfai` extension added is used.
+        :param sequence_store: If given, the store where the
+            sequences of the segments are kept.
+        :raises SegmentIndexError: If the file can't be indexed.
+        """
+        pygfa_ = GFA(sequence_store=sequence_store)
+        segment_index.load_region(pygfa_, filepath, seeds, radius, mode, \
+                                  validation, index_path)
         return pygfa_
 
 
@@ -826,24 +1142,72 @@ class GFA(DovetailIterator):
         return string
 
 
-    def dump(self, gfa_version=1, out=None):
+    def dump(self, gfa_version=1, out=None, validation=None, \
+             buffer_size=writer.DEFAULT_BUFFER_SIZE, workers=None, \
+             compression=None, compression_level=\
+             compressed_writer.DEFAULT_LEVEL, index=False):
+        """Serialize the graph into a GFA string.
+
+        :param gfa_version: The version of the output, 1 or 2.
+        :param out: If given, the path of the file or an open text
+            file where the lines are written while they are
+            serialized, without building the whole string.
+        :param validation: The validation level used by the
+            serializer (see field_validator), if None the current
+            one is used.
+        :param buffer_size: The approximate number of characters
+            written to out at once.
+        :param workers: If greater than 1, the elements are
+            serialized by the given number of processes; the output
+            is the same of a sequential dump.
+        :param compression: `gzip` or `bgzf` to compress the file,
+            in a background thread, while it's written.
+        :param compression_level: The compression level, from 0 to 9.
+        :param index: If True (or the path of the index), the index
+            of the segments used by `load_region` is built while the
+            plain or BGZF file is written.
+        :raises GFAError: If the output is compressed or indexed but
+            out is not the path of a file.
+        """
         try:
-            dump_ = ""
-            if gfa_version == 1:
-                dump_ = gs1.serialize_gfa(self)
-            elif gfa_version == 2:
-                dump_ = gs2.serialize_gfa(self)
-            else:
-                raise ValueError("Invalid GFA output version.")
+            if compression is not None or index:
+                if out is None or hasattr(out, 'write'):
+                    raise GFAError("Compressed or indexed output " \
+                                   + "requires the path of a file.")
+                with compressed_writer.GFAFileWriter(out, compression, \
+                                                     compression_level, \
+                                                     index) as out_file:
+                    if workers is not None and workers > 1:
+                        parallel_serializer.dump(self, out_file, workers, \
+                                                 gfa_version, validation)
+                    else:
+                        writer.dump(self, out_file, gfa_version, \
+                                    validation, buffer_size)
+                return
+            if workers is not None and workers > 1:
+                return parallel_serializer.dump(self, out, workers, \
+                                                gfa_version, validation)
             if out is None:
-                return dump_
-
-            with open(out, 'w') as out_file:
-                out_file.write(dump_)
+                with fv.validation_level(validation):
+                    return writer.get_serializer(gfa_version)\
+                             .serialize_gfa(self)
+            writer.dump(self, out, gfa_version, validation, buffer_size)
         except EnvironmentError as env_error:
             GRAPH_LOGGER.error(repr(env_error))
 
 
+    def iter_lines(self, gfa_version=1, validation=None):
+        """Return an iterator over the lines of the serialized graph,
+        without their trailing newline, to pipe the graph into any
+        consumer (compressors, sockets...) one line at a time.
+
+        :param gfa_version: The version of the output, 1 or 2.
+        :param validation: The validation level used by the
+            serializer, if None the current one is used.
+        """
+        return writer.iter_lines(self, gfa_version, validation)
+
+
     def _make_edge_lut(self):
         """Return a lookup table that associate each edge id with a best
         match unique id dependent on edge information (from_node, to_node).
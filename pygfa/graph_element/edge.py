@@ -1,5 +1,3 @@
-import copy
-
 from pygfa.graph_element.parser import line
 
 class InvalidEdgeError(Exception):
@@ -19,7 +17,31 @@ def is_edge(obj):
     except: return False
 
 
+def segments_end(from_orn, to_orn, from_positions, to_positions):
+    """Compute the segments ends involved in a dovetail overlap.
+
+    :returns: A tuple with the end ('L' or 'R') of the source node
+        and the end of the destination node.
+    """
+    # GFA1 Links have no positions, GFA2 Edges with the dovetail
+    # from the end of from_node to the beginning of to_node
+    # are just like a GFA1 Link
+    if from_positions == (None, None) \
+      or to_positions == (None, None) \
+      or to_positions[0] == "0":
+        return ("R" if from_orn == "+" else "L", \
+                "L" if to_orn == "+" else "R")
+
+    # dovetail between end of to_node and begin of from_node
+    return ("L" if from_orn == "+" else "R", \
+            "R" if to_orn == "+" else "L")
+
+
 class Edge:
+    __slots__ = ('_eid', '_from_node', '_from_orn', '_to_node', '_to_orn', \
+                 '_from_positions', '_to_positions', '_alignment', \
+                 '_distance', '_variance', '_opt_fields', '_is_dovetail', \
+                 '_from_segment_end', '_to_segment_end')
 
     def __init__(self, \
                   edge_id, \
@@ -91,8 +113,10 @@ class Edge:
         self._from_orn = from_orn
         self._to_node = to_node
         self._to_orn = to_orn
-        self._from_positions = copy.deepcopy(from_positions)
-        self._to_positions = copy.deepcopy(to_positions)
+        # plain tuples of strings can be shared, any other
+        # tuple (such as a subclass) is copied
+        self._from_positions = tuple(from_positions)
+        self._to_positions = tuple(to_positions)
         self._alignment = alignment
 
         self._distance = distance
@@ -101,7 +125,7 @@ class Edge:
         self._opt_fields = {}
         for key, field in opt_fields.items():
             if line.is_field(field):
-                self._opt_fields[key] = copy.deepcopy(field)
+                self._opt_fields[key] = line.copy_field(field)
 
         self._is_dovetail = is_dovetail
         self._from_segment_end = None
@@ -173,49 +197,16 @@ class Edge:
         """
         if not self.is_dovetail:
             return
-
-        # check if it's a GFA1 Link 
-        if self.from_positions == (None, None) \
-          or self.to_positions == (None, None):
-            self._set_segments_end_link()
-        else:
-            self._set_segments_end_edge()
-
-
-    def _set_segments_end_link(self):
-        if self.from_orn == "+":
-            self._from_segment_end = "R"
-        else:
-            self._from_segment_end = "L"
-        if self.to_orn == "+":
-            self._to_segment_end = "L"
-        else:
-            self._to_segment_end = "R"
-
-
-    def _set_segments_end_edge(self):
-        beg1, end1 = self.from_positions
-        beg2, end2 = self.to_positions
-
-        # the dovetail is from the end of from_node to
-        # the beginning of to_node, just like a GFA1 Link
-        if beg2 == "0":
-            self._set_segments_end_link()
-        else: # dovetail between end of to_node and begin of from_node
-            if self.from_orn == "+":
-                self._from_segment_end = "L"
-            else:
-                self._from_segment_end = "R"
-            if self.to_orn == "+":
-                self._to_segment_end = "R"
-            else:
-                self._to_segment_end = "L"
+        self._from_segment_end, self._to_segment_end = \
+          segments_end(self.from_orn, self.to_orn, \
+                       self.from_positions, self.to_positions)
 
 
     @classmethod
     def from_line(cls, line_):
         try:
-            fields = copy.deepcopy(line_.fields)
+            # the fields are copied by the Edge
+            fields = dict(line_.fields)
             if line_.type == 'L':
                 if 'ID' in line_.fields:
                     fields.pop('ID')
@@ -0,0 +1,243 @@
+"""
+Dictionary of graph element attributes with lazily decoded
+optional fields.
+
+The optional fields of a line are kept as the raw tab separated
+string read from the file and each one is turned into an OptField
+only when it's accessed for the first time. A field is either
+decoded (and stored in the dictionary) or still raw, never both.
+
+Operations that need all the fields (iteration, length,
+equality...) decode all of them, so a LazyOptFields always behaves
+like the dictionary the eager parsers would have built.
+Repeated tags are rejected by the parser with the STRICT validation
+level, as `Line.add_field` does; below it they are not looked for,
+and the last raw field of a tag is the one decoded.
+"""
+import copy
+import re
+
+from pygfa.graph_element.parser import line, field_validator as fv
+
+_RAW_TAG = re.compile("[A-Za-z0-9]{2}:[ABHJZif]:")
+
+
+def decode_opt_field(raw_field):
+    """Build an OptField from its `TAG:TYPE:VALUE` string."""
+    groups = raw_field.split(":")
+    if len(groups) != 3:
+        raise ValueError(\
+                "OptField must have a name, a type and a value," \
+                + " given{0}".format(raw_field))
+    return line.OptField(groups[0], groups[2], groups[1])
+
+
+def check_opt_field(raw_field):
+    """Check a `TAG:TYPE:VALUE` string as `decode_opt_field` would,
+    without building the OptField.
+
+    :raises ValueError: If the tag or the type are not valid.
+    :raises InvalidFieldError: If the value is not valid for its type.
+    """
+    if raw_field.count(":") != 2 or not _RAW_TAG.match(raw_field):
+        raise ValueError("Invalid optional field, given {0}".format(\
+                                                            raw_field))
+    if not fv.is_valid(raw_field[5:], raw_field[3]):
+        raise fv.InvalidFieldError(\
+            "The string cannot be validated within its datatype,\n" \
+            + "given string : {0}\ndatatype: {1}.".format(raw_field[5:], \
+                                                          raw_field[3]))
+
+
+class LazyOptFields(dict):
+    """A dictionary that decodes its optional fields on demand.
+
+    :param attributes: The dictionary of the attributes already
+        decoded.
+    :param raw_tags: The optional fields not decoded yet, as a tab
+        separated string of `TAG:TYPE:VALUE` fields.
+    """
+    __slots__ = ('_raw_tags',)
+
+    def __init__(self, attributes=None, raw_tags=""):
+        dict.__init__(self, attributes if attributes is not None else {})
+        self._raw_tags = raw_tags
+
+    @property
+    def raw_tags(self):
+        """The optional fields not decoded yet."""
+        return self._raw_tags
+
+    def decoded_items(self):
+        """Return the items decoded so far, without decoding
+        the others.
+        """
+        return dict.items(self)
+
+    def _decoded_dict(self):
+        # dict.copy would go through keys(), decoding all the fields
+        return dict(dict.items(self))
+
+    def _find(self, key):
+        """Return the position of the last raw field with the given
+        tag in the raw tags string, or None.
+        """
+        raw = self._raw_tags
+        if not raw or not isinstance(key, str) or len(key) != 2:
+            return None
+        prefix = key + ":"
+        start = raw.rfind("\t" + prefix)
+        if start >= 0:
+            start += 1
+        elif raw.startswith(prefix):
+            start = 0
+        else:
+            return None
+        end = raw.find("\t", start)
+        if end < 0:
+            end = len(raw)
+        return start, end
+
+    def _remove_raw(self, start, end):
+        raw = self._raw_tags
+        if start == 0:
+            self._raw_tags = raw[end + 1:]
+        else:
+            self._raw_tags = raw[:start - 1] + raw[end:]
+
+    def _remove_tag(self, key):
+        """Remove all the raw fields with the given tag.
+
+        :returns True: If any has been removed.
+        """
+        position = self._find(key)
+        if position is None:
+            return False
+        while position is not None:
+            self._remove_raw(*position)
+            position = self._find(key)
+        return True
+
+    def _decode_tag(self, key):
+        """Decode the given tag if it's still raw, from its last
+        field, the one that the eager parsers keep.
+
+        :returns True: If the tag has been decoded.
+        """
+        position = self._find(key)
+        if position is None:
+            return False
+        start, end = position
+        field = decode_opt_field(self._raw_tags[start:end])
+        self._remove_tag(key)
+        dict.__setitem__(self, key, field)
+        return True
+
+    def decode_all(self):
+        """Decode all the optional fields still raw."""
+        if self._raw_tags:
+            for raw_field in self._raw_tags.split("\t"):
+                field = decode_opt_field(raw_field)
+                dict.__setitem__(self, field.name, field)
+            self._raw_tags = ""
+
+    def __missing__(self, key):
+        if self._decode_tag(key):
+            return dict.__getitem__(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or self._find(key) is not None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        self._remove_tag(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        if dict.__contains__(self, key):
+            dict.__delitem__(self, key)
+            return
+        if not self._remove_tag(key):
+            raise KeyError(key)
+
+    def pop(self, key, *default):
+        if dict.__contains__(self, key) or self._decode_tag(key):
+            return dict.pop(self, key)
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def setdefault(self, key, default=None):
+        if not key in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        dict.clear(self)
+        self._raw_tags = ""
+
+    def popitem(self):
+        self.decode_all()
+        return dict.popitem(self)
+
+    def __iter__(self):
+        self.decode_all()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self.decode_all()
+        return dict.__len__(self)
+
+    def keys(self):
+        self.decode_all()
+        return dict.keys(self)
+
+    def values(self):
+        self.decode_all()
+        return dict.values(self)
+
+    def items(self):
+        self.decode_all()
+        return dict.items(self)
+
+    def __eq__(self, other):
+        self.decode_all()
+        if isinstance(other, LazyOptFields):
+            other.decode_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def copy(self):
+        return LazyOptFields(self._decoded_dict(), self._raw_tags)
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return LazyOptFields(copy.deepcopy(self._decoded_dict(), memo), \
+                             self._raw_tags)
+
+    def __reduce__(self):
+        return (LazyOptFields, (self._decoded_dict(), self._raw_tags))
+
+    def __repr__(self):
+        self.decode_all()
+        return dict.__repr__(self)
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
@@ -1,5 +1,3 @@
-import copy
-
 from pygfa.graph_element.parser import segment
 from pygfa.graph_element.parser import line, field_validator as fv
 
@@ -31,6 +29,7 @@ class Node:
     So, a sequence will be accepted if and only if is a valid GFA2
     sequence, since GFA2 sequence is more tolerant than GFA1 sequence.
     """
+    __slots__ = ('_nid', '_sequence', '_slen', '_opt_fields')
 
     def __init__(self, node_id, sequence, length, opt_fields={}):
         """Construct a Node given an id, a sequence and a length.
@@ -71,7 +70,7 @@ class Node:
         self._opt_fields = {}
         for key, field in opt_fields.items():
             if line.is_field(field):
-                self._opt_fields[key] = copy.deepcopy(field)
+                self._opt_fields[key] = line.copy_field(field)
 
 
     @property
@@ -103,7 +102,8 @@ class Node:
              is not valid.
         """
         try:
-            fields = copy.deepcopy(segment_line.fields)
+            # the fields are copied by the Node
+            fields = dict(segment_line.fields)
             if segment.is_segmentv1(segment_line):
                 fields.pop('name')
                 fields.pop('sequence')
@@ -2,6 +2,7 @@
 Field validation module to check each field string against GFA1
 and GFA2 specification.
 """
+import contextlib
 import re
 
 class InvalidFieldError(Exception):
@@ -17,6 +18,11 @@ class FormatError(Exception):
     to the validator.
     """
 
+class UnknownValidationLevelError(Exception):
+    """Exception raised when setting a validation level that
+    is not one of `VALIDATION_LEVELS`.
+    """
+
 TYPE_A = 'A'
 TYPE_i = 'i'
 TYPE_f = 'f'
@@ -142,9 +148,135 @@ DATASTRING_VALIDATION_REGEXP = \
   }
 
 
+# Compiled version of the regular expressions above.
+DATASTRING_VALIDATION_PATTERN = \
+  {datatype: re.compile(regexp) \
+       for datatype, regexp in DATASTRING_VALIDATION_REGEXP.items()}
+
+
+# Sequences are checked by deleting the allowed characters from
+# their bytes: a valid sequence leaves nothing behind. This
+# is much faster than a regular expression on long sequences.
+_SEQUENCE_ALPHABET = \
+  { \
+  GFA1_SEQUENCE : \
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz=.", \
+  GFA2_SEQUENCE : bytes(range(ord("!"), ord("~") + 1)) \
+  }
+
+
+def _is_valid_sequence(string, datatype):
+    if string == "*":
+        return True
+    if len(string) == 0 or not string.isascii():
+        return False
+    return len(string.encode('ascii').translate(\
+        None, _SEQUENCE_ALPHABET[datatype])) == 0
+
+
+# Validation levels:
+# * STRICT: every field is checked against the specification.
+# * STRUCTURAL: only the fields that define the structure of the
+#   graph (ids, references, orientations, numbers, positions) are
+#   checked, while the content ones (sequences, alignments,
+#   strings...) are accepted as they are.
+# * TRUSTED: no field is checked, the input is assumed to be valid,
+#   for example because it has been written by pygfa itself.
+STRICT = 'strict'
+STRUCTURAL = 'structural'
+TRUSTED = 'trusted'
+VALIDATION_LEVELS = (STRICT, STRUCTURAL, TRUSTED)
+
+# Datatypes not checked with the STRUCTURAL level.
+CONTENT_DATATYPES = frozenset([ \
+    TYPE_Z, \
+    JSON, \
+    HEX_BYTE_ARRAY, \
+    DEC_ARRAY, \
+    GFA1_SEQUENCE, \
+    GFA1_CIGAR, \
+    GFA1_CIGARS, \
+    'cmt', \
+    GFA2_TRACE, \
+    GFA2_ALIGNMENT, \
+    GFA2_CIGAR, \
+    GFA2_SEQUENCE \
+    ])
+
+_validation_level = STRICT
+
+
+def get_validation_level():
+    """Return the validation level currently used."""
+    return _validation_level
+
+
+def set_validation_level(level):
+    """Set the validation level used by `is_valid` and `validate`.
+
+    :param level: One of `STRICT`, `STRUCTURAL` or `TRUSTED`.
+    :returns: The previous validation level.
+    :raises UnknownValidationLevelError: If the level is unknown.
+    """
+    global _validation_level
+    if not level in VALIDATION_LEVELS:
+        raise UnknownValidationLevelError(\
+            "Invalid validation level, given: {0}".format(level))
+    previous = _validation_level
+    _validation_level = level
+    return previous
+
+
+@contextlib.contextmanager
+def validation_level(level):
+    """Context manager that sets the validation level and restores
+    the previous one on exit.
+
+    If level is None the current validation level is kept.
+    """
+    if level is None:
+        yield get_validation_level()
+        return
+    previous = set_validation_level(level)
+    try:
+        yield level
+    finally:
+        set_validation_level(previous)
+
+
+def matches(string, datatype):
+    """Check if the string respects the datatype, regardless of the
+    validation level.
+
+    Use this function when the result of the check is used to
+    take a decision, instead of validating an input.
+
+    :raises UnknownDataTypeError: If the datatype is not presents in
+        `DATASTRING_VALIDATION_REGEXP`.
+    :raises FormatError: If string is not python string.
+    """
+    if not isinstance(string, str):
+        raise FormatError("A string must be given to validate it, " \
+                         + "given:{0}".format(string))
+    if datatype in _SEQUENCE_ALPHABET:
+        return _is_valid_sequence(string, datatype)
+    try:
+        return DATASTRING_VALIDATION_PATTERN[datatype].fullmatch(string) \
+          is not None
+    except KeyError:
+        raise UnknownDataTypeError(\
+                                    "Invalid field datatype," + \
+                                    "given: {0}".format(datatype) \
+                                  )
+
+
 def is_valid(string, datatype):
     """Check if the string respects the datatype.
 
+    The check depends on the validation level: with `STRUCTURAL`
+    the content datatypes are always valid, with `TRUSTED`
+    any string is valid.
+
     :param datatype: The type of data corresponding to the string.
     :returns: True if the string respect the type defined by the datatype.
     :raises UnknownDataTypeError: If the datatype is not presents in
@@ -154,35 +286,31 @@ def is_valid(string, datatype):
     :TODO:
         Fix exception reference in the documentation.
     """
-    if not isinstance(string, str):
-        raise FormatError("A string must be given to validate it, " \
-                         + "given:{0}".format(string))
-    if not datatype in DATASTRING_VALIDATION_REGEXP:
-        raise UnknownDataTypeError(\
-                                    "Invalid field datatype," + \
-                                    "given: {0}".format(datatype) \
-                                  )
-    regexp = DATASTRING_VALIDATION_REGEXP[datatype]
-    if not re.fullmatch(regexp, string):
-        return False
-    return True
+    if _validation_level == TRUSTED \
+      or (_validation_level == STRUCTURAL \
+          and datatype in CONTENT_DATATYPES):
+        if not isinstance(string, str):
+            raise FormatError("A string must be given to validate it, " \
+                             + "given:{0}".format(string))
+        return True
+    return matches(string, datatype)
 
 
 def is_dazzler_trace(string):
-    return is_valid(string, GFA2_TRACE)
+    return matches(string, GFA2_TRACE)
 
 def is_gfa1_cigar(string):
     """Check if the given string is a valid CIGAR string
     as defined in the GFA1 specification.
     """
-    return string != "*" and is_valid(string, GFA1_CIGAR)
+    return string != "*" and matches(string, GFA1_CIGAR)
 
 
 def is_gfa2_cigar(string):
     """Check if the given string is a valid CIGAR string
     as defined in the GFA2 specification.
     """
-    return string != "*" and is_valid(string, GFA2_CIGAR)
+    return string != "*" and matches(string, GFA2_CIGAR)
 
 
 def validate(string, datatype):
@@ -219,7 +347,7 @@ def validate(string, datatype):
         # string is either * or a trace or a cigar
         if string == "*":
             return string
-        elif is_valid(string, GFA2_CIGAR):
+        elif matches(string, GFA2_CIGAR):
             return validate(string, GFA2_CIGAR)
         return validate(string, GFA2_TRACE)
 
@@ -1,7 +1,11 @@
+import copy
 import re
 
 from pygfa.graph_element.parser import field_validator as fv
 
+_OPTFIELD_NAME = re.compile('[A-Za-z0-9]' * 2)
+_OPTFIELD_TYPE = re.compile("^[ABHJZif]$")
+
 class InvalidLineError(Exception):
     """Exception raised when making a Line object from a string.
     The number of fields gained by splittin the string
@@ -33,11 +37,22 @@ def is_optfield(field):
     match a given expression and its type is defined.
     """
     return is_field(field) and \
-      re.fullmatch('[A-Za-z0-9]' * 2, field.name) and \
+      _OPTFIELD_NAME.fullmatch(field.name) and \
       hasattr(field, '_type') and \
       field.type != None
 
 
+def copy_field(field):
+    """Return a copy of the given field that can be stored in a
+    graph element.
+
+    Fields can't be changed once created, so a field whose value is
+    immutable is shared instead of copied.
+    """
+    if isinstance(field.value, (str, int, float)):
+        return field
+    return copy.deepcopy(field)
+
 
 
 class Line:
@@ -186,6 +201,8 @@ class Field:
 
     The type of field is bound to the field name.
     """
+    __slots__ = ('_name', '_value')
+
     def __init__(self, name, value):
         self._name = name
         self._value = value
@@ -220,11 +237,13 @@ class OptField(Field):
     TAG match [A-Za-z0-9][A-Za-z0-9]
     TYPE match [AiZfJHB]
     """
+    __slots__ = ('_type',)
+
     def __init__(self, name, value, field_type):
-        if not re.fullmatch('[A-Za-z0-9]' * 2, name):
+        if not _OPTFIELD_NAME.fullmatch(name):
             raise ValueError("Invalid optfield name, given '{0}'".format(name))
 
-        if not re.fullmatch("^[ABHJZif]$", field_type):
+        if not _OPTFIELD_TYPE.fullmatch(field_type):
             raise ValueError("Invalid type for an optional field.")
 
         self._name = name
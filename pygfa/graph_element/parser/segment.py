@@ -12,8 +12,7 @@ def is_segmentv1(line_repr):
     try:
         if isinstance(line_repr, str):
             fields = re.split("\t", line_repr)
-            if re.fullmatch(fv.DATASTRING_VALIDATION_REGEXP[fv.GFA1_SEQUENCE], \
-                            fields[2]) \
+            if fv.matches(fields[2], fv.GFA1_SEQUENCE) \
            and fields[0] == 'S':
                 return True
         else:
@@ -33,8 +32,7 @@ def is_segmentv2(line_repr):
     try:
         if isinstance(line_repr, str):
             fields = re.split("\t", line_repr)
-            if re.fullmatch(fv.DATASTRING_VALIDATION_REGEXP[fv.GFA2_POSITION], \
-                            fields[2]) \
+            if fv.matches(fields[2], fv.GFA2_POSITION) \
                and fields[0] == 'S':
                 return True
         else:
@@ -9,12 +9,18 @@ class InvalidSubgraphError(Exception): pass
 
 def is_subgraph(obj):
     try:
+        # the elements of a Subgraph are read without copying
+        # them if they are shared
         return obj.sub_id != None and \
-          obj.elements != None and \
+          (obj._elements if isinstance(obj, Subgraph) \
+           else obj.elements) != None and \
           hasattr(obj, 'opt_fields')
     except: return False
 
 class Subgraph:
+    # set when the elements are shared with a copy, also the
+    # default of the subgraphs pickled before it was introduced
+    _shared_elements = False
 
     def __init__(self, graph_id, elements, opt_fields={}):
         """Create a Subgraph object.
@@ -47,11 +53,27 @@ class Subgraph:
             raise InvalidSubgraphError(\
                     "A dictionary of elements id:orientation is required.")
         self._sub_id = graph_id
-        self._elements = copy.deepcopy(elements)
+        # ids and orientations are strings, a shallow copy is enough
+        self._elements = copy.copy(elements)
         self._opt_fields = {}
         for key, field in opt_fields.items():
             if line.is_field(field):
-                self._opt_fields[key] = copy.deepcopy(field)
+                self._opt_fields[key] = line.copy_field(field)
+
+    def __copy__(self):
+        """Return a copy of the subgraph that shares the elements
+        with it, until one of the two accesses them.
+        """
+        copied = Subgraph.__new__(Subgraph)
+        copied._sub_id = self._sub_id
+        copied._elements = self._elements
+        copied._shared_elements = self._shared_elements = True
+        copied._opt_fields = {key: line.copy_field(field) \
+                              for key, field in self._opt_fields.items()}
+        return copied
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()
 
     def is_path(self):
         for element, orn in self.elements.items():
@@ -65,6 +87,11 @@ class Subgraph:
 
     @property
     def elements(self):
+        # the elements can be changed through the returned
+        # dictionary, so a shared one is copied first
+        if self._shared_elements:
+            self._elements = copy.copy(self._elements)
+            self._shared_elements = False
         return self._elements
 
     @property
@@ -74,7 +101,8 @@ class Subgraph:
     @classmethod
     def from_line(cls, line_):
         try:
-            fields = copy.deepcopy(line_.fields)
+            # the fields are copied by the Subgraph
+            fields = dict(line_.fields)
             if line_.type == 'P':
                 fields.pop('path_name')
                 fields.pop('seqs_names')
@@ -4,6 +4,8 @@ Python scripts that, if they are compatible, eliminate and compact nodes and edg
 
 import logging
 
+from pygfa.storage import sequence_store
+
 GRAPH_LOGGER = logging.getLogger(__name__)
 
 def tuple_to_string(node):
@@ -18,9 +20,7 @@ def reverse_and_complement(string):
     :return the reverese&complement of the string: If is specify
     :return the same string: If is not specify (*)
     """
-    reverse_dict = dict([('A', 'T'), ('T', 'A'), ('C', 'G'), ('G', 'C'), ('*', '*')])
-    complement_string = ''.join([reverse_dict[c] for c in string])
-    return complement_string[::-1]
+    return sequence_store.reverse_complement(string)
 
 def reverse_strand(strand):
     """Given a strand
@@ -37,9 +37,9 @@ def update_graph(gfa_, keep_id, remove_id, new_seq, overlap, orn):
     to remove are updated with the node to keep and the node with
     remove_id is removed.
     """
-    gfa_.node()[keep_id]['sequence'] = new_seq
+    gfa_.node()[keep_id]['sequence'] = gfa_._store_sequence(new_seq)
     if not new_seq == '*':
-        gfa_.node()[keep_id]['slen'] = len(gfa_.node(keep_id)['sequence'])
+        gfa_.node()[keep_id]['slen'] = len(new_seq)
     else:
         if gfa_.node()[keep_id]['slen'] and gfa_.node()[remove_id]['slen']:
             gfa_.node()[keep_id]['slen'] += gfa_.node()[remove_id]['slen'] - overlap
@@ -153,7 +153,8 @@ def compact_sequence(gfa_, from_node, to_node):
         if from_seq == '*' or to_seq == '*':
             new_seq = '*'
         else:
-            new_seq = from_seq+reverse_and_complement(to_seq)[overlap:]
+            # only the part of to_seq outside the overlap is decoded
+            new_seq = from_seq+reverse_and_complement(to_seq[:len(to_seq)-overlap])
         return new_seq, overlap, '+-'
 
 def update_dictionaries_by_nodes(nodes, count_dictionaries, orn):
@@ -8,6 +8,8 @@ import logging
 
 from Bio import SeqIO
 
+from pygfa.storage import sequence_store
+
 GRAPH_LOGGER = logging.getLogger(__name__)
 
 def reverse_and_complement(string):
@@ -15,9 +17,7 @@ def reverse_and_complement(string):
     :return the reverese&complement of the string: If is specify
     :return the same string: If is not specify (*)
     """
-    reverse_dict = dict([('A', 'T'), ('T', 'A'), ('C', 'G'), ('G', 'C'), ('*', '*')])
-    complement_string = ''.join([reverse_dict[c] for c in string])
-    return complement_string[::-1]
+    return sequence_store.reverse_complement(string)
 
 def fasta_reader(path, fasta_file):
     """Given the path and external fasta file
@@ -70,6 +70,11 @@ def consistency(node, sequence, orientation, overlap):
         from_sequence = reverse_and_complement(from_sequence)
     if to_orn == '-':
         to_sequence = reverse_and_complement(to_sequence)
+    # the nodes of the graph may hold only a handle to their sequence
+    if isinstance(from_sequence, sequence_store.SequenceHandle):
+        from_sequence = str(from_sequence)
+    if isinstance(to_sequence, sequence_store.SequenceHandle):
+        to_sequence = str(to_sequence)
     size_overlap = real_overlap(from_sequence, to_sequence)
     if not size_overlap == overlap:
         GRAPH_LOGGER.debug('Edge between node %s and %s have \
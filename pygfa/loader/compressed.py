@@ -0,0 +1,421 @@
+"""
+Reading of compressed GFA files.
+
+gzip files (BGZF included) are detected by their magic number and
+read transparently; zstd files are read too when a zstd module is
+available (`compression.zstd` from the standard library or the
+`zstandard` package).
+
+The decompression runs in a background thread that fills a bounded
+queue of decompressed chunks, while the caller parses the lines;
+zlib releases the GIL while inflating, so the two overlap.
+
+BGZF files are made of independent gzip blocks of at most 64 KiB,
+so they can be read starting from any block. A position in a BGZF
+file is given by its virtual offset: the offset of its block in the
+compressed file shifted left by 16 bits, plus the offset of the
+position inside the uncompressed block. BGZFReader can seek to and
+tell virtual offsets, and the index of the blocks maps uncompressed
+offsets to virtual offsets.
+"""
+import bisect
+import gzip
+import queue
+import struct
+import threading
+import zlib
+
+try:
+    from compression import zstd as _zstd # Python >= 3.14
+except ImportError: # pragma: no cover
+    try:
+        import zstandard as _zstd
+    except ImportError:
+        _zstd = None
+
+PLAIN = 'plain'
+GZIP = 'gzip'
+BGZF = 'bgzf'
+ZSTD = 'zstd'
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_GZIP_HEADER = struct.Struct("<4BI2BH") # up to XLEN
+_SUBFIELD = struct.Struct("<2sH")
+_BLOCK_FOOTER = struct.Struct("<2I") # CRC32, ISIZE
+_FEXTRA = 4
+
+# Amount of decompressed bytes read by the background thread at once.
+DEFAULT_READ_SIZE = 1024 * 1024
+# Chunks decompressed in advance by the background thread.
+DEFAULT_QUEUE_SIZE = 4
+
+
+class CompressionError(Exception):
+    pass
+
+
+def _bgzf_block_size(header, extra):
+    """Return the size of the BGZF block with the given header and
+    extra field, or None if it's not a BGZF block.
+    """
+    if header[3] & _FEXTRA == 0:
+        return None
+    position = 0
+    while position + _SUBFIELD.size <= len(extra):
+        identifier, length = _SUBFIELD.unpack_from(extra, position)
+        position += _SUBFIELD.size
+        if identifier == b"BC" and length == 2:
+            return struct.unpack_from("<H", extra, position)[0] + 1
+        position += length
+    return None
+
+
+def detect_compression(filepath):
+    """Return the compression of the given file: `plain`, `gzip`,
+    `bgzf` or `zstd`.
+    """
+    with open(filepath, 'rb') as file_handler:
+        header = file_handler.read(_GZIP_HEADER.size)
+        if header.startswith(ZSTD_MAGIC):
+            return ZSTD
+        if not header.startswith(GZIP_MAGIC):
+            return PLAIN
+        if len(header) == _GZIP_HEADER.size:
+            extra = file_handler.read(_GZIP_HEADER.unpack(header)[-1])
+            if _bgzf_block_size(header, extra) is not None:
+                return BGZF
+        return GZIP
+
+
+def _read_block_header(file_handler):
+    """Read the header of the BGZF block at the current position.
+
+    :returns None: At the end of the file.
+    :returns: The size of the block and the size of its header.
+    :raises CompressionError: If there isn't a BGZF block.
+    """
+    header = file_handler.read(_GZIP_HEADER.size)
+    if not header:
+        return None
+    if len(header) < _GZIP_HEADER.size or not header.startswith(GZIP_MAGIC):
+        raise CompressionError("Invalid BGZF block header.")
+    xlen = _GZIP_HEADER.unpack(header)[-1]
+    block_size = _bgzf_block_size(header, file_handler.read(xlen))
+    if block_size is None:
+        raise CompressionError("Invalid BGZF block header.")
+    return block_size, _GZIP_HEADER.size + xlen
+
+
+def block_index(filepath):
+    """Build the index of the blocks of a BGZF file, reading only
+    their headers and footers.
+
+    :returns: A list with an `(uncompressed_offset, compressed_offset)`
+        tuple for each block with some data, plus a last one with the
+        size of the uncompressed and of the compressed file.
+    """
+    index = []
+    offset = uncompressed = 0
+    with open(filepath, 'rb') as file_handler:
+        while True:
+            file_handler.seek(offset)
+            block = _read_block_header(file_handler)
+            if block is None:
+                break
+            file_handler.seek(offset + block[0] - _BLOCK_FOOTER.size)
+            _, size = _BLOCK_FOOTER.unpack(\
+                        file_handler.read(_BLOCK_FOOTER.size))
+            if size:
+                index.append((uncompressed, offset))
+            offset += block[0]
+            uncompressed += size
+    index.append((uncompressed, offset))
+    return index
+
+
+def virtual_offset(index, uncompressed_offset):
+    """Convert an offset of the uncompressed data to the virtual
+    offset of the same position, given the index of the blocks.
+    """
+    position = bisect.bisect_right(index, (uncompressed_offset, \
+                                           float('inf'))) - 1
+    block_start, block_offset = index[max(0, position)]
+    return (block_offset << 16) | (uncompressed_offset - block_start)
+
+
+class BGZFReader:
+    """Binary reader of BGZF files that can seek to virtual offsets.
+
+    :param filepath: The path of a BGZF file.
+    """
+
+    def __init__(self, filepath):
+        self._file = open(filepath, 'rb')
+        self._block_offset = 0
+        self._next_block_offset = 0
+        self._data = b""
+        self._within = 0
+        self._load_block(0)
+
+    def _load_block(self, offset):
+        """Read and decompress the block at the given offset of the
+        compressed file.
+
+        :returns False: If there are no more blocks.
+        """
+        self._file.seek(offset)
+        block = _read_block_header(self._file)
+        self._block_offset = offset
+        self._within = 0
+        if block is None:
+            self._data = b""
+            self._next_block_offset = offset
+            return False
+        block_size, header_size = block
+        compressed = self._file.read(block_size - header_size)
+        self._data = zlib.decompress(\
+            compressed[:-_BLOCK_FOOTER.size], -zlib.MAX_WBITS)
+        self._next_block_offset = offset + block_size
+        return True
+
+    def _next_block(self):
+        """Move to the next block with some data.
+
+        :returns False: At the end of the file.
+        """
+        while self._load_block(self._next_block_offset):
+            if self._data:
+                return True
+        return False
+
+    def seek(self, virtual_offset_):
+        """Move to the given virtual offset."""
+        block_offset = virtual_offset_ >> 16
+        if block_offset != self._block_offset or not self._data:
+            self._load_block(block_offset)
+        within = virtual_offset_ & 0xFFFF
+        if within > len(self._data):
+            raise CompressionError("Invalid virtual offset.")
+        self._within = within
+
+    def tell(self):
+        """Return the virtual offset of the current position.
+
+        The end of a block is the same position of the beginning
+        of the next one, and its offset is the latter.
+        """
+        if self._within == len(self._data) \
+          and self._next_block_offset != self._block_offset:
+            return self._next_block_offset << 16
+        return (self._block_offset << 16) | self._within
+
+    def readline(self):
+        """Read a line, including its trailing newline."""
+        parts = []
+        while True:
+            end = self._data.find(b"\n", self._within)
+            if end >= 0:
+                parts.append(self._data[self._within:end + 1])
+                self._within = end + 1
+                break
+            parts.append(self._data[self._within:])
+            self._within = len(self._data)
+            if not self._next_block():
+                break
+        return b"".join(parts)
+
+    def read(self, size=-1):
+        """Read up to size bytes, all the remaining ones if size is
+        negative.
+        """
+        parts = []
+        while size != 0:
+            if self._within == len(self._data) and not self._next_block():
+                break
+            end = len(self._data) if size < 0 \
+                  else min(len(self._data), self._within + size)
+            parts.append(self._data[self._within:end])
+            if size > 0:
+                size -= end - self._within
+            self._within = end
+        return b"".join(parts)
+
+    def read_to(self, end=None):
+        """Read from the current position to the given virtual offset
+        (excluded), or to the end of the file if end is None.
+        """
+        parts = []
+        while True:
+            if end is not None and self._block_offset >= end >> 16:
+                if self._block_offset == end >> 16:
+                    stop = end & 0xFFFF
+                    parts.append(self._data[self._within:stop])
+                    self._within = stop
+                break
+            parts.append(self._data[self._within:])
+            self._within = len(self._data)
+            if not self._next_block():
+                break
+        return b"".join(parts)
+
+    def __iter__(self):
+        line_ = self.readline()
+        while line_:
+            yield line_
+            line_ = self.readline()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_binary(filepath, compression=None):
+    """Open the given file as a binary stream of its uncompressed
+    content.
+
+    :param compression: The compression of the file, if None it's
+        detected.
+    :raises CompressionError: If the compression is not supported.
+    """
+    if compression is None:
+        compression = detect_compression(filepath)
+    if compression == PLAIN:
+        return open(filepath, 'rb')
+    if compression in (GZIP, BGZF):
+        return gzip.open(filepath, 'rb')
+    if compression == ZSTD:
+        if _zstd is None:
+            raise CompressionError("Reading zstd files requires Python " \
+                                   + ">= 3.14 or the zstandard package.")
+        return _zstd.open(filepath, 'rb')
+    raise CompressionError("Unknown compression: {0}".format(compression))
+
+
+class ThreadedLineReader:
+    """Iterate over the lines of a binary stream, read (and so
+    decompressed) in a background thread.
+
+    Lines are given as strings without their trailing newline.
+
+    :param file_: A binary file object, closed with the reader.
+    :param read_size: The amount of bytes read by the thread at once.
+    :param queue_size: The number of chunks read in advance.
+    """
+
+    def __init__(self, file_, read_size=DEFAULT_READ_SIZE, \
+                 queue_size=DEFAULT_QUEUE_SIZE):
+        self._file = file_
+        self._read_size = read_size
+        self._chunks = queue.Queue(queue_size)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+
+    def _read(self):
+        try:
+            while not self._stop.is_set():
+                chunk = self._file.read(self._read_size)
+                self._put(chunk)
+                if not chunk:
+                    break
+        except Exception as exception:
+            self._put(exception)
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def chunks(self):
+        """Iterate over the chunks of bytes read by the thread."""
+        while True:
+            chunk = self._chunks.get()
+            if isinstance(chunk, Exception):
+                raise chunk
+            if not chunk:
+                return
+            yield chunk
+
+    def __iter__(self):
+        remainder = b""
+        for chunk in self.chunks():
+            chunk = remainder + chunk
+            end = chunk.rfind(b"\n")
+            if end < 0:
+                remainder = chunk
+                continue
+            remainder = chunk[end + 1:]
+            yield from chunk[:end].decode().split("\n")
+        if remainder:
+            yield remainder.decode()
+
+    def close(self):
+        """Stop the background thread and close the stream."""
+        self._stop.set()
+        self._thread.join()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_lines(filepath, compression=None, read_size=DEFAULT_READ_SIZE):
+    """Return a ThreadedLineReader over the uncompressed lines of the
+    given file.
+    """
+    return ThreadedLineReader(open_binary(filepath, compression), read_size)
+
+
+def bgzf_chunk_offsets(filepath, chunk_size, min_chunks=1):
+    """Split a BGZF file in ranges of virtual offsets, each one
+    starting at the beginning of a line.
+
+    :param chunk_size: The approximate size of the uncompressed data
+        of each chunk in bytes.
+    :param min_chunks: The minimum number of chunks to create, if the
+        file has enough lines.
+    :returns: A list of `(start, end)` tuples, the end of the last
+        one is None.
+    """
+    index = block_index(filepath)
+    size = index[-1][0]
+    if size == 0:
+        return []
+    chunks = max(min_chunks, -(-size // chunk_size))
+    step = max(1, size // chunks)
+    offsets = [0]
+    with BGZFReader(filepath) as reader:
+        position = 0
+        for chunk in range(1, chunks):
+            position = max(chunk * step, position + 1)
+            if position >= size:
+                break
+            # move to the beginning of the line that contains
+            # position - 1, then skip it
+            reader.seek(virtual_offset(index, position - 1))
+            reader.readline()
+            offset = reader.tell()
+            if not reader.read(1):
+                break
+            reader.seek(offset)
+            if offset <= offsets[-1]:
+                continue
+            offsets.append(offset)
+    return list(zip(offsets, offsets[1:] + [None]))
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
@@ -0,0 +1,173 @@
+"""
+Multiprocess loader for GFA files.
+
+The file is split in chunks at newline-aligned byte offsets, each
+chunk is parsed by a worker of a process pool into a list of records
+and the records are added to the graph by the parent process.
+
+Chunks are merged in file order, so the virtual ids given to the
+edges are the same a sequential load would give.
+
+BGZF files are split at virtual offsets, so each worker decompresses
+its own blocks. Other compressed files can't be split: they are
+decompressed by the parent process and their lines are sent to the
+workers in batches.
+"""
+import collections
+import math
+import multiprocessing
+import os
+
+from pygfa.graph_element.parser import field_validator as fv
+from pygfa.loader import stream, records, record_parser, compressed
+
+# Default amount of bytes parsed by a worker in a single task.
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def chunk_offsets(filepath, chunk_size=DEFAULT_CHUNK_SIZE, min_chunks=1):
+    """Split the file in byte ranges, each one starting at the
+    beginning of a line.
+
+    :param chunk_size: The approximate size of each chunk in bytes.
+    :param min_chunks: The minimum number of chunks to create, if the
+        file has enough lines.
+    :returns: A list of `(start, end)` tuples.
+    """
+    size = os.path.getsize(filepath)
+    if size == 0:
+        return []
+    chunks = max(min_chunks, int(math.ceil(size / chunk_size)))
+    step = max(1, size // chunks)
+    offsets = [0]
+    with open(filepath, 'rb') as file_handler:
+        for index in range(1, chunks):
+            position = max(index * step, offsets[-1] + 1)
+            if position >= size:
+                break
+            # move to the beginning of the line that contains
+            # position - 1, then skip it
+            file_handler.seek(position - 1)
+            file_handler.readline()
+            position = file_handler.tell()
+            if position >= size:
+                break
+            offsets.append(position)
+    offsets.append(size)
+    return list(zip(offsets[:-1], offsets[1:]))
+
+
+def parse_lines_records(lines, mode=stream.LINES):
+    """Parse the given lines into a list of records."""
+    if mode in (stream.RECORDS, stream.LAZY):
+        return record_parser.parse_records(lines, mode == stream.LAZY)
+    chunk_records = []
+    for line_ in lines:
+        element = stream.parse_line(line_)
+        if element is not None:
+            chunk_records.append(records.element_record(element))
+    return chunk_records
+
+
+def _parse_chunk(task):
+    """Worker function: read a byte range of the file and parse it."""
+    filepath, start, end, mode, validation = task
+    with open(filepath, 'rb') as file_handler:
+        file_handler.seek(start)
+        data = file_handler.read(end - start)
+    # workers may not share the module state of the parent,
+    # so the validation level is always given explicitly
+    with fv.validation_level(validation):
+        return parse_lines_records(data.decode().split("\n"), mode)
+
+
+def _parse_bgzf_chunk(task):
+    """Worker function: read a range of virtual offsets of a BGZF
+    file and parse it.
+    """
+    filepath, start, end, mode, validation = task
+    with compressed.BGZFReader(filepath) as reader:
+        reader.seek(start)
+        data = reader.read_to(end)
+    with fv.validation_level(validation):
+        return parse_lines_records(data.decode().split("\n"), mode)
+
+
+def _parse_lines(task):
+    """Worker function: parse a batch of lines."""
+    lines, mode, validation = task
+    with fv.validation_level(validation):
+        return parse_lines_records(lines, mode)
+
+
+def line_batches(lines, batch_size):
+    """Group the given lines in lists of about batch_size bytes."""
+    batch = []
+    size = 0
+    for line_ in lines:
+        batch.append(line_)
+        size += len(line_) + 1
+        if size >= batch_size:
+            yield batch
+            batch = []
+            size = 0
+    if batch:
+        yield batch
+
+
+def _load_batches(gfa_, pool, tasks, workers):
+    """Send the batches of lines to the pool and add their records
+    to the graph in order, keeping only a few batches in flight.
+    """
+    pending = collections.deque()
+    for task in tasks:
+        pending.append(pool.apply_async(_parse_lines, (task,)))
+        if len(pending) > 2 * workers:
+            records.load_records(gfa_, pending.popleft().get())
+    while pending:
+        records.load_records(gfa_, pending.popleft().get())
+
+
+def load_file(gfa_, filepath, workers, \
+              chunk_size=DEFAULT_CHUNK_SIZE, \
+              mode=stream.LINES, \
+              validation=None):
+    """Load the given file into the GFA graph using a pool of
+    processes.
+
+    :param workers: Number of processes used to parse the file.
+    :param chunk_size: The approximate size in bytes of the
+        file region parsed by a worker in one task.
+    :param mode: The parse mode used by the workers,
+        `lines`, `records` or `lazy`.
+    :param validation: The validation level used by the workers,
+        if None the current one is used.
+    """
+    stream.check_mode(mode)
+    if validation is None:
+        validation = fv.get_validation_level()
+    compression = compressed.detect_compression(filepath)
+    if compression not in (compressed.PLAIN, compressed.BGZF):
+        with multiprocessing.Pool(workers) as pool, \
+          compressed.open_lines(filepath, compression) as lines:
+            tasks = ((batch, mode, validation) for batch in \
+                     line_batches(lines, chunk_size))
+            _load_batches(gfa_, pool, tasks, workers)
+        return
+
+    if compression == compressed.BGZF:
+        parse_chunk = _parse_bgzf_chunk
+        offsets = compressed.bgzf_chunk_offsets(filepath, chunk_size, \
+                                                min_chunks=workers)
+    else:
+        parse_chunk = _parse_chunk
+        offsets = chunk_offsets(filepath, chunk_size, min_chunks=workers)
+    tasks = [(filepath, start, end, mode, validation) \
+             for start, end in offsets]
+    with multiprocessing.Pool(workers) as pool:
+        for chunk_records in pool.imap(parse_chunk, tasks):
+            records.load_records(gfa_, chunk_records)
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
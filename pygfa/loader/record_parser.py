@@ -0,0 +1,338 @@
+"""
+Fast parser from GFA lines to records.
+
+The lines are split into their tab separated fields and the
+attribute dictionaries stored by the GFA graph are built directly,
+without constructing the intermediate Line and Field objects and
+without copying them. Only optional fields are still turned into
+OptField objects, since they are stored as such in the graph.
+
+Required fields are converted to the type the parser classes give
+them and are checked according to the validation level of
+field_validator, like the parser classes do.
+
+With `lazy`, the optional fields of segments and edges are kept
+as raw strings and decoded on first access (see LazyOptFields).
+"""
+import collections
+
+from pygfa.graph_element.parser import line, field_validator as fv
+from pygfa.graph_element import edge as ge, subgraph as sg
+from pygfa.graph_element.lazy_opt_fields import LazyOptFields, decode_opt_field
+from pygfa.graph_element.lazy_opt_fields import check_opt_field
+from pygfa.loader.records import NODE, EDGE, SUBGRAPH
+
+# Minimum number of fields for each kind of line, record type included.
+MIN_FIELDS = { \
+    'S' : 3, \
+    'L' : 6, \
+    'C' : 7, \
+    'E' : 9, \
+    'G' : 6, \
+    'F' : 8, \
+    'P' : 4, \
+    'O' : 3, \
+    'U' : 3 \
+    }
+
+
+# Datatypes of the required fields of each line, starting from the
+# field after the record type.
+SEGMENTV1_DATATYPES = (fv.GFA1_NAME, fv.GFA1_SEQUENCE)
+SEGMENTV2_DATATYPES = (fv.GFA2_ID, fv.GFA2_INT, fv.GFA2_SEQUENCE)
+LINK_DATATYPES = (fv.GFA1_NAME, fv.GFA1_ORIENTATION, \
+                  fv.GFA1_NAME, fv.GFA1_ORIENTATION, \
+                  fv.GFA1_CIGAR)
+CONTAINMENT_DATATYPES = (fv.GFA1_NAME, fv.GFA1_ORIENTATION, \
+                         fv.GFA1_NAME, fv.GFA1_ORIENTATION, \
+                         fv.GFA1_INT, fv.GFA1_CIGAR)
+EDGE_DATATYPES = (fv.GFA2_OPTIONAL_ID, \
+                  fv.GFA2_REFERENCE, fv.GFA2_REFERENCE, \
+                  fv.GFA2_POSITION, fv.GFA2_POSITION, \
+                  fv.GFA2_POSITION, fv.GFA2_POSITION, \
+                  fv.GFA2_ALIGNMENT)
+GAP_DATATYPES = (fv.GFA2_OPTIONAL_ID, \
+                 fv.GFA2_REFERENCE, fv.GFA2_REFERENCE, \
+                 fv.GFA2_INT, fv.GFA2_OPTIONAL_INT)
+FRAGMENT_DATATYPES = (fv.GFA2_ID, fv.GFA2_REFERENCE, \
+                      fv.GFA2_POSITION, fv.GFA2_POSITION, \
+                      fv.GFA2_POSITION, fv.GFA2_POSITION, \
+                      fv.GFA2_ALIGNMENT)
+# the segment names of a path are checked one by one
+PATH_DATATYPES = (fv.GFA1_NAME, None, fv.GFA1_CIGARS)
+OGROUP_DATATYPES = (fv.GFA2_OPTIONAL_ID, fv.GFA2_REFERENCES)
+UGROUP_DATATYPES = (fv.GFA2_OPTIONAL_ID, fv.GFA2_IDS)
+
+
+def _check_fields(fields, datatypes):
+    """Check the required fields against their datatypes.
+
+    :raises InvalidFieldError: If a field is not valid.
+    """
+    if fv.get_validation_level() == fv.TRUSTED:
+        return
+    for index, datatype in enumerate(datatypes, 1):
+        if datatype is not None \
+          and not fv.is_valid(fields[index], datatype):
+            raise fv.InvalidFieldError(\
+                "The string cannot be validated within " \
+                + "its datatype,\n" \
+                + "given string : " \
+                + "{0}\ndatatype: {1}.".format(fields[index], datatype))
+
+
+def _opt_fields(fields):
+    """Build the dictionary of OptFields from the given strings.
+
+    :raises ValueError: If a tag is repeated, as `Line.add_field`
+        does.
+    """
+    opt_fields = {}
+    for field in fields:
+        opt_field = decode_opt_field(field)
+        if opt_field.name in opt_fields:
+            raise ValueError(\
+                "This field is already been added, field name: '{0}'.".format(\
+                    opt_field.name))
+        opt_fields[opt_field.name] = opt_field
+    return opt_fields
+
+
+def _tags(fields, lazy, special=None):
+    """Return the optional fields of the line and the OptField of
+    the special tag (such as the Link ID), removed from them.
+
+    With lazy the optional fields are returned as the raw tab
+    separated string, and only the special tag is decoded. With the
+    STRICT validation level they are still checked, repeated tags
+    included, so that lazy parsing rejects the same lines as eager
+    parsing.
+
+    :raises ValueError: If a tag is repeated.
+    """
+    special_field = None
+    if not lazy:
+        opt_fields = _opt_fields(fields)
+        if special is not None and special in opt_fields:
+            special_field = opt_fields.pop(special)
+        return opt_fields, special_field
+
+    if fv.get_validation_level() == fv.STRICT:
+        names = set()
+        for field in fields:
+            check_opt_field(field)
+            if field[:2] in names:
+                raise ValueError(\
+                    "This field is already been added, field name: '{0}'.".format(\
+                        field[:2]))
+            names.add(field[:2])
+    if special is not None:
+        prefix = special + ":"
+        special_fields = [field for field in fields \
+                          if field.startswith(prefix)]
+        if special_fields:
+            # repeated only below STRICT, the last one is kept
+            # as LazyOptFields does for the other tags
+            special_field = decode_opt_field(special_fields[-1])
+            fields = [field for field in fields \
+                      if not field.startswith(prefix)]
+    return str.join("\t", fields), special_field
+
+
+def _add_tags(attributes, tags):
+    if isinstance(tags, str):
+        return LazyOptFields(attributes, tags)
+    attributes.update(tags)
+    return attributes
+
+
+def _edge_attributes(eid, \
+                     from_node, from_orn, \
+                     to_node, to_orn, \
+                     from_positions, to_positions, \
+                     alignment, \
+                     opt_fields, \
+                     distance=None, \
+                     variance=None, \
+                     is_dovetail=False):
+    from_segment_end = to_segment_end = None
+    if is_dovetail:
+        from_segment_end, to_segment_end = \
+          ge.segments_end(from_orn, to_orn, from_positions, to_positions)
+    attributes = {'eid': eid, \
+                  'from_node': from_node, \
+                  'from_orn': from_orn, \
+                  'to_node': to_node, \
+                  'to_orn': to_orn, \
+                  'from_positions': from_positions, \
+                  'to_positions': to_positions, \
+                  'alignment': alignment, \
+                  'distance': distance, \
+                  'variance': variance, \
+                  'is_dovetail': is_dovetail, \
+                  'from_segment_end': from_segment_end, \
+                  'to_segment_end': to_segment_end}
+    return (EDGE, from_node, to_node, _add_tags(attributes, opt_fields))
+
+
+def _segment_record(fields, lazy=False):
+    if fv.matches(fields[2], fv.GFA1_SEQUENCE):
+        # the sequence has already been checked
+        _check_fields(fields, SEGMENTV1_DATATYPES[:1])
+        opt_fields, length_field = _tags(fields[3:], lazy, 'LN')
+        sequence = fields[2]
+        length = len(sequence) if sequence != "*" else None
+        if length_field is not None:
+            length = length_field.value
+    else:
+        if len(fields) < 4:
+            raise line.InvalidLineError("The minimum number of field for "
+                                        + "SegmentV2 line is not reached.")
+        _check_fields(fields, SEGMENTV2_DATATYPES)
+        opt_fields, _ = _tags(fields[4:], lazy)
+        sequence = fields[3]
+        length = int(fields[2])
+    attributes = {'nid': fields[1], \
+                  'sequence': sequence, \
+                  'slen': length}
+    return (NODE, fields[1], _add_tags(attributes, opt_fields))
+
+
+def _link_record(fields, lazy=False):
+    _check_fields(fields, LINK_DATATYPES)
+    opt_fields, id_field = _tags(fields[6:], lazy, 'ID')
+    eid = id_field.value if id_field is not None else '*'
+    return _edge_attributes(eid, \
+                            fields[1], fields[2], \
+                            fields[3], fields[4], \
+                            (None, None), (None, None), \
+                            fields[5], \
+                            opt_fields, \
+                            is_dovetail=True)
+
+
+def _containment_record(fields, lazy=False):
+    _check_fields(fields, CONTAINMENT_DATATYPES)
+    opt_fields, id_field = _tags(fields[7:], lazy, 'ID')
+    eid = id_field.value if id_field is not None else '*'
+    record = _edge_attributes(eid, \
+                              fields[1], fields[2], \
+                              fields[3], fields[4], \
+                              (None, None), (None, None), \
+                              fields[6], \
+                              opt_fields)
+    record[3]['pos'] = line.Field('pos', int(fields[5]))
+    return record
+
+
+def _edge_record(fields, lazy=False):
+    _check_fields(fields, EDGE_DATATYPES)
+    beg1, end1, beg2, end2 = fields[4:8]
+    is_dovetail = (beg1 == "0" and end2[-1:] == "$") \
+                  or (beg2 == "0" and end1[-1:] == "$")
+    return _edge_attributes(fields[1], \
+                            fields[2][0:-1], fields[2][-1:], \
+                            fields[3][0:-1], fields[3][-1:], \
+                            (beg1, end1), (beg2, end2), \
+                            fields[8], \
+                            _tags(fields[9:], lazy)[0], \
+                            is_dovetail=is_dovetail)
+
+
+def _gap_record(fields, lazy=False):
+    _check_fields(fields, GAP_DATATYPES)
+    variance = fields[5] if fields[5] == "*" else int(fields[5])
+    return _edge_attributes(fields[1], \
+                            fields[2][0:-1], fields[2][-1:], \
+                            fields[3][0:-1], fields[3][-1:], \
+                            (None, None), (None, None), \
+                            None, \
+                            _tags(fields[6:], lazy)[0], \
+                            distance=int(fields[4]), \
+                            variance=variance)
+
+
+def _fragment_record(fields, lazy=False):
+    _check_fields(fields, FRAGMENT_DATATYPES)
+    return _edge_attributes(None, \
+                            fields[1], None, \
+                            fields[2][0:-1], fields[2][-1:], \
+                            (fields[3], fields[4]), (fields[5], fields[6]), \
+                            fields[7], \
+                            _tags(fields[8:], lazy)[0])
+
+
+def _path_record(fields, lazy=False):
+    _check_fields(fields, PATH_DATATYPES)
+    names = fields[2].split(",")
+    _check_fields([None] + names, (fv.GFA1_NAMES,) * len(names))
+    opt_fields = _opt_fields(fields[4:])
+    opt_fields['overlaps'] = line.Field('overlaps', fields[3].split(","))
+    names = collections.OrderedDict(\
+                (ref[0:-1], ref[-1:]) for ref in names)
+    return (SUBGRAPH, sg.Subgraph(fields[1], names, opt_fields))
+
+
+def _ogroup_record(fields, lazy=False):
+    _check_fields(fields, OGROUP_DATATYPES)
+    refs = collections.OrderedDict(\
+                (ref[0:-1], ref[-1:]) for ref in fields[2].split())
+    return (SUBGRAPH, sg.Subgraph(fields[1], refs, _opt_fields(fields[3:])))
+
+
+def _ugroup_record(fields, lazy=False):
+    _check_fields(fields, UGROUP_DATATYPES)
+    ids = collections.OrderedDict((id_, None) for id_ in fields[2].split())
+    return (SUBGRAPH, sg.Subgraph(fields[1], ids, _opt_fields(fields[3:])))
+
+
+RECORD_PARSERS = { \
+    'S' : _segment_record, \
+    'L' : _link_record, \
+    'C' : _containment_record, \
+    'E' : _edge_record, \
+    'G' : _gap_record, \
+    'F' : _fragment_record, \
+    'P' : _path_record, \
+    'O' : _ogroup_record, \
+    'U' : _ugroup_record \
+    }
+
+
+def parse_record(line_, lazy=False):
+    """Convert a single GFA line into its record.
+
+    :param line_: A GFA line, with or without the trailing newline.
+    :param lazy: If True, the optional fields of segments and edges
+        are decoded on first access. Subgraphs are not affected.
+    :returns None: If the line is empty or its type cannot be
+        represented as a graph element (headers, comments,
+        custom records).
+    :raises InvalidLineError: If the line hasn't enough fields.
+    """
+    line_ = line_.strip()
+    if len(line_) < 1 or not line_[0] in RECORD_PARSERS:
+        return None
+    fields = line_.split("\t")
+    line_type = fields[0]
+    if not line_type in RECORD_PARSERS:
+        return None
+    if len(fields) < MIN_FIELDS[line_type]:
+        raise line.InvalidLineError("The minimum number of field for " \
+                                    + "{0} line is not reached.".format(\
+                                        line_type))
+    return RECORD_PARSERS[line_type](fields, lazy)
+
+
+def parse_records(lines, lazy=False):
+    """Parse the given lines into a list of records."""
+    records_ = []
+    for line_ in lines:
+        record = parse_record(line_, lazy)
+        if record is not None:
+            records_.append(record)
+    return records_
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
@@ -0,0 +1,99 @@
+"""
+Compact records describing the graph elements.
+
+A record is a plain tuple that carries exactly the data a GFA graph
+stores for an element, so it can be cheaply pickled between
+processes and added to the graph without building the graph
+element objects again.
+
+* Node record: `(NODE, nid, attributes)`
+* Edge record: `(EDGE, from_node, to_node, attributes)`
+* Subgraph record: `(SUBGRAPH, subgraph)`
+
+Where `attributes` is the dictionary stored in the networkx graph,
+built here for every Node and Edge added to a GFA graph.
+"""
+from pygfa.graph_element import node, edge as ge, subgraph as sg
+
+# same values of gfa.Element
+NODE = 0
+EDGE = 1
+SUBGRAPH = 2
+
+class InvalidRecordError(Exception):
+    pass
+
+
+def node_record(node_):
+    """Return the record of a graph_element Node."""
+    attributes = {'nid': node_.nid, \
+                  'sequence': node_.sequence, \
+                  'slen': node_.slen}
+    attributes.update(node_.opt_fields)
+    return (NODE, node_.nid, attributes)
+
+
+def edge_record(edge_):
+    """Return the record of a graph_element Edge."""
+    attributes = {'eid': edge_.eid, \
+                  'from_node': edge_.from_node, \
+                  'from_orn': edge_.from_orn, \
+                  'to_node': edge_.to_node, \
+                  'to_orn': edge_.to_orn, \
+                  'from_positions': edge_.from_positions, \
+                  'to_positions': edge_.to_positions, \
+                  'alignment': edge_.alignment, \
+                  'distance': edge_.distance, \
+                  'variance': edge_.variance, \
+                  'is_dovetail': edge_.is_dovetail, \
+                  'from_segment_end': edge_.from_segment_end, \
+                  'to_segment_end': edge_.to_segment_end}
+    attributes.update(edge_.opt_fields)
+    return (EDGE, edge_.from_node, edge_.to_node, attributes)
+
+
+def subgraph_record(subgraph_):
+    """Return the record of a graph_element Subgraph."""
+    return (SUBGRAPH, subgraph_)
+
+
+def element_record(element):
+    """Return the record of any graph element.
+
+    :raises InvalidRecordError: If the object is not a graph element.
+    """
+    if isinstance(element, node.Node):
+        return node_record(element)
+    if isinstance(element, ge.Edge):
+        return edge_record(element)
+    if isinstance(element, sg.Subgraph):
+        return subgraph_record(element)
+    raise InvalidRecordError("Cannot make a record from the given " \
+                             + "object: {0}".format(element))
+
+
+def add_record(gfa_, record):
+    """Add a record to the GFA graph.
+
+    Edges without id get their virtual id here, so adding records
+    in the same order always gives the same virtual ids.
+    """
+    if record[0] == NODE:
+        gfa_._add_node_attributes(record[1], record[2])
+    elif record[0] == EDGE:
+        key = gfa_._edge_key(record[3]['eid'])
+        gfa_._add_edge_attributes(record[1], record[2], key, record[3])
+    elif record[0] == SUBGRAPH:
+        gfa_.add_subgraph(record[1])
+    else:
+        raise InvalidRecordError("Unknown record type: {0}".format(record[0]))
+
+
+def load_records(gfa_, records):
+    """Add all the given records to the GFA graph, in order."""
+    for record in records:
+        add_record(gfa_, record)
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
@@ -0,0 +1,416 @@
+"""
+On-disk index of the segments of a GFA file, for loading only a
+region of the graph.
+
+The index is kept in a `.gfai` file next to the GFA file and records:
+
+* the names of the segments, sorted, so they can be searched without
+  loading them all;
+* the offset of the S line of each segment (-1 if the segment is only
+  referenced by edges);
+* the offset of every L, C and E line, with the two segments it
+  connects and whether it's a dovetail overlap;
+* for each segment, the edges touching it, in CSR layout.
+
+Offsets are byte offsets in plain files and virtual offsets in BGZF
+files (see compressed), other compressed files can't be indexed since
+they can't be read from an arbitrary position.
+
+The neighbourhood of a region is expanded on the arrays of the index,
+read through a memory map, then only the lines of the region are
+read from the GFA file and parsed as a normal load would do.
+"""
+import os
+
+import numpy as np
+
+from pygfa.loader import compressed, stream
+from pygfa.storage import sections as sections_
+
+MAGIC = b"PYGFAIDX"
+VERSION = 1
+EXTENSION = ".gfai"
+
+EDGE_DOVETAIL = 1
+
+
+class SegmentIndexError(Exception):
+    pass
+
+
+def index_path(filepath):
+    """Return the path of the index of the given GFA file."""
+    return filepath + EXTENSION
+
+
+def _source_info(filepath):
+    stat = os.stat(filepath)
+    return {'source_size': stat.st_size, \
+            'source_mtime_ns': stat.st_mtime_ns}
+
+
+def _lines_with_offsets(filepath, compression):
+    """Iterate over the lines of the file as (offset, bytes) pairs."""
+    if compression == compressed.PLAIN:
+        with open(filepath, 'rb') as file_handler:
+            offset = 0
+            for line_ in file_handler:
+                yield offset, line_
+                offset += len(line_)
+    elif compression == compressed.BGZF:
+        with compressed.BGZFReader(filepath) as reader:
+            offset = reader.tell()
+            line_ = reader.readline()
+            while line_:
+                yield offset, line_
+                offset = reader.tell()
+                line_ = reader.readline()
+    else:
+        check_compression(compression)
+
+
+def _edge_ends(line_type, line_):
+    """Return the segments connected by an edge line and whether it's
+    a dovetail overlap.
+    """
+    if line_type == b"E":
+        fields = line_.split(b"\t", 9)
+        beg1, end1, beg2, end2 = fields[4:8]
+        is_dovetail = (beg1 == b"0" and end2[-1:] == b"$") \
+                      or (beg2 == b"0" and end1[-1:] == b"$")
+        return fields[2][:-1], fields[3][:-1], is_dovetail
+    fields = line_.split(b"\t", 4)
+    return fields[1], fields[3], line_type == b"L"
+
+
+def _virtual_offsets(offsets, block_index):
+    """Convert offsets of the uncompressed data of a BGZF file to
+    virtual offsets, given the index of its blocks (see
+    `compressed.block_index`).
+    """
+    starts = np.array([start for start, _ in block_index], dtype=np.int64)
+    blocks = np.array([block for _, block in block_index], dtype=np.int64)
+    positions = np.maximum(np.searchsorted(starts, offsets, 'right') - 1, 0)
+    return (blocks[positions] << 16) | (offsets - starts[positions])
+
+
+class IndexBuilder:
+    """Collect the segments and the edges of a GFA file one line at
+    a time, then write its index.
+
+    Used to index an existing file and to build the index while the
+    file is written.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._segments = []
+        self._edge_ends = []
+        self._edge_offsets = []
+        self._edge_flags = []
+
+    def _segment_id(self, name):
+        id_ = self._ids.get(name)
+        if id_ is None:
+            id_ = self._ids[name] = len(self._segments)
+            self._segments.append(-1)
+        return id_
+
+    def add_line(self, offset, line_):
+        """Add the line (as bytes) at the given offset of the file.
+
+        :raises SegmentIndexError: If the line can't be indexed.
+        """
+        line_type = line_[:1]
+        try:
+            if line_type == b"S":
+                name = line_.split(b"\t", 2)[1].rstrip(b"\r\n")
+                self._segments[self._segment_id(name)] = offset
+            elif line_type == b"L" or line_type == b"C" \
+              or line_type == b"E":
+                from_node, to_node, is_dovetail = \
+                  _edge_ends(line_type, line_)
+                self._edge_ends.append((self._segment_id(from_node), \
+                                        self._segment_id(to_node)))
+                self._edge_offsets.append(offset)
+                self._edge_flags.append(EDGE_DOVETAIL if is_dovetail else 0)
+        except (IndexError, ValueError):
+            raise SegmentIndexError("Invalid line at offset " \
+                                    + "{0}: {1}".format(offset, line_))
+
+    def write(self, path, filepath, compression, block_index=None):
+        """Write the index of the file in filepath to path.
+
+        :param compression: The compression of the file.
+        :param block_index: The index of the blocks of a BGZF file, if
+            given the offsets of the lines are the ones of the
+            uncompressed data and are converted to virtual offsets.
+        :returns: The SegmentIndex.
+        """
+        names = list(self._ids)
+        order = np.array(sorted(range(len(names)), key=names.__getitem__), \
+                         dtype=np.int64)
+        rank = np.empty(len(names), dtype=np.int64)
+        rank[order] = np.arange(len(names))
+        sorted_names = [names[id_] for id_ in order.tolist()]
+        name_offsets = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum([len(name) for name in sorted_names], \
+                  out=name_offsets[1:])
+
+        segment_offsets = np.array(self._segments, dtype=np.int64)[order]
+        edge_offsets = np.array(self._edge_offsets, dtype=np.int64)
+        if block_index is not None:
+            defined = segment_offsets >= 0
+            segment_offsets[defined] = _virtual_offsets(\
+                segment_offsets[defined], block_index)
+            edge_offsets = _virtual_offsets(edge_offsets, block_index)
+
+        edge_ends = rank[np.array(self._edge_ends, dtype=np.int64)\
+                         .reshape(-1, 2)]
+        # each edge is listed under both its segments, self loops once
+        ends = np.concatenate((edge_ends[:, 0], edge_ends[:, 1]))
+        edges = np.tile(np.arange(len(edge_ends), dtype=np.int64), 2)
+        keep = np.concatenate((np.ones(len(edge_ends), dtype=bool), \
+                               edge_ends[:, 0] != edge_ends[:, 1]))
+        ends, edges = ends[keep], edges[keep]
+        incidence_order = np.argsort(ends, kind='stable')
+        incidence_pointers = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ends, minlength=len(names)), \
+                  out=incidence_pointers[1:])
+
+        sections = [ \
+            ('names', np.frombuffer(b"".join(sorted_names), dtype=np.uint8)), \
+            ('name_offsets', name_offsets), \
+            ('segment_offsets', segment_offsets), \
+            ('edge_offsets', edge_offsets), \
+            ('edge_ends', edge_ends), \
+            ('edge_flags', np.array(self._edge_flags, dtype=np.uint8)), \
+            ('incidence_pointers', incidence_pointers), \
+            ('incidences', edges[incidence_order]) \
+            ]
+        info = dict(_source_info(filepath), compression=compression)
+        sections_.write_sections(path, MAGIC, VERSION, info, sections)
+        return read_index(path)
+
+
+def check_compression(compression):
+    """Check that files with the given compression can be indexed.
+
+    :raises SegmentIndexError: If they can't.
+    """
+    if compression != compressed.PLAIN and compression != compressed.BGZF:
+        raise SegmentIndexError("Only plain and BGZF files can be " \
+                                + "indexed, given a {0} file.".format(\
+                                    compression))
+
+
+def build_index(filepath, path=None):
+    """Scan the GFA file and write its index.
+
+    :param path: The path of the index, if None it's the path
+        of the file with the `.gfai` extension added.
+    :returns: The SegmentIndex.
+    :raises SegmentIndexError: If the file can't be indexed.
+    """
+    if path is None:
+        path = index_path(filepath)
+    compression = compressed.detect_compression(filepath)
+    builder = IndexBuilder()
+    for offset, line_ in _lines_with_offsets(filepath, compression):
+        builder.add_line(offset, line_)
+    return builder.write(path, filepath, compression)
+
+
+def read_index(path):
+    """Read the index in path.
+
+    :raises SegmentIndexError: If the file is not an index or has
+        an unsupported version.
+    """
+    info, sections = sections_.read_sections(path, MAGIC, VERSION, \
+                                             SegmentIndexError)
+    return SegmentIndex(info, sections)
+
+
+class SegmentIndex:
+    """The index of the segments of a GFA file, as written by
+    `build_index`.
+
+    Segments are referred to by their position in the sorted list
+    of names.
+    """
+
+    def __init__(self, info, sections):
+        self._info = info
+        self._names = sections['names']
+        self._name_offsets = sections['name_offsets']
+        self._segment_offsets = sections['segment_offsets']
+        self._edge_offsets = sections['edge_offsets']
+        self._edge_ends = sections['edge_ends']
+        self._edge_flags = sections['edge_flags']
+        self._incidence_pointers = sections['incidence_pointers']
+        self._incidences = sections['incidences']
+
+    @property
+    def compression(self):
+        return self._info['compression']
+
+    def is_current(self, filepath):
+        """Tell if the index is up to date with the given file."""
+        source_info = _source_info(filepath)
+        return all(self._info.get(key) == value \
+                   for key, value in source_info.items())
+
+    def __len__(self):
+        return len(self._segment_offsets)
+
+    def name(self, position):
+        """Return the name of the segment at the given position."""
+        return self._names[self._name_offsets[position]:\
+                           self._name_offsets[position + 1]]\
+                   .tobytes().decode()
+
+    def find(self, name):
+        """Return the position of the segment with the given name,
+        with a binary search on the sorted names.
+
+        :returns -1: If the segment is not in the index.
+        """
+        name = name.encode()
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            other = self._names[self._name_offsets[middle]:\
+                                self._name_offsets[middle + 1]].tobytes()
+            if other < name:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self) and \
+          self._names[self._name_offsets[low]:\
+                      self._name_offsets[low + 1]].tobytes() == name:
+            return low
+        return -1
+
+    def __contains__(self, name):
+        return self.find(name) >= 0
+
+    def segment_offset(self, name):
+        """Return the offset of the S line of the segment with the
+        given name, -1 if it has no S line.
+
+        :raises KeyError: If the segment is not in the index.
+        """
+        position = self.find(name)
+        if position < 0:
+            raise KeyError(name)
+        return int(self._segment_offsets[position])
+
+    def edges(self, position):
+        """Return the indices of the edges that touch the segment
+        at the given position.
+        """
+        return self._incidences[self._incidence_pointers[position]:\
+                                self._incidence_pointers[position + 1]]
+
+    def dovetails_neighbors(self, position):
+        """Return the positions of the segments that share a dovetail
+        overlap with the segment at the given position.
+        """
+        edges = self.edges(position)
+        edges = edges[self._edge_flags[edges] & EDGE_DOVETAIL != 0]
+        ends = self._edge_ends[edges]
+        return np.where(ends[:, 0] == position, ends[:, 1], ends[:, 0])
+
+    def region(self, seeds, radius=1):
+        """Find the segments within radius dovetail overlaps from the
+        seeds and the lines describing them.
+
+        :param seeds: The names of the starting segments, the ones
+            not in the index are ignored.
+        :returns (positions, offsets): The set of the positions of
+            the segments and the sorted offsets of their S lines and
+            of the L/C/E lines between them.
+        """
+        positions = set(position for position in map(self.find, seeds) \
+                        if position >= 0)
+        frontier = list(positions)
+        for _ in range(radius):
+            next_frontier = []
+            for position in frontier:
+                for neighbor in self.dovetails_neighbors(position).tolist():
+                    if not neighbor in positions:
+                        positions.add(neighbor)
+                        next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        offsets = set()
+        for position in positions:
+            offset = int(self._segment_offsets[position])
+            if offset >= 0:
+                offsets.add(offset)
+            edges = self.edges(position)
+            for edge_, (from_node, to_node) in \
+              zip(edges.tolist(), self._edge_ends[edges].tolist()):
+                if from_node in positions and to_node in positions:
+                    offsets.add(int(self._edge_offsets[edge_]))
+        return positions, sorted(offsets)
+
+
+def get_index(filepath, path=None):
+    """Return the index of the file, building it if it doesn't
+    exist or if the file has changed since it was built.
+    """
+    if path is None:
+        path = index_path(filepath)
+    if os.path.exists(path):
+        index = read_index(path)
+        if index.is_current(filepath):
+            return index
+    return build_index(filepath, path)
+
+
+def read_lines(filepath, offsets, compression=None):
+    """Read the lines starting at the given offsets of the file, as
+    strings.
+    """
+    if compression is None:
+        compression = compressed.detect_compression(filepath)
+    if compression == compressed.BGZF:
+        with compressed.BGZFReader(filepath) as reader:
+            for offset in offsets:
+                reader.seek(offset)
+                yield reader.readline().decode()
+    else:
+        with open(filepath, 'rb') as file_handler:
+            for offset in offsets:
+                file_handler.seek(offset)
+                yield file_handler.readline().decode()
+
+
+def load_region(gfa_, filepath, seeds, radius=1, mode=stream.LINES, \
+                validation=None, path=None):
+    """Add to the graph the segments within radius dovetail overlaps
+    from the seeds, and the edges between them.
+
+    Lines are read in file order and parsed like `stream.load_lines`
+    does, so edges without id get their virtual id in the same order
+    (but not with the same value) of a full load.
+
+    :param seeds: A segment name or an iterable of segment names.
+    :param path: The path of the index, if None the `.gfai` file
+        next to the GFA file is used, built if needed.
+    :returns: The number of lines loaded.
+    """
+    if isinstance(seeds, str):
+        seeds = [seeds]
+    index = get_index(filepath, path)
+    _, offsets = index.region(seeds, radius)
+    lines = read_lines(filepath, offsets, index.compression)
+    return stream.load_lines(gfa_, lines, mode, validation)
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
@@ -0,0 +1,107 @@
+"""
+Streaming loader for GFA files.
+
+Lines are read one at a time from any iterable of strings (an open
+file handle, a StringIO, a generator...) and dispatched to the
+parser of their record type, so the whole file is never held in
+memory at once.
+"""
+from pygfa.graph_element.parser import segment, link, containment, path
+from pygfa.graph_element.parser import edge, gap, fragment, group
+from pygfa.graph_element.parser import field_validator as fv
+from pygfa.graph_element import node, edge as ge, subgraph as sg
+from pygfa.loader import records, record_parser
+
+# Parse modes: `lines` builds the Line objects and validates every
+# field, `records` builds the graph attributes directly from the
+# fields of the line (see record_parser), `lazy` is like `records`
+# but the optional fields of segments and edges are decoded only
+# when accessed.
+LINES = 'lines'
+RECORDS = 'records'
+LAZY = 'lazy'
+
+class InvalidModeError(Exception):
+    pass
+
+# Map each record type to the parser for the line and to the
+# graph element the parsed line is converted into.
+# Segments are handled apart since the version of the line must
+# be detected first.
+LINE_PARSERS = { \
+    'L' : (link.Link, ge.Edge), \
+    'C' : (containment.Containment, ge.Edge), \
+    'E' : (edge.Edge, ge.Edge), \
+    'G' : (gap.Gap, ge.Edge), \
+    'F' : (fragment.Fragment, ge.Edge), \
+    'P' : (path.Path, sg.Subgraph), \
+    'O' : (group.OGroup, sg.Subgraph), \
+    'U' : (group.UGroup, sg.Subgraph) \
+    }
+
+
+def parse_line(line_):
+    """Convert a single GFA line into its graph element.
+
+    :param line_: A GFA line, with or without the trailing newline.
+    :returns None: If the line is empty or its type cannot be
+        represented as a graph element (headers, comments,
+        custom records).
+    """
+    line_ = line_.strip()
+    if len(line_) < 1:
+        return None
+    line_type = line_[0]
+    if line_type == 'S':
+        if segment.is_segmentv1(line_):
+            return node.Node.from_line(segment.SegmentV1.from_string(line_))
+        return node.Node.from_line(segment.SegmentV2.from_string(line_))
+    if line_type in LINE_PARSERS:
+        line_parser, element_type = LINE_PARSERS[line_type]
+        return element_type.from_line(line_parser.from_string(line_))
+    return None
+
+
+def load_lines(gfa_, lines, mode=LINES, validation=None):
+    """Add to the GFA graph every element described in the given
+    lines.
+
+    :param gfa_: The GFA graph to fill.
+    :param lines: An iterable of GFA lines, such as an open file.
+    :param mode: The parse mode, `lines`, `records` or `lazy`.
+    :param validation: The validation level used while loading,
+        if None the current one is used.
+    :returns: The number of lines consumed.
+    """
+    check_mode(mode)
+    with fv.validation_level(validation):
+        return _load_lines(gfa_, lines, mode)
+
+
+def _load_lines(gfa_, lines, mode):
+    count = 0
+    if mode in (RECORDS, LAZY):
+        lazy = mode == LAZY
+        for line_ in lines:
+            count += 1
+            record = record_parser.parse_record(line_, lazy)
+            if record is not None:
+                records.add_record(gfa_, record)
+        return count
+
+    for line_ in lines:
+        count += 1
+        element = parse_line(line_)
+        if element is not None:
+            gfa_.add_graph_element(element)
+    return count
+
+
+def check_mode(mode):
+    """:raises InvalidModeError: If the parse mode is unknown."""
+    if mode not in (LINES, RECORDS, LAZY):
+        raise InvalidModeError("Unknown parse mode, given: {0}".format(mode))
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
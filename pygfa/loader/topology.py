@@ -0,0 +1,101 @@
+"""
+Topology only loader for GFA files.
+
+The sequence field of each S line is cut out of the line before it
+is parsed and replaced by a FileSequence handle with its byte offset
+and length in the file (see file_sequences), so the graph holds no
+sequence until one is accessed. Sequences are neither decoded nor
+validated while loading; the length of a GFA1 segment without an
+`LN` tag is the length of its sequence field, as usual.
+
+Only uncompressed files can be loaded this way, since the sequences
+are read back through a memory map of the file.
+"""
+from pygfa.graph_element.parser import field_validator as fv
+from pygfa.loader import stream, records, record_parser
+
+
+def sequence_span(line_):
+    """Return the byte positions of the sequence field of an S line.
+
+    :param line_: The bytes of an S line, with or without the
+        trailing newline (trailing blanks are not part of the
+        sequence, since lines are stripped when parsed).
+    :returns (start, end): The positions of the first byte of the
+        sequence and of the byte after the last one.
+    :returns None: If the line hasn't a sequence field.
+    """
+    second = line_.find(b"\t", 2)
+    if second < 0:
+        return None
+    third = line_.find(b"\t", second + 1)
+    # GFA2 segments have their length before the sequence, GFA1
+    # sequences can't be made of digits only
+    if third >= 0 and line_[second + 1:third].isdigit():
+        start = third + 1
+    else:
+        start = second + 1
+    end = line_.find(b"\t", start)
+    if end < 0:
+        end = len(line_.rstrip())
+    return start, end
+
+
+def _parse_node_record(line_, mode):
+    if mode == stream.LINES:
+        element = stream.parse_line(line_)
+        return records.element_record(element) \
+               if element is not None else None
+    return record_parser.parse_record(line_, mode == stream.LAZY)
+
+
+def load_file(gfa_, filepath, source, mode=stream.LINES, validation=None):
+    """Add to the graph the elements of the file, with FileSequence
+    handles in place of the sequences.
+
+    :param source: The FileSequenceSource of the file.
+    :param mode: The parse mode, as in `stream.load_lines`.
+    :param validation: The validation level used while loading,
+        if None the current one is used.
+    :returns: The number of lines consumed.
+    """
+    stream.check_mode(mode)
+    with fv.validation_level(validation):
+        return _load_file(gfa_, filepath, source, mode)
+
+
+def _load_file(gfa_, filepath, source, mode):
+    count = 0
+    lazy = mode == stream.LAZY
+    with open(filepath, 'rb') as file_handler:
+        offset = 0
+        for line_ in file_handler:
+            count += 1
+            span = sequence_span(line_) if line_[:1] == b"S" else None
+            if span is None or line_[span[0]:span[1]].strip() == b"*":
+                if mode == stream.LINES:
+                    element = stream.parse_line(line_.decode())
+                    if element is not None:
+                        gfa_.add_graph_element(element)
+                else:
+                    record = record_parser.parse_record(line_.decode(), lazy)
+                    if record is not None:
+                        records.add_record(gfa_, record)
+                offset += len(line_)
+                continue
+
+            start, end = span
+            record = _parse_node_record(\
+                (line_[:start] + b"*" + line_[end:]).decode(), mode)
+            attributes = record[2]
+            length = end - start
+            attributes['sequence'] = source.sequence(offset + start, length)
+            if attributes['slen'] is None:
+                attributes['slen'] = length
+            records.add_record(gfa_, record)
+            offset += len(line_)
+    return count
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
@@ -2,6 +2,7 @@ from networkx.algorithms.components.connected import node_connected_component as
 from networkx.algorithms.components.connected import connected_components as nx_connected_components
 
 import pygfa.gfa # required for GFAError (gives error otherwise)
+from pygfa import frozen_gfa
 
 def nodes_connected_component(gfa_, nid):
     """Return the connected component
@@ -11,6 +12,11 @@ def nodes_connected_component(gfa_, nid):
     """
     if nid not in gfa_:
         raise pygfa.gfa.GFAError("The source node is not in the graph.")
+    if isinstance(gfa_, frozen_gfa.FrozenGFA):
+        return gfa_.nodes_connected_component(nid)
+    # edge keys and subgraph ids are in the graph too
+    if gfa_._components is not None and nid in gfa_._graph:
+        return gfa_._components.component(nid)
     return nx_node_connected_component(\
                         gfa_._graph, nid)
 
@@ -18,4 +24,8 @@ def nodes_connected_components(gfa_):
     """Return a generator of sets with nodes of each weakly
     connected component in the graph.
     """
+    if isinstance(gfa_, frozen_gfa.FrozenGFA):
+        return gfa_.nodes_connected_components()
+    if gfa_._components is not None:
+        return gfa_._components.components()
     return nx_connected_components(gfa_._graph)
@@ -0,0 +1,226 @@
+"""
+Compressed and indexed output of GFA files.
+
+The data written is compressed in a background thread, that takes
+blocks of uncompressed data from a bounded queue; zlib releases the
+GIL while deflating, so the compression overlaps with the
+serialization of the next lines.
+
+Files can be written as gzip or as BGZF (see loader.compressed),
+made of independent blocks of at most 64 KiB that can be read from
+any position. While a plain or BGZF file is written, the index of its
+segments (see loader.segment_index) can be built at the same time,
+so the file can be loaded by region without indexing it again.
+"""
+import queue
+import struct
+import threading
+import zlib
+
+from pygfa.loader import compressed, segment_index
+
+# Uncompressed data of a BGZF block, the same of htslib, so that
+# the compressed block always fits in 64 KiB.
+BGZF_BLOCK_SIZE = 0xff00
+# Uncompressed data given to the gzip compressor at once.
+GZIP_CHUNK_SIZE = 1024 * 1024
+DEFAULT_LEVEL = 6
+# Blocks waiting to be compressed by the background thread.
+DEFAULT_QUEUE_SIZE = 16
+
+_BGZF_HEADER = struct.Struct("<4BI2BH2sHH")
+_BGZF_MAX_SIZE = 0x10000
+BGZF_EOF = bytes.fromhex("1f8b08040000000000ff060042430200" \
+                         + "1b0003000000000000000000")
+
+
+def bgzf_block(data, level=DEFAULT_LEVEL):
+    """Compress data, at most 64 KiB, as a single BGZF block."""
+    deflate = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    deflated = deflate.compress(data) + deflate.flush()
+    footer = struct.pack("<2I", zlib.crc32(data), len(data))
+    if _BGZF_HEADER.size + len(deflated) + len(footer) > _BGZF_MAX_SIZE:
+        # incompressible data, store it
+        deflate = zlib.compressobj(0, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated = deflate.compress(data) + deflate.flush()
+    block_size = _BGZF_HEADER.size + len(deflated) + len(footer)
+    header = _BGZF_HEADER.pack(31, 139, 8, 4, 0, 0, 255, \
+                               6, b"BC", 2, block_size - 1)
+    return header + deflated + footer
+
+
+class CompressedWriter:
+    """Binary writer that compresses the data in a background thread.
+
+    :param file_: An open binary file where the compressed data is
+        written, it's not closed with the writer.
+    :param compression: `gzip` or `bgzf`.
+    :param level: The compression level, from 0 to 9.
+    :raises CompressionError: If the compression is not supported.
+    """
+
+    def __init__(self, file_, compression=compressed.BGZF, \
+                 level=DEFAULT_LEVEL, queue_size=DEFAULT_QUEUE_SIZE):
+        if compression == compressed.BGZF:
+            self._chunk_size = BGZF_BLOCK_SIZE
+        elif compression == compressed.GZIP:
+            self._chunk_size = GZIP_CHUNK_SIZE
+            self._gzip = zlib.compressobj(level, zlib.DEFLATED, \
+                                          16 + zlib.MAX_WBITS)
+        else:
+            raise compressed.CompressionError(\
+                "Unsupported output compression: {0}".format(compression))
+        self._file = file_
+        self._compression = compression
+        self._level = level
+        self._buffer = bytearray()
+        self._uncompressed = 0
+        self._compressed = 0
+        self._block_index = []
+        self._error = None
+        self._blocks = queue.Queue(queue_size)
+        self._thread = threading.Thread(target=self._compress, daemon=True)
+        self._thread.start()
+
+    @property
+    def block_index(self):
+        """The index of the blocks of a closed BGZF writer, in the
+        format of `compressed.block_index`.
+        """
+        return self._block_index
+
+    def _compress(self):
+        try:
+            while True:
+                block = self._blocks.get()
+                if block is None:
+                    break
+                if self._compression == compressed.BGZF:
+                    self._block_index.append((self._uncompressed, \
+                                              self._compressed))
+                    self._write(bgzf_block(block, self._level))
+                else:
+                    self._write(self._gzip.compress(block))
+                self._uncompressed += len(block)
+            if self._compression == compressed.BGZF:
+                self._write(BGZF_EOF)
+            else:
+                self._write(self._gzip.flush())
+            self._block_index.append((self._uncompressed, self._compressed))
+        except Exception as exception:
+            self._error = exception
+
+    def _write(self, data):
+        self._file.write(data)
+        self._compressed += len(data)
+
+    def _put(self, block):
+        while True:
+            if self._error is not None:
+                raise self._error
+            try:
+                self._blocks.put(block, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def write(self, data):
+        """Write the given bytes."""
+        self._buffer += data
+        end = len(self._buffer) - len(self._buffer) % self._chunk_size
+        for start in range(0, end, self._chunk_size):
+            self._put(bytes(self._buffer[start:start + self._chunk_size]))
+        del self._buffer[:end]
+
+    def close(self):
+        """Compress the remaining data and wait for the thread."""
+        if self._thread.is_alive():
+            if self._buffer:
+                self._put(bytes(self._buffer))
+                self._buffer = bytearray()
+            self._put(None)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+
+class GFAFileWriter:
+    """Text file that writes the data given to it to a, possibly
+    compressed, GFA file, building the index of its segments if
+    required.
+
+    Both the sequential and the parallel serializers can write
+    to it.
+
+    :param path: The path of the GFA file.
+    :param compression: `plain`, `gzip` or `bgzf`, if None `plain`.
+    :param level: The compression level, from 0 to 9.
+    :param index: If True the index is written to the `.gfai` file
+        next to the GFA file, if a string it's the path of the index.
+    :raises SegmentIndexError: If the index is required for a gzip
+        file.
+    """
+
+    def __init__(self, path, compression=None, level=DEFAULT_LEVEL, \
+                 index=False):
+        if compression is None:
+            compression = compressed.PLAIN
+        self._builder = None
+        self._index_path = None
+        if index:
+            segment_index.check_compression(compression)
+            self._builder = segment_index.IndexBuilder()
+            self._index_path = index if isinstance(index, str) \
+                               else segment_index.index_path(path)
+        self._path = path
+        self._compression = compression
+        self._offset = 0
+        self._pending = b""
+        self._file = open(path, 'wb')
+        self._sink = self._file
+        if compression != compressed.PLAIN:
+            try:
+                self._sink = CompressedWriter(self._file, compression, level)
+            except:
+                self._file.close()
+                raise
+
+    def write(self, text):
+        data = text.encode()
+        if self._builder is not None:
+            lines = (self._pending + data).split(b"\n")
+            self._pending = lines.pop()
+            for line_ in lines:
+                self._builder.add_line(self._offset, line_)
+                self._offset += len(line_) + 1
+        self._sink.write(data)
+
+    def close(self):
+        """Close the file, then write its index."""
+        try:
+            if self._sink is not self._file:
+                self._sink.close()
+        finally:
+            self._file.close()
+        if self._builder is not None:
+            if self._pending:
+                self._builder.add_line(self._offset, self._pending)
+            block_index = self._sink.block_index \
+                          if self._compression == compressed.BGZF else None
+            self._builder.write(self._index_path, self._path, \
+                                self._compression, block_index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        else:
+            # don't index a partial file
+            self._builder = None
+            self.close()
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
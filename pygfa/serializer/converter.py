@@ -0,0 +1,236 @@
+"""
+Streaming conversion between GFA1 and GFA2 files, without building
+a graph.
+
+The file is read twice. The first pass only collects the length of
+each segment (needed for the positions of the GFA2 edges and to
+tell the segments referenced by the GFA1 paths), so the
+memory required depends on the number of segments, not on the
+number of edges or on the sequences. The second pass converts each
+line on its own:
+
+* links and containments become GFA2 edges, whose positions are
+  computed from the segment lengths and the CIGAR of the overlap;
+* every other line is parsed into its record (see record_parser)
+  and written by the serializer of the target version, as
+  `GFA.dump` would write it.
+
+Lines that can't be represented in the target version (such as
+fragments and gaps in GFA1, or links whose overlap or segment
+lengths are unknown) are skipped, like the serializers do.
+"""
+import logging
+import re
+from collections import OrderedDict
+
+from pygfa.graph_element import subgraph as sg
+from pygfa.graph_element.parser import field_validator as fv
+from pygfa.loader import compressed, record_parser, records
+from pygfa.serializer import utils, writer
+
+converter_logger = logging.getLogger(__name__)
+
+_CIGAR_OPERATION = re.compile("([0-9]+)([MIDNSHPX=])")
+# operations that consume the first (reference) and the
+# second (query) segment
+_REFERENCE_OPERATIONS = "MDN=X"
+_QUERY_OPERATIONS = "MIS=X"
+
+
+class ConversionError(Exception):
+    pass
+
+
+def _length(fields):
+    """Return the length of the segment in the given S line fields,
+    None if it's not known.
+    """
+    if len(fields) > 3 and fields[2].isdigit(): # GFA2
+        return int(fields[2])
+    for tag in fields[3:]:
+        if tag.startswith("LN:i:"):
+            return int(tag[5:])
+    if len(fields) > 2 and fields[2] != "*":
+        return len(fields[2])
+    return None
+
+
+def segment_lengths(lines):
+    """Return a dictionary with the length of each segment described
+    in the given lines, None if it's not known.
+    """
+    lengths = {}
+    for line_ in lines:
+        if line_[:1] == "S":
+            # stripped as the parsers do
+            fields = line_.strip().split("\t")
+            try:
+                lengths[fields[1]] = _length(fields)
+            except (IndexError, ValueError):
+                raise ConversionError("Invalid segment line: " + line_)
+    return lengths
+
+
+def cigar_lengths(cigar):
+    """Return the lengths of the alignment on the first and on
+    the second segment.
+
+    :returns None: If the CIGAR is undefined (`*`).
+    """
+    if cigar in (None, "*"):
+        return None
+    reference = query = 0
+    for length, operation in _CIGAR_OPERATION.findall(cigar):
+        if operation in _REFERENCE_OPERATIONS:
+            reference += int(length)
+        if operation in _QUERY_OPERATIONS:
+            query += int(length)
+    return reference, query
+
+
+def _position(value, length):
+    """Return a GFA2 position, marked with `$` at the segment end."""
+    return str(value) + ("$" if value == length else "")
+
+
+def _edge_positions(attributes, lengths):
+    """Return the positions on the two segments of the GFA2 edge
+    equivalent to a link or to a containment.
+
+    :raises ConversionError: If they can't be computed, or if the
+        overlap is longer than a segment.
+    """
+    from_length = lengths.get(attributes['from_node'])
+    to_length = lengths.get(attributes['to_node'])
+    if from_length is None or to_length is None:
+        raise ConversionError("Unknown segment length.")
+    overlap = cigar_lengths(attributes['alignment'])
+
+    if 'pos' in attributes: # containment
+        start = attributes['pos'].value
+        end = start + (overlap[0] if overlap is not None else to_length)
+        if start < 0 or end > from_length:
+            raise ConversionError("Containment out of the container.")
+        return (_position(start, from_length), _position(end, from_length), \
+                _position(0, to_length), _position(to_length, to_length))
+
+    if overlap is None:
+        raise ConversionError("Unknown link overlap.")
+    from_overlap, to_overlap = overlap
+    if from_overlap > from_length or to_overlap > to_length:
+        raise ConversionError("Overlap longer than its segment.")
+    if attributes['from_orn'] == "+":
+        from_positions = (from_length - from_overlap, from_length)
+    else:
+        from_positions = (0, from_overlap)
+    if attributes['to_orn'] == "+":
+        to_positions = (0, to_overlap)
+    else:
+        to_positions = (to_length - to_overlap, to_length)
+    return (_position(from_positions[0], from_length), \
+            _position(from_positions[1], from_length), \
+            _position(to_positions[0], to_length), \
+            _position(to_positions[1], to_length))
+
+
+def edge_line(attributes, lengths):
+    """Convert the attributes of a link or of a containment to a GFA2
+    edge line.
+
+    :raises ConversionError: If the positions of the edge can't be
+        computed.
+    """
+    fields = ["E", \
+              str(attributes['eid']), \
+              attributes['from_node'] + attributes['from_orn'], \
+              attributes['to_node'] + attributes['to_orn']]
+    fields.extend(_edge_positions(attributes, lengths))
+    fields.append(attributes['alignment'])
+    fields.extend(utils._serialize_trusted_opt_fields(attributes))
+    return str.join("\t", fields)
+
+
+def _header_line(line_):
+    """Return the header line without its version tag, None if
+    nothing else is left.
+    """
+    tags = [tag for tag in line_.rstrip("\r\n").split("\t")[1:] \
+            if not tag.startswith("VN:")]
+    return str.join("\t", ["H"] + tags) if tags else None
+
+
+def iter_converted_lines(lines, gfa_version, lengths=None):
+    """Convert the given lines to the given GFA version.
+
+    :param lengths: The segment lengths, as given by
+        `segment_lengths`, required to convert links and containments
+        to GFA2. When converting to GFA1, paths only keep the
+        references to these segments.
+    :raises ValueError: If the version is not 1 or 2.
+    """
+    serializer = writer.get_serializer(gfa_version)
+    yield serializer.HEADER
+    for line_ in lines:
+        if line_[:1] == "H":
+            header_line = _header_line(line_)
+            if header_line is not None:
+                yield header_line
+            continue
+        record = record_parser.parse_record(line_, lazy=True)
+        if record is None:
+            continue
+        if record[0] == records.NODE:
+            converted = serializer.serialize_node(record[2], record[1])
+        elif record[0] == records.EDGE:
+            attributes = record[3]
+            # links and containments have no positions
+            if gfa_version == 2 and attributes['from_positions'] == \
+              (None, None) and (attributes['is_dovetail'] or \
+                                'pos' in attributes):
+                try:
+                    converted = edge_line(attributes, lengths or {})
+                except ConversionError as error:
+                    converter_logger.debug(repr(error) + ": " + line_)
+                    converted = ""
+            else:
+                converted = serializer.serialize_edge(attributes, \
+                                                      attributes['eid'])
+        else:
+            subgraph_ = record[1]
+            if gfa_version == 1 and lengths is not None:
+                elements = OrderedDict(\
+                    (id_, orientation) \
+                    for id_, orientation in subgraph_.elements.items() \
+                    if id_ in lengths)
+                subgraph_ = sg.Subgraph(subgraph_.sub_id, elements, \
+                                        subgraph_.opt_fields)
+            converted = serializer.serialize_subgraph(subgraph_, \
+                                                      subgraph_.sub_id)
+        if len(converted) > 0:
+            yield converted
+
+
+def convert(filepath, out, gfa_version, validation=None, \
+            buffer_size=writer.DEFAULT_BUFFER_SIZE):
+    """Convert a GFA file to the given version, reading it twice.
+
+    :param filepath: The path of the GFA file, possibly compressed.
+    :param out: The path of the output file or an open text file.
+    :param validation: The validation level used to read and write
+        the lines, if None the current one is used.
+    :returns: The number of lines written.
+    """
+    writer.get_serializer(gfa_version)
+    with compressed.open_lines(filepath) as lines:
+        lengths = segment_lengths(lines)
+    with compressed.open_lines(filepath) as lines, \
+      fv.validation_level(validation):
+        converted = iter_converted_lines(lines, gfa_version, lengths)
+        if hasattr(out, 'write'):
+            return writer.write_lines(converted, out, buffer_size)
+        with open(out, 'w') as out_file:
+            return writer.write_lines(converted, out_file, buffer_size)
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
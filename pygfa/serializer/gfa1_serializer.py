@@ -17,6 +17,7 @@ class GFA1SerializationError(Exception): pass
 serializer_logger = logging.getLogger(__name__)
 
 DEFAULT_IDENTIFIER = "no identifier given."
+HEADER = "H\tVN:Z:1.0"
 
 SEGMENT_FIELDS = [fv.GFA1_NAME, fv.GFA1_SEQUENCE]
 LINK_FIELDS = [\
@@ -50,6 +51,8 @@ def serialize_node(node_, identifier=DEFAULT_IDENTIFIER):
     :return "": If the object cannot be serialized to GFA.
     """
     identifier = utils._check_identifier(identifier)
+    if isinstance(node_, dict) and fv.get_validation_level() == fv.TRUSTED:
+        return _serialize_trusted_node(node_, identifier)
     try:
         if isinstance(node_, dict):
 
@@ -88,6 +91,24 @@ def serialize_node(node_, identifier=DEFAULT_IDENTIFIER):
         serializer_logger.debug(utils._format_exception(identifier, e))
         return ""
 
+def _serialize_trusted_node(node_, identifier):
+    """Serialize a node dictionary without copying it and without
+    validating its fields, as done with the trusted validation level.
+    """
+    try:
+        nid, sequence, slen = node_['nid'], node_['sequence'], node_['slen']
+        if nid is None or sequence is None:
+            raise GFA1SerializationError("Required node elements " \
+                                        + "missing or invalid.")
+        fields = ["S", str(nid), str(sequence)]
+        if slen != None:
+            fields.append("LN:i:" + str(slen))
+        fields.extend(utils._serialize_trusted_opt_fields(node_))
+        return str.join("\t", fields)
+    except (KeyError, AttributeError, GFA1SerializationError) as e:
+        serializer_logger.debug(utils._format_exception(identifier, e))
+        return ""
+
 ################################################################################
 # EDGE SERIALIZER
 ################################################################################
@@ -136,6 +157,9 @@ def serialize_edge(edge_, identifier=DEFAULT_IDENTIFIER):
 
 def _serialize_to_containment(containment_, identifier=DEFAULT_IDENTIFIER):
     identifier = utils._check_identifier(identifier)
+    if isinstance(containment_, dict) \
+      and fv.get_validation_level() == fv.TRUSTED:
+        return _serialize_trusted_edge(containment_, identifier, True)
     try:
         if isinstance(containment_, dict):
             containment_dict = copy.deepcopy(containment_)
@@ -204,6 +228,8 @@ def _serialize_to_containment(containment_, identifier=DEFAULT_IDENTIFIER):
 
 def _serialize_to_link(link_, identifier=DEFAULT_IDENTIFIER):
     identifier = utils._check_identifier(identifier)
+    if isinstance(link_, dict) and fv.get_validation_level() == fv.TRUSTED:
+        return _serialize_trusted_edge(link_, identifier, False)
     try:
         if isinstance(link_, dict):
             link_dict = copy.deepcopy(link_)
@@ -262,6 +288,34 @@ def _serialize_to_link(link_, identifier=DEFAULT_IDENTIFIER):
         return ""
 
 
+def _serialize_trusted_edge(edge_, identifier, is_containment):
+    """Serialize a link or a containment dictionary without copying
+    it and without validating its fields, as done with the trusted
+    validation level.
+    """
+    try:
+        fields = ["C" if is_containment else "L", \
+                  edge_['from_node'], \
+                  edge_['from_orn'], \
+                  edge_['to_node'], \
+                  edge_['to_orn']]
+        alignment = edge_['alignment']
+        if is_containment:
+            fields.append(edge_['pos'].value)
+        if alignment is None \
+          or not utils._are_fields_defined(fields):
+            raise GFA1SerializationError()
+        fields = [str(field) for field in fields]
+        fields.append(str(alignment) if fv.is_gfa1_cigar(alignment) else "*")
+        if not edge_['eid'] in(None, '*'):
+            fields.append("ID:Z:" + str(edge_['eid']))
+        fields.extend(utils._serialize_trusted_opt_fields(edge_))
+        return str.join("\t", fields)
+    except(KeyError, AttributeError, GFA1SerializationError) as e:
+        serializer_logger.debug(utils._format_exception(identifier, e))
+        return ""
+
+
 ################################################################################
 # SUBGRAPH SERIALIZER
 ################################################################################
@@ -326,19 +380,27 @@ def serialize_subgraph(subgraph_, identifier=DEFAULT_IDENTIFIER, gfa_=None):
                                 subgraph_.sub_id, \
                                 subgraph_.elements \
                              ]
-            opt_fields = copy.deepcopy(subgraph_.opt_fields)
-
             fields = ["P"]
             fields.append(subgraph_.sub_id)
             fields.append(_serialize_subgraph_elements(subgraph_.elements, gfa_))
             if 'overlaps' in subgraph_.opt_fields:
-                opt_fields.pop('overlaps')
                 fields.append(str.join(",", subgraph_.opt_fields['overlaps'].value))
             else:
                 fields.append("*")
-            fields.extend(utils._serialize_opt_fields(opt_fields))
+            if fv.get_validation_level() == fv.TRUSTED:
+                # the overlaps are not an OptField, so they
+                # are skipped without copying the fields
+                fields.extend(utils._serialize_trusted_opt_fields(\
+                                subgraph_.opt_fields))
+            else:
+                opt_fields = copy.deepcopy(subgraph_.opt_fields)
+                opt_fields.pop('overlaps', None)
+                fields.extend(utils._serialize_opt_fields(opt_fields))
 
+        # a path without any segment of the graph is never valid,
+        # whatever the validation level
         if not utils._are_fields_defined(defined_fields) or \
+           len(fields[2]) == 0 or \
            not utils._check_fields(fields[1:], PATH_FIELDS):
             raise GFA1SerializationError("Required fields missing or" \
                                         + " not valid.")
@@ -352,40 +414,80 @@ def serialize_subgraph(subgraph_, identifier=DEFAULT_IDENTIFIER, gfa_=None):
 ################################################################################
 # SERIALIZE GRAPH
 ################################################################################
-def serialize_graph(graph, write_header=True):
-    """Serialize a networkx.MulitGraph object.
+def iter_nodes_lines(graph, node_ids):
+    """Serialize the given nodes of a networkx.MultiGraph, skipping
+    the ones that can't be serialized.
+    """
+    for node_id in node_ids:
+        node_serialize = serialize_node(graph.node[node_id], node_id)
+        if len(node_serialize) > 0:
+            yield node_serialize
+
+
+def iter_edges_lines(graph, edges):
+    """Serialize the given edges of a networkx.MultiGraph, as
+    (from_node, to_node, key) tuples, skipping the ones that can't
+    be serialized.
+    """
+    for from_node, to_node, key in edges:
+        edge_serialize = serialize_edge(graph.edge[from_node][to_node][key], key)
+        if len(edge_serialize) > 0:
+            yield edge_serialize
+
+
+def iter_subgraphs_lines(gfa_, sub_ids):
+    """Serialize the given subgraphs of a GFA object, skipping the
+    ones that can't be serialized.
+    """
+    subgraphs = gfa_.subgraphs()
+    for sub_id in sub_ids:
+        subgraph_serialize = serialize_subgraph(subgraphs[sub_id], sub_id, gfa_)
+        if len(subgraph_serialize) > 0:
+            yield subgraph_serialize
+
+
+def iter_graph_lines(graph, write_header=True):
+    """Serialize a networkx.MultiGraph object one line at a time.
+
+    Lines are yielded without the trailing newline, elements that
+    can't be serialized are skipped.
 
     :param graph: A networkx.MultiGraph instance.
-    :write_header: If set to True put a GFA1 header as first line.
+    :param write_header: If set to True put a GFA1 header as first
+        line.
     """
     if not isinstance(graph, nx.MultiGraph):
         raise ValueError("The object to serialize must be an instance " \
                         + "of a networkx.MultiGraph.")
 
     if write_header:
-        string_serialize = "H\tVN:Z:1.0\n"
+        yield HEADER
+    yield from iter_nodes_lines(graph, graph.nodes_iter())
+    yield from iter_edges_lines(graph, graph.edges_iter(keys=True))
 
-    for node_id, node in graph.nodes_iter(data=True):
-        node_serialize = serialize_node(node, node_id)
-        if len(node_serialize) > 0:
-            string_serialize += node_serialize + "\n"
 
-    for from_node, to_node, key in graph.edges_iter(keys=True):
-        edge_serialize = serialize_edge(graph.edge[from_node][to_node][key], key)
-        if len(edge_serialize) > 0:
-            string_serialize += edge_serialize + "\n"
-    return string_serialize
+def serialize_graph(graph, write_header=True):
+    """Serialize a networkx.MultiGraph object.
+
+    :param graph: A networkx.MultiGraph instance.
+    :param write_header: If set to True put a GFA1 header as first
+        line.
+    """
+    return utils._join_lines(iter_graph_lines(graph, write_header))
+
+
+def iter_gfa_lines(gfa_):
+    """Serialize a GFA object one line at a time, as in
+    `iter_graph_lines`.
+    """
+    yield from iter_graph_lines(gfa_._graph, write_header=True)
+    yield from iter_subgraphs_lines(gfa_, gfa_.subgraphs())
 
 
 def serialize_gfa(gfa_):
     """Serialize a GFA object into a GFA1 file.
     """
-    gfa_serialize = serialize_graph(gfa_._graph, write_header=True)
-    for sub_id, subgraph_ in gfa_.subgraphs().items():
-        subgraph_serialize = serialize_subgraph(subgraph_, sub_id, gfa_)
-        if len(subgraph_serialize) > 0:
-            gfa_serialize += subgraph_serialize + "\n"
-    return gfa_serialize
+    return utils._join_lines(iter_gfa_lines(gfa_))
 
 
 if __name__ == '__main__': # pragma: no cover
@@ -18,6 +18,7 @@ class GFA2SerializationError(Exception): pass
 serializer_logger = logging.getLogger(__name__)
 
 DEFAULT_IDENTIFIER = "no identifier given."
+HEADER = "H\tVN:Z:2.0"
 
 SEGMENT_FIELDS = [\
     fv.GFA2_ID, \
@@ -68,6 +69,8 @@ def serialize_node(node_, identifier=DEFAULT_IDENTIFIER):
     :returns "": If the object cannot be serialized to GFA.
     """
     identifier = utils._check_identifier(identifier)
+    if isinstance(node_, dict) and fv.get_validation_level() == fv.TRUSTED:
+        return _serialize_trusted_node(node_, identifier)
     try:
         if isinstance(node_, dict):
             node_dict = copy.deepcopy(node_)
@@ -115,6 +118,23 @@ def serialize_node(node_, identifier=DEFAULT_IDENTIFIER):
         serializer_logger.debug(utils._format_exception(identifier, e))
         return ""
 
+def _serialize_trusted_node(node_, identifier):
+    """Serialize a node dictionary without copying it and without
+    validating its fields, as done with the trusted validation level.
+    """
+    try:
+        nid, sequence, slen = node_['nid'], node_['sequence'], node_['slen']
+        if nid is None or sequence is None:
+            raise GFA2SerializationError("Required node elements " \
+                                        + "missing or invalid.")
+        fields = ["S", str(nid), str(slen if slen is not None else 0), \
+                  str(sequence)]
+        fields.extend(utils._serialize_trusted_opt_fields(node_))
+        return str.join("\t", fields)
+    except(AttributeError, KeyError, GFA2SerializationError) as e:
+        serializer_logger.debug(utils._format_exception(identifier, e))
+        return ""
+
 ################################################################################
 # EDGE SERIALIZER
 ################################################################################
@@ -124,6 +144,8 @@ def serialize_edge(edge_, identifier=DEFAULT_IDENTIFIER):
     identifier = utils._check_identifier(identifier)
     try:
         if isinstance(edge_, dict):
+            if fv.get_validation_level() == fv.TRUSTED:
+                return _serialize_trusted_edge(edge_, identifier)
             if edge_['eid'] is None: # edge_ is a fragment
                 return _serialize_to_fragment(edge_, identifier)
             if edge_['distance'] != None or \
@@ -317,6 +339,58 @@ def _serialize_to_edge(edge_, identifier=DEFAULT_IDENTIFIER):
         serializer_logger.debug(utils._format_exception(identifier, e))
         return ""
 
+def _serialize_trusted_edge(edge_, identifier):
+    """Serialize an edge, fragment or gap dictionary without copying
+    it and without validating its fields, as done with the trusted
+    validation level.
+    """
+    try:
+        if edge_['eid'] is None: # fragment
+            fields = ["F", \
+                      edge_['from_node'], \
+                      edge_['to_node'], \
+                      edge_['to_orn'], \
+                      edge_['from_positions'][0], \
+                      edge_['from_positions'][1], \
+                      edge_['to_positions'][0], \
+                      edge_['to_positions'][1], \
+                      edge_['alignment']]
+            if not utils._are_fields_defined(fields):
+                raise GFA2SerializationError("Required Fragment " \
+                                            + "elements missing or invalid.")
+            fields = [str(field) for field in fields]
+            fields[2:4] = [fields[2] + fields[3]]
+        elif edge_['distance'] != None or edge_['variance'] != None: # gap
+            # gaps are not checked, as in _serialize_to_gap
+            fields = ["G", \
+                      str(edge_['eid']), \
+                      str(edge_['from_node']) + str(edge_['from_orn']), \
+                      str(edge_['to_node']) + str(edge_['to_orn']), \
+                      str(edge_['distance']), \
+                      str(edge_['variance'])]
+        else:
+            fields = ["E", \
+                      edge_['eid'], \
+                      edge_['from_node'], \
+                      edge_['from_orn'], \
+                      edge_['to_node'], \
+                      edge_['to_orn'], \
+                      edge_['from_positions'][0], \
+                      edge_['from_positions'][1], \
+                      edge_['to_positions'][0], \
+                      edge_['to_positions'][1], \
+                      edge_['alignment']]
+            if not utils._are_fields_defined(fields):
+                raise GFA2SerializationError("Required Edge elements " \
+                                            + "missing or invalid.")
+            fields = [str(field) for field in fields]
+            fields[2:6] = [fields[2] + fields[3], fields[4] + fields[5]]
+        fields.extend(utils._serialize_trusted_opt_fields(edge_))
+        return str.join("\t", fields)
+    except(KeyError, AttributeError, TypeError, GFA2SerializationError) as e:
+        serializer_logger.debug(utils._format_exception(identifier, e))
+        return ""
+
 ################################################################################
 # SUBGRAPH SERIALIZER
 ################################################################################
@@ -376,7 +450,6 @@ def serialize_subgraph(subgraph_, identifier=DEFAULT_IDENTIFIER, gfa_=None):
                 subgraph_dict.pop('overlaps')
             fields.extend(utils._serialize_opt_fields(subgraph_dict))
         else:
-            opt_fields = copy.deepcopy(subgraph_.opt_fields)
             defined_fields = [\
                                 subgraph_.sub_id, \
                                 subgraph_.elements \
@@ -385,9 +458,11 @@ def serialize_subgraph(subgraph_, identifier=DEFAULT_IDENTIFIER, gfa_=None):
                      ["U"]
             fields.append(str(subgraph_.sub_id))
             fields.append(_serialize_subgraph_elements(subgraph_.elements, gfa_))
-            if 'overlaps' in subgraph_.opt_fields:
-                opt_fields.pop('overlaps')
-            fields.extend(utils._serialize_opt_fields(subgraph_.opt_fields))
+            if fv.get_validation_level() == fv.TRUSTED:
+                fields.extend(utils._serialize_trusted_opt_fields(\
+                                subgraph_.opt_fields))
+            else:
+                fields.extend(utils._serialize_opt_fields(subgraph_.opt_fields))
 
         group_fields = OGROUP_FIELDS if fields[0] == "O" else \
                        UGROUP_FIELDS
@@ -404,46 +479,80 @@ def serialize_subgraph(subgraph_, identifier=DEFAULT_IDENTIFIER, gfa_=None):
 ################################################################################
 # SERIALIZE GRAPH
 ################################################################################
-def serialize_graph(graph, write_header=True):
-    """Serialize a networkx.MultiGraph or a derivative object.
+def iter_nodes_lines(graph, node_ids):
+    """Serialize the given nodes of a networkx.MultiGraph, skipping
+    the ones that can't be serialized.
+    """
+    for node_id in node_ids:
+        node_serialize = serialize_node(graph.node[node_id], node_id)
+        if len(node_serialize) > 0:
+            yield node_serialize
+
+
+def iter_edges_lines(graph, edges):
+    """Serialize the given edges of a networkx.MultiGraph, as
+    (from_node, to_node, key) tuples, skipping the ones that can't
+    be serialized.
+    """
+    for from_node, to_node, key in edges:
+        edge_serialize = serialize_edge(graph.edge[from_node][to_node][key], key)
+        if len(edge_serialize) > 0:
+            yield edge_serialize
+
+
+def iter_subgraphs_lines(gfa_, sub_ids):
+    """Serialize the given subgraphs of a GFA object, skipping the
+    ones that can't be serialized.
+    """
+    subgraphs = gfa_.subgraphs()
+    for sub_id in sub_ids:
+        subgraph_serialize = serialize_subgraph(subgraphs[sub_id], sub_id)
+        if len(subgraph_serialize) > 0:
+            yield subgraph_serialize
+
+
+def iter_graph_lines(graph, write_header=True):
+    """Serialize a networkx.MultiGraph object one line at a time.
+
+    Lines are yielded without the trailing newline, elements that
+    can't be serialized are skipped.
 
     :param graph: A networkx.MultiGraph instance.
     :param write_header: If set to True put a GFA2 header as first
         line.
     """
     if not isinstance(graph, nx.MultiGraph):
-        raise ValueError("The object to serialize must be an instance" \
-                        +" of a networkx.MultiGraph.")
+        raise ValueError("The object to serialize must be an instance " \
+                        + "of a networkx.MultiGraph.")
 
     if write_header:
-        string_serialize = "H\tVN:Z:2.0\n"
+        yield HEADER
+    yield from iter_nodes_lines(graph, graph.nodes_iter())
+    yield from iter_edges_lines(graph, graph.edges_iter(keys=True))
 
-    for node_id, node_ in graph.nodes_iter(data=True):
-        node_serialize = serialize_node(node_, node_id)
-        if len(node_serialize) > 0:
-            string_serialize += node_serialize + "\n"
 
-    for from_node, to_node, key in graph.edges_iter(keys=True):
-        edge_serialize = serialize_edge(graph.edge[from_node][to_node][key], key)
-        if len(edge_serialize) > 0:
-            string_serialize += edge_serialize + "\n"
+def serialize_graph(graph, write_header=True):
+    """Serialize a networkx.MultiGraph object.
 
-    return string_serialize
+    :param graph: A networkx.MultiGraph instance.
+    :param write_header: If set to True put a GFA2 header as first
+        line.
+    """
+    return utils._join_lines(iter_graph_lines(graph, write_header))
+
+
+def iter_gfa_lines(gfa_):
+    """Serialize a GFA object one line at a time, as in
+    `iter_graph_lines`.
+    """
+    yield from iter_graph_lines(gfa_._graph, write_header=True)
+    yield from iter_subgraphs_lines(gfa_, gfa_.subgraphs())
 
 
 def serialize_gfa(gfa_):
     """Serialize a GFA object into a GFA2 file.
-
-    TODO:
-        maybe process  the header fields here
     """
-    gfa_serialize = serialize_graph(gfa_._graph, write_header=True)
-
-    for sub_id, subgraph_ in gfa_.subgraphs().items():
-        subgraph_serialize = serialize_subgraph(subgraph_, sub_id)
-        if len(subgraph_serialize) > 0:
-            gfa_serialize += subgraph_serialize + "\n"
-    return gfa_serialize
+    return utils._join_lines(iter_gfa_lines(gfa_))
 
 
 if __name__ == '__main__': # pragma: no cover
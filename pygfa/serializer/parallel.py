@@ -0,0 +1,97 @@
+"""
+Multiprocess serialization of GFA graphs.
+
+Nodes, edges and subgraphs are split in chunks of consecutive
+elements, each chunk is serialized by a worker of a process pool and
+the chunks are written in order, so the output is the same of a
+sequential dump.
+
+The graph and the order of its elements are given to the workers
+when the pool starts: where processes are forked they are inherited
+without copying, otherwise they are pickled once for each worker.
+Tasks only carry the range of elements to serialize.
+"""
+import io
+import multiprocessing
+
+from pygfa.graph_element.parser import field_validator as fv
+from pygfa.serializer import writer
+
+# Default number of elements serialized by a worker in a single task.
+DEFAULT_CHUNK_SIZE = 20000
+
+NODES = 0
+EDGES = 1
+SUBGRAPHS = 2
+
+# state of the worker processes
+_worker = {}
+
+
+def _init_worker(gfa_, elements, gfa_version, validation):
+    _worker['gfa'] = gfa_
+    _worker['elements'] = elements
+    _worker['serializer'] = writer.get_serializer(gfa_version)
+    fv.set_validation_level(validation)
+
+
+def _serialize_chunk(task):
+    """Worker function: serialize a range of elements of a kind."""
+    kind, start, end = task
+    gfa_ = _worker['gfa']
+    serializer = _worker['serializer']
+    elements = _worker['elements'][kind][start:end]
+    if kind == NODES:
+        lines = serializer.iter_nodes_lines(gfa_._graph, elements)
+    elif kind == EDGES:
+        lines = serializer.iter_edges_lines(gfa_._graph, elements)
+    else:
+        lines = serializer.iter_subgraphs_lines(gfa_, elements)
+    chunk = io.StringIO()
+    writer.write_lines(lines, chunk)
+    return chunk.getvalue()
+
+
+def dump(gfa_, out, workers, gfa_version=1, validation=None, \
+         chunk_size=DEFAULT_CHUNK_SIZE):
+    """Serialize the graph with the given number of processes.
+
+    :param out: The path of the file or an open text file where the
+        lines are written, if None the GFA string is returned.
+    :param chunk_size: The number of elements serialized by a
+        worker in a single task.
+    :raises ValueError: If the version is not 1 or 2.
+    """
+    serializer = writer.get_serializer(gfa_version)
+    if validation is None:
+        validation = fv.get_validation_level()
+    # same order of the sequential serializers
+    elements = (gfa_._graph.nodes(), \
+                gfa_._graph.edges(keys=True), \
+                list(gfa_.subgraphs()))
+    tasks = [(kind, start, start + chunk_size) \
+             for kind in (NODES, EDGES, SUBGRAPHS) \
+             for start in range(0, len(elements[kind]), chunk_size)]
+
+    if out is None:
+        out_file = io.StringIO()
+    elif hasattr(out, 'write'):
+        out_file = out
+    else:
+        out_file = open(out, 'w')
+    try:
+        out_file.write(serializer.HEADER + "\n")
+        with multiprocessing.Pool(workers, initializer=_init_worker, \
+                                  initargs=(gfa_, elements, gfa_version, \
+                                            validation)) as pool:
+            for chunk in pool.imap(_serialize_chunk, tasks):
+                out_file.write(chunk)
+        if out is None:
+            return out_file.getvalue()
+    finally:
+        if out_file is not out:
+            out_file.close()
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
@@ -1,4 +1,5 @@
 from pygfa.graph_element.parser import line, field_validator as fv
+from pygfa.graph_element.lazy_opt_fields import LazyOptFields
 
 SERIALIZATION_ERROR_MESSAGGE = "Couldn't serialize object identified by: "
 
@@ -20,11 +21,43 @@ def _remove_common_edge_fields(edge_dict):
 
 def _serialize_opt_fields(opt_fields):
     fields = []
-    for key, opt_field in opt_fields.items():
+    items = opt_fields.items()
+    if isinstance(opt_fields, LazyOptFields):
+        # the fields not decoded yet are written as they have been read
+        items = opt_fields.decoded_items()
+    for key, opt_field in items:
         if line.is_optfield(opt_field):
             fields.append(str(opt_field))
+    if isinstance(opt_fields, LazyOptFields) and opt_fields.raw_tags:
+        fields.append(opt_fields.raw_tags)
     return fields
 
+def _serialize_trusted_opt_fields(attributes):
+    """Serialize the optional fields among the given attributes,
+    without copying them and checking only their type: the optional
+    fields built by pygfa are always valid.
+
+    Gives the same result of `_serialize_opt_fields`, the required
+    fields of the elements are never OptField objects.
+    """
+    lazy = isinstance(attributes, LazyOptFields)
+    items = attributes.decoded_items() if lazy else attributes.items()
+    fields = [str(opt_field) for key, opt_field in items \
+              if isinstance(opt_field, line.OptField)]
+    if lazy and attributes.raw_tags:
+        fields.append(attributes.raw_tags)
+    return fields
+
+def _join_lines(lines):
+    """Join the given lines into a string, each one followed
+    by a newline.
+    """
+    lines = list(lines)
+    if not lines:
+        return ""
+    lines.append("")
+    return str.join("\n", lines)
+
 def _are_fields_defined(fields):
     try:
         for field in fields:
@@ -0,0 +1,89 @@
+"""
+Streaming output of GFA graphs.
+
+The serializers produce the graph one line at a time, so a graph can
+be written to a file, or sent to any consumer, without building the
+whole GFA string in memory. Lines are written in chunks of about
+`buffer_size` characters.
+"""
+from pygfa.graph_element.parser import field_validator as fv
+from pygfa.serializer import gfa1_serializer as gs1, gfa2_serializer as gs2
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+def get_serializer(gfa_version):
+    """Return the serializer module of the given GFA version.
+
+    :raises ValueError: If the version is not 1 or 2.
+    """
+    if gfa_version == 1:
+        return gs1
+    if gfa_version == 2:
+        return gs2
+    raise ValueError("Invalid GFA output version.")
+
+
+def iter_lines(gfa_, gfa_version=1, validation=None):
+    """Return an iterator over the lines of the serialized graph,
+    without their trailing newline.
+
+    :param validation: The validation level used by the serializer
+        (see field_validator), if None the current one is used. The
+        level is set only while each line is produced, so the code
+        that consumes the lines is not affected.
+    :raises ValueError: If the version is not 1 or 2.
+    """
+    return _iter_lines(get_serializer(gfa_version).iter_gfa_lines(gfa_), \
+                       validation)
+
+
+def _iter_lines(lines, validation):
+    while True:
+        with fv.validation_level(validation):
+            line_ = next(lines, None)
+        if line_ is None:
+            return
+        yield line_
+
+
+def write_lines(lines, file_, buffer_size=DEFAULT_BUFFER_SIZE):
+    """Write the lines to an open text file, each one followed by a
+    newline, in chunks of about buffer_size characters.
+
+    :returns: The number of lines written.
+    """
+    count = 0
+    chunk = []
+    size = 0
+    for line_ in lines:
+        chunk.append(line_)
+        size += len(line_) + 1
+        count += 1
+        if size >= buffer_size:
+            chunk.append("")
+            file_.write(str.join("\n", chunk))
+            chunk = []
+            size = 0
+    if chunk:
+        chunk.append("")
+        file_.write(str.join("\n", chunk))
+    return count
+
+
+def dump(gfa_, out, gfa_version=1, validation=None, \
+         buffer_size=DEFAULT_BUFFER_SIZE):
+    """Write the graph to out, a path or an open text file (that is
+    left open).
+
+    :returns: The number of lines written.
+    """
+    lines = iter_lines(gfa_, gfa_version, validation)
+    if hasattr(out, 'write'):
+        return write_lines(lines, out, buffer_size)
+    with open(out, 'w') as out_file:
+        return write_lines(lines, out_file, buffer_size)
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
@@ -0,0 +1,121 @@
+"""
+Sequences read on demand from the GFA file they were loaded from.
+
+When a graph is loaded with only its topology, each segment keeps a
+FileSequence handle with the byte offset and the length of its
+sequence field in the source file; the characters are read from a
+memory map of the file when they are accessed.
+
+Whole sequences that are read are kept in an optional LRU cache,
+bounded by their total number of characters, slices are read
+directly from the memory map.
+
+The source file must not be modified while its handles are used.
+"""
+import collections
+import mmap
+
+from pygfa.storage.sequence_store import SequenceHandle
+
+
+class FileSequence(SequenceHandle):
+    """A sequence stored in the source file of the graph.
+
+    :param source: The FileSequenceSource of the file.
+    :param offset: The byte offset of the sequence in the file.
+    :param length: The number of characters of the sequence.
+    """
+    __slots__ = ('_source', '_offset', '_length')
+
+    def __init__(self, source, offset, length):
+        self._source = source
+        self._offset = offset
+        self._length = length
+
+    @property
+    def offset(self):
+        return self._offset
+
+    def __len__(self):
+        return self._length
+
+    def __eq__(self, other):
+        if isinstance(other, FileSequence) \
+          and other._source is self._source \
+          and other._offset == self._offset:
+            return self._length == other._length
+        return SequenceHandle.__eq__(self, other)
+
+    __hash__ = SequenceHandle.__hash__
+
+    def _decode(self, start, stop):
+        return self._source.read(self._offset, self._length, start, stop)
+
+
+class FileSequenceSource:
+    """Read only access to the sequences of a GFA file.
+
+    :param filepath: The path of an uncompressed GFA file.
+    :param cache_size: The maximum number of characters of the whole
+        sequences kept in memory once read, 0 disables the cache.
+    """
+
+    def __init__(self, filepath, cache_size=0):
+        self._filepath = filepath
+        with open(filepath, 'rb') as file_handler:
+            try:
+                self._map = mmap.mmap(file_handler.fileno(), 0, \
+                                      access=mmap.ACCESS_READ)
+            except ValueError: # empty file
+                self._map = b""
+        self._cache_size = cache_size
+        self._cache = collections.OrderedDict()
+        self._cached = 0 # characters in the cache
+
+    @property
+    def filepath(self):
+        return self._filepath
+
+    def sequence(self, offset, length):
+        """Return the handle of the sequence at the given offset."""
+        return FileSequence(self, offset, length)
+
+    def read(self, offset, length, start=0, stop=None):
+        """Return the characters from start to stop (excluded) of the
+        sequence with the given offset and length.
+        """
+        if stop is None:
+            stop = length
+        if start >= stop:
+            return ""
+        sequence = self._cache.get(offset)
+        if sequence is not None:
+            self._cache.move_to_end(offset)
+            return sequence[start:stop]
+        if start > 0 or stop < length or length > self._cache_size:
+            return self._map[offset + start:offset + stop].decode()
+
+        sequence = self._map[offset:offset + length].decode()
+        self._cache[offset] = sequence
+        self._cached += length
+        while self._cached > self._cache_size:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached -= len(evicted)
+        return sequence
+
+    def clear_cache(self):
+        """Drop all the sequences kept in memory."""
+        self._cache.clear()
+        self._cached = 0
+
+    def close(self):
+        """Close the memory map, the handles already given can't
+        be used anymore.
+        """
+        self.clear_cache()
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
@@ -0,0 +1,88 @@
+"""
+Binary files made of NumPy arrays, read through a memory map.
+
+The file starts with a magic string, the format version and a JSON
+index, that holds the user data given by the writer and the dtype,
+shape and position of each section; each section is 8 bytes aligned
+and is read directly from a memory map of the file, so only the
+pages actually accessed are loaded.
+
+Used by graph snapshots and by the segment index of GFA files.
+"""
+import json
+import mmap
+import struct
+
+import numpy as np
+
+_PREAMBLE = struct.Struct("<8sII") # magic, version, index size
+_ALIGNMENT = 8
+
+
+class SectionsError(Exception):
+    pass
+
+
+def write_sections(path, magic, version, index, sections):
+    """Write the given sections to path.
+
+    :param magic: The 8 bytes identifying the kind of file.
+    :param index: A JSON serializable dictionary stored with the
+        sections, its `sections` key is reserved.
+    :param sections: A list of (name, array) pairs.
+    """
+    index = dict(index, sections={})
+    offset = 0
+    for name, array in sections:
+        index['sections'][name] = {'dtype': array.dtype.str, \
+                                   'shape': list(array.shape), \
+                                   'offset': offset}
+        offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+    index = json.dumps(index).encode()
+    header_size = _PREAMBLE.size + len(index)
+    padding = -header_size % _ALIGNMENT
+
+    with open(path, 'wb') as file_handler:
+        file_handler.write(_PREAMBLE.pack(magic, version, len(index)))
+        file_handler.write(index)
+        file_handler.write(b"\0" * padding)
+        for name, array in sections:
+            file_handler.write(array.tobytes())
+            file_handler.write(b"\0" * (-array.nbytes % _ALIGNMENT))
+
+
+def read_sections(path, magic, version, error=SectionsError):
+    """Return the index of the file and its sections, as arrays
+    backed by a memory map of the file.
+
+    :param error: The exception raised if the file doesn't have
+        the given magic string and version.
+    """
+    with open(path, 'rb') as file_handler:
+        try:
+            map_ = mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError: # empty file
+            map_ = b""
+    if len(map_) < _PREAMBLE.size \
+      or _PREAMBLE.unpack_from(map_)[0] != magic:
+        raise error("{0} is not a {1} file.".format(path, magic.decode()))
+    _, file_version, index_size = _PREAMBLE.unpack_from(map_)
+    if file_version != version:
+        raise error("Unsupported version {0}, expected {1}.".format(\
+                        file_version, version))
+    index = json.loads(map_[_PREAMBLE.size:_PREAMBLE.size + index_size]\
+                       .decode())
+    header_size = _PREAMBLE.size + index_size
+    start = header_size + (-header_size % _ALIGNMENT)
+    sections = {}
+    for name, section in index['sections'].items():
+        dtype = np.dtype(section['dtype'])
+        count = int(np.prod(section['shape']))
+        sections[name] = np.frombuffer(map_, dtype=dtype, count=count, \
+                                       offset=start + section['offset']) \
+                           .reshape(section['shape'])
+    return index, sections
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
@@ -0,0 +1,387 @@
+"""
+Out-of-core storage for segment sequences.
+
+A PackedSequenceStore packs the bases of the sequences it receives
+into 2 bits each (4 bases per byte) and appends them to a temporary
+file, read back through a memory map. The graph keeps for each
+segment only a small PackedSequence handle, that decodes the bases
+when they are accessed.
+
+Characters other than `ACGT` (N and the other IUPAC codes, gaps...)
+are kept aside as runs of exceptions, and soft masked (lowercase)
+bases are kept as runs of positions, so the original sequence is
+always returned unchanged.
+
+A handle behaves like a read only string: it has a length, can be
+sliced, compared with strings and concatenated to them; slicing
+decodes only the bytes covering the slice. Use `str()` to get the
+whole sequence.
+"""
+import mmap
+import tempfile
+
+import numpy as np
+
+# Base codes of the packed representation, complement = 3 - code.
+BASES = b"ACGT"
+_NO_CODE = 4
+
+_CODES = np.full(256, _NO_CODE, dtype=np.uint8)
+for _code, _base in enumerate(BASES):
+    _CODES[_base] = _code
+    _CODES[_base + 32] = _code # lowercase
+
+_IS_LOWER = np.zeros(256, dtype=bool)
+_IS_LOWER[ord('a'):ord('z') + 1] = True
+
+# The 4 bases (as characters) packed into each byte value, the first
+# base is stored in the most significant bits.
+_DECODE = np.array([[BASES[(byte >> shift) & 3] for shift in (6, 4, 2, 0)] \
+                    for byte in range(256)], dtype=np.uint8)
+
+_COMPLEMENT = str.maketrans("ACGTURYKMBVDHacgturykmbvdh", \
+                            "TGCAAYRMKVBHDtgcaayrmkvbhd")
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+
+def reverse_complement(sequence):
+    """Return the reverse complement of the given sequence,
+    as a string.
+
+    IUPAC codes are complemented, any other character (such
+    as `N` or `*`) is kept as is.
+
+    :param sequence: A string or a SequenceHandle.
+    """
+    return str(sequence).translate(_COMPLEMENT)[::-1]
+
+
+def _runs(mask):
+    """Return the (start, end) positions of the runs of True
+    values in the given boolean array.
+    """
+    bounds = np.flatnonzero(np.diff(np.concatenate(\
+                ([False], mask, [False])).astype(np.int8)))
+    return [(int(bounds[index]), int(bounds[index + 1])) \
+            for index in range(0, len(bounds), 2)]
+
+
+def pack(sequence):
+    """Pack a sequence into 2 bits per base.
+
+    :param sequence: A string.
+    :returns (packed, exceptions, lowercase): The packed bytes, the
+        runs of characters that can't be packed as a tuple of
+        (start, string) pairs and the runs of lowercase positions as
+        a tuple of (start, end) pairs, each tuple is None if empty.
+    :returns None: If the sequence has non ASCII characters.
+    """
+    try:
+        chars = np.frombuffer(sequence.encode('ascii'), dtype=np.uint8)
+    except UnicodeEncodeError:
+        return None
+
+    codes = _CODES[chars]
+    exceptions = None
+    is_exception = codes == _NO_CODE
+    if is_exception.any():
+        exceptions = tuple((start, sequence[start:end]) \
+                           for start, end in _runs(is_exception))
+        codes[is_exception] = 0
+    lowercase = None
+    is_lower = _IS_LOWER[chars] & ~is_exception
+    if is_lower.any():
+        lowercase = tuple(_runs(is_lower))
+
+    padding = -len(codes) % 4
+    if padding:
+        codes = np.concatenate((codes, np.zeros(padding, dtype=np.uint8)))
+    codes = codes.reshape(-1, 4)
+    packed = (codes[:, 0] << 6) | (codes[:, 1] << 4) \
+             | (codes[:, 2] << 2) | codes[:, 3]
+    return packed.tobytes(), exceptions, lowercase
+
+
+def unpack(data, start, stop, exceptions=None, lowercase=None):
+    """Decode the characters from start to stop (excluded) of a
+    packed sequence.
+
+    :param data: The packed bytes of the sequence, starting from
+        the byte that holds the base at `start`.
+    :param exceptions: The runs of characters that can't be packed,
+        as given by `pack`.
+    :param lowercase: The runs of lowercase positions, as given
+        by `pack`.
+    """
+    if start >= stop:
+        return ""
+    chars = _DECODE[np.frombuffer(data, dtype=np.uint8)].reshape(-1)
+    shift = (start >> 2) << 2
+    chars = chars[start - shift:stop - shift]
+    if lowercase is not None:
+        for run_start, run_end in lowercase:
+            if run_start < stop and run_end > start:
+                run_start = max(run_start, start) - start
+                run_end = min(run_end, stop) - start
+                chars[run_start:run_end] += 32
+    if exceptions is not None:
+        for run_start, run in exceptions:
+            run_end = run_start + len(run)
+            if run_start < stop and run_end > start:
+                begin = max(run_start, start)
+                end = min(run_end, stop)
+                chars[begin - start:end - start] = np.frombuffer(\
+                    run[begin - run_start:end - run_start].encode(), \
+                    dtype=np.uint8)
+    return chars.tobytes().decode()
+
+
+def unpack_bases(data):
+    """Decode all the bases packed into the given bytes, 4 for each
+    byte, without applying exceptions and lowercase runs.
+    """
+    return _DECODE[np.frombuffer(data, dtype=np.uint8)].tobytes().decode()
+
+
+class SequenceHandle:
+    """Base class of the objects that stand in for a sequence
+    string stored elsewhere.
+
+    Subclasses only have to provide `__len__` and `_decode`.
+    """
+    __slots__ = ()
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def _decode(self, start, stop):
+        """Return the characters of the sequence from start to stop
+        (excluded) as a string.
+        """
+        raise NotImplementedError
+
+    def __getitem__(self, index):
+        length = len(self)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(length)
+            if step != 1:
+                return str(self)[index]
+            return self._decode(start, max(start, stop))
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError("sequence index out of range")
+        return self._decode(index, index + 1)
+
+    def __str__(self):
+        return self._decode(0, len(self))
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __iter__(self):
+        return iter(str(self))
+
+    def __contains__(self, substring):
+        return substring in str(self)
+
+    def __eq__(self, other):
+        if not isinstance(other, (str, SequenceHandle)):
+            return NotImplemented
+        return len(self) == len(other) and str(self) == str(other)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __add__(self, other):
+        if not isinstance(other, (str, SequenceHandle)):
+            return NotImplemented
+        return str(self) + str(other)
+
+    def __radd__(self, other):
+        if not isinstance(other, (str, SequenceHandle)):
+            return NotImplemented
+        return str(other) + str(self)
+
+    def reverse_complement(self):
+        """Return the reverse complement of the sequence."""
+        return reverse_complement(self)
+
+    # handles are immutable, so they are never duplicated
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        # the store is local to the process, so handles are
+        # pickled as the string they represent
+        return (str, (str(self),))
+
+
+class PackedSequence(SequenceHandle):
+    """A sequence stored into a PackedSequenceStore.
+
+    :param store: The store of the sequence.
+    :param offset: The position of the first byte of the sequence
+        in the store.
+    :param length: The number of characters of the sequence.
+    :param exceptions: The runs of characters that can't be packed,
+        as a tuple of (start, string) pairs, or None.
+    :param lowercase: The runs of lowercase positions, as a tuple
+        of (start, end) pairs, or None.
+    """
+    __slots__ = ('_store', '_offset', '_length', '_exceptions', '_lowercase')
+
+    def __init__(self, store, offset, length, exceptions=None, lowercase=None):
+        self._store = store
+        self._offset = offset
+        self._length = length
+        self._exceptions = exceptions
+        self._lowercase = lowercase
+
+    @property
+    def offset(self):
+        return self._offset
+
+    def packed(self):
+        """Return the packed bytes of the sequence, its exceptions
+        and its lowercase runs, as given by `pack`.
+        """
+        return self._store.read(self._offset, (self._length + 3) >> 2), \
+               self._exceptions, \
+               self._lowercase
+
+    def __len__(self):
+        return self._length
+
+    def __eq__(self, other):
+        if isinstance(other, PackedSequence) \
+          and other._store is self._store \
+          and other._offset == self._offset:
+            return self._length == other._length
+        return SequenceHandle.__eq__(self, other)
+
+    __hash__ = SequenceHandle.__hash__
+
+    def _decode(self, start, stop):
+        if start >= stop:
+            return ""
+        first_byte = start >> 2
+        data = self._store.read(self._offset + first_byte, \
+                                ((stop + 3) >> 2) - first_byte)
+        return unpack(data, start, stop, self._exceptions, self._lowercase)
+
+
+class PackedSequenceStore:
+    """Append only store of 2-bit packed sequences.
+
+    The packed bases are buffered in memory and written to a
+    temporary file when the buffer is full; the file is read through
+    a memory map, so the sequences don't occupy memory unless the
+    operating system keeps their pages cached.
+
+    Replacing the sequence of a node doesn't free the space taken by
+    the old one.
+
+    :param directory: The directory where the temporary file is
+        created, if None the default temporary directory is used.
+    :param min_length: Sequences shorter than this are not stored
+        and kept as strings.
+    :param buffer_size: The number of bytes buffered in memory before
+        they are written to the file.
+    """
+
+    def __init__(self, directory=None, min_length=0, \
+                 buffer_size=DEFAULT_BUFFER_SIZE):
+        self._file = tempfile.TemporaryFile(dir=directory)
+        self._min_length = min_length
+        self._buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._flushed = 0 # bytes written to the file
+        self._map = None
+        self._mapped = 0 # bytes visible through the memory map
+
+    def __len__(self):
+        """The number of bytes used by the store."""
+        return self._flushed + len(self._buffer)
+
+    def add(self, sequence):
+        """Store a sequence and return its handle.
+
+        Undefined (`*`) and empty sequences, sequences shorter than
+        `min_length` and sequences with non ASCII characters are
+        returned unchanged.
+
+        :param sequence: A string or a SequenceHandle.
+        """
+        if isinstance(sequence, PackedSequence) and sequence._store is self:
+            return sequence
+        if isinstance(sequence, SequenceHandle):
+            sequence = str(sequence)
+        if not isinstance(sequence, str) \
+          or sequence == "*" \
+          or len(sequence) == 0 \
+          or len(sequence) < self._min_length:
+            return sequence
+        packed = pack(sequence)
+        if packed is None:
+            return sequence
+        data, exceptions, lowercase = packed
+        return PackedSequence(self, self.add_packed(data), len(sequence), \
+                              exceptions, lowercase)
+
+    def add_packed(self, data):
+        """Append bytes already packed to the store and return the
+        offset of the first one.
+        """
+        offset = len(self)
+        self._buffer += data
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+        return offset
+
+    def flush(self):
+        """Write the buffered bytes to the file."""
+        if self._buffer:
+            self._file.seek(self._flushed)
+            self._file.write(self._buffer)
+            self._file.flush()
+            self._flushed += len(self._buffer)
+            self._buffer = bytearray()
+
+    def read(self, offset, size):
+        """Return size bytes of the store starting from offset."""
+        if offset >= self._flushed:
+            offset -= self._flushed
+            return bytes(self._buffer[offset:offset + size])
+        if offset + size > self._mapped:
+            # the file has grown since it was mapped
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), self._flushed, \
+                                  access=mmap.ACCESS_READ)
+            self._mapped = self._flushed
+        return self._map[offset:offset + size]
+
+    def close(self):
+        """Close and delete the file of the store, the handles
+        already given can't be used anymore.
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._mapped = 0
+        self._file.close()
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
@@ -0,0 +1,545 @@
+"""
+Binary snapshots of GFA graphs.
+
+A snapshot stores a graph in a versioned binary layout that can be
+loaded without parsing and validating text again:
+
+* a table with all the strings of the graph (ids, orientations,
+  alignments...), each one stored once and referred to by index;
+* NumPy arrays with the columns of nodes and edges (string indices,
+  lengths, distances and flags);
+* the sequences packed into 2 bits per base, as done by
+  sequence_store, with their exceptions and lowercase runs;
+* the optional fields, kept as their raw `TAG:TYPE:VALUE` string
+  and given back as LazyOptFields, so they are decoded only when
+  accessed;
+* a JSON document with the subgraphs and the attributes that don't
+  fit the columns, where the values that JSON can't represent
+  (tuples, dictionaries, fields, subgraphs...) are tagged objects.
+  Only data is read back, so loading a snapshot never runs code
+  stored in it.
+
+The sections are written and read back through a memory map by the
+sections module.
+"""
+import collections
+import gc
+import json
+
+import numpy as np
+
+from pygfa.graph_element.parser import line
+from pygfa.graph_element.lazy_opt_fields import LazyOptFields
+from pygfa.graph_element import subgraph as sg
+from pygfa.storage import sequence_store as ss, sections as sections_
+
+MAGIC = b"PYGFASNP"
+VERSION = 2
+_SEPARATOR = "\0"
+
+NODE_KEYS = ('nid', 'sequence', 'slen')
+EDGE_KEYS = ('eid', \
+             'from_node', 'from_orn', \
+             'to_node', 'to_orn', \
+             'from_positions', 'to_positions', \
+             'alignment', \
+             'distance', 'variance', \
+             'is_dovetail', \
+             'from_segment_end', 'to_segment_end')
+
+# Columns of the node_strings array.
+N_NAME, N_SEQUENCE, N_TAGS = range(3)
+# Columns of the node_numbers array.
+N_SLEN, N_OFFSET, N_LENGTH = range(3)
+# Flags of the nodes.
+NODE_SEGMENT = 1 # the node has the attributes of a segment
+NODE_SLEN = 2 # slen is defined
+NODE_PACKED = 4 # the sequence is packed
+
+# Columns of the edge_strings array.
+E_U, E_V, E_KEY, \
+E_EID, E_FROM_NODE, E_FROM_ORN, E_TO_NODE, E_TO_ORN, \
+E_FROM_BEG, E_FROM_END, E_TO_BEG, E_TO_END, \
+E_ALIGNMENT, E_VARIANCE, \
+E_FROM_SEGMENT_END, E_TO_SEGMENT_END, \
+E_TAGS = range(17)
+# Columns of the edge_numbers array.
+E_DISTANCE, E_VARIANCE_INT, E_POS = range(3)
+# Flags of the edges.
+EDGE_STANDARD = 1 # the edge has the attributes of a GFA edge
+EDGE_DOVETAIL = 2
+EDGE_DISTANCE = 4 # distance is defined
+EDGE_VARIANCE_INT = 8 # variance is an integer
+EDGE_POS = 16 # the edge has the position of a containment
+
+
+class SnapshotError(Exception):
+    pass
+
+
+class _StringTable:
+    """Assign an index to each distinct string, None is -1."""
+
+    def __init__(self):
+        self._indices = {}
+        self.strings = []
+
+    def index(self, string):
+        if string is None:
+            return -1
+        if not isinstance(string, str):
+            raise TypeError("Only strings can be stored in the table.")
+        index = self._indices.get(string)
+        if index is None:
+            if _SEPARATOR in string:
+                raise TypeError("Strings can't contain NUL characters.")
+            index = len(self.strings)
+            self._indices[string] = index
+            self.strings.append(string)
+        return index
+
+
+def _encode(value):
+    """Return the JSON representation of a value, where every JSON
+    object is a tagged value.
+
+    :raises TypeError: If the value can't be represented.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, tuple):
+        return {'t': 'tuple', 'v': [_encode(item) for item in value]}
+    if isinstance(value, dict):
+        # keys are not always strings
+        return {'t': 'odict' if isinstance(value, collections.OrderedDict) \
+                     else 'dict', \
+                'v': [[_encode(key), _encode(item)] \
+                      for key, item in dict.items(value)]}
+    if isinstance(value, (bytes, bytearray)):
+        return {'t': 'bytes', 'v': bytes(value).hex()}
+    if isinstance(value, line.OptField):
+        return {'t': 'optfield', 'name': value.name, \
+                'v': _encode(value.value), 'type': value.type}
+    if isinstance(value, line.Field):
+        return {'t': 'field', 'name': value.name, 'v': _encode(value.value)}
+    if isinstance(value, sg.Subgraph):
+        return {'t': 'subgraph', 'id': value.sub_id, \
+                'elements': _encode(value._elements), \
+                'v': _encode(value.opt_fields)}
+    raise TypeError("{0} cannot be stored in a snapshot.".format(type(value)))
+
+
+def _decode(value):
+    """Return the value given by its JSON representation
+    (see `_encode`).
+
+    :raises SnapshotError: If a tagged value is unknown.
+    """
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    tag = value.get('t')
+    if tag == 'tuple':
+        return tuple(_decode(item) for item in value['v'])
+    if tag in ('dict', 'odict'):
+        items = ((_decode(key), _decode(item)) for key, item in value['v'])
+        return collections.OrderedDict(items) if tag == 'odict' \
+               else dict(items)
+    if tag == 'bytes':
+        return bytes.fromhex(value['v'])
+    if tag == 'optfield':
+        # the value is already the one given by the validation
+        field = line.OptField.__new__(line.OptField)
+        field._name = value['name']
+        field._value = _decode(value['v'])
+        field._type = value['type']
+        return field
+    if tag == 'field':
+        return line.Field(value['name'], _decode(value['v']))
+    if tag == 'subgraph':
+        return sg.Subgraph(value['id'], _decode(value['elements']), \
+                           _decode(value['v']))
+    raise SnapshotError("Unknown value in the snapshot: {0}".format(tag))
+
+
+def _split_attributes(attributes, keys):
+    """Split the attributes that are not in keys into the raw
+    string of the optional fields and a dictionary with the others.
+    """
+    items = attributes.items()
+    raw_tags = []
+    if isinstance(attributes, LazyOptFields):
+        items = attributes.decoded_items()
+        if attributes.raw_tags:
+            raw_tags.append(attributes.raw_tags)
+    extras = {}
+    for key, value in items:
+        if key in keys:
+            continue
+        if isinstance(value, line.OptField) and value.name == key:
+            raw_field = str(value)
+            if not "\t" in raw_field:
+                raw_tags.append(raw_field)
+                continue
+        extras[key] = value
+    return str.join("\t", raw_tags), extras
+
+
+def _has_keys(attributes, keys):
+    for key in keys:
+        if not key in attributes:
+            return False
+    return True
+
+
+def _is_optional_int(value):
+    return value is None or (isinstance(value, int) \
+                             and not isinstance(value, bool))
+
+
+def _is_positions(value):
+    return isinstance(value, tuple) and len(value) == 2
+
+
+class _NodeColumns:
+
+    def __init__(self, strings):
+        self._strings = strings
+        self.strings = []
+        self.numbers = []
+        self.flags = []
+        self.exceptions = [0]
+        self.exception_starts = []
+        self.exception_runs = []
+        self.lowercase = [0]
+        self.lowercase_runs = []
+        self.sequences = bytearray()
+        self.extras = {}
+
+    def add(self, nid, attributes):
+        index = self._strings.index
+        flags = 0
+        sequence = slen = None
+        exceptions = lowercase = None
+        offset = length = 0
+        if _has_keys(attributes, NODE_KEYS) \
+          and attributes['nid'] == nid \
+          and _is_optional_int(attributes['slen']):
+            flags |= NODE_SEGMENT
+            slen = attributes['slen']
+            if slen is not None:
+                flags |= NODE_SLEN
+            sequence = attributes['sequence']
+            packed = None
+            if isinstance(sequence, ss.PackedSequence):
+                packed = sequence.packed()
+            elif isinstance(sequence, ss.SequenceHandle):
+                sequence = str(sequence)
+            if isinstance(sequence, str) and sequence not in ("", "*"):
+                packed = ss.pack(sequence)
+            if packed is not None:
+                flags |= NODE_PACKED
+                data, exceptions, lowercase = packed
+                offset = len(self.sequences)
+                length = len(sequence)
+                self.sequences += data
+                sequence = None
+            if sequence is not None and not isinstance(sequence, str):
+                flags = 0
+
+        if flags & NODE_SEGMENT:
+            tags, extras = _split_attributes(attributes, NODE_KEYS)
+        else:
+            tags, extras = _split_attributes(attributes, ())
+        if extras:
+            self.extras[len(self.flags)] = extras
+
+        self.strings.append((index(nid), index(sequence), index(tags or None)))
+        self.numbers.append((slen or 0, offset, length))
+        self.flags.append(flags)
+        for start, run in exceptions or ():
+            self.exception_starts.append(start)
+            self.exception_runs.append(index(run))
+        self.exceptions.append(len(self.exception_starts))
+        for bounds in lowercase or ():
+            self.lowercase_runs.append(bounds)
+        self.lowercase.append(len(self.lowercase_runs))
+
+
+class _EdgeColumns:
+
+    def __init__(self, strings):
+        self._strings = strings
+        self.strings = []
+        self.numbers = []
+        self.flags = []
+        self.extras = {}
+
+    def _standard_columns(self, attributes, row, numbers):
+        """Fill the columns of an edge with the attributes of a GFA
+        edge and return its flags.
+
+        :raises TypeError: If an attribute doesn't fit its column.
+        """
+        index = self._strings.index
+        from_positions = attributes['from_positions']
+        to_positions = attributes['to_positions']
+        if not (_is_positions(from_positions) \
+                and _is_positions(to_positions) \
+                and isinstance(attributes['is_dovetail'], bool) \
+                and _is_optional_int(attributes['distance'])):
+            raise TypeError("The edge has not the attributes of a GFA edge.")
+        flags = EDGE_STANDARD
+        if attributes['is_dovetail']:
+            flags |= EDGE_DOVETAIL
+        row[E_EID] = index(attributes['eid'])
+        row[E_FROM_NODE] = index(attributes['from_node'])
+        row[E_FROM_ORN] = index(attributes['from_orn'])
+        row[E_TO_NODE] = index(attributes['to_node'])
+        row[E_TO_ORN] = index(attributes['to_orn'])
+        row[E_FROM_BEG] = index(from_positions[0])
+        row[E_FROM_END] = index(from_positions[1])
+        row[E_TO_BEG] = index(to_positions[0])
+        row[E_TO_END] = index(to_positions[1])
+        row[E_ALIGNMENT] = index(attributes['alignment'])
+        row[E_FROM_SEGMENT_END] = index(attributes['from_segment_end'])
+        row[E_TO_SEGMENT_END] = index(attributes['to_segment_end'])
+        if attributes['distance'] is not None:
+            flags |= EDGE_DISTANCE
+            numbers[E_DISTANCE] = attributes['distance']
+        variance = attributes['variance']
+        if _is_optional_int(variance) and variance is not None:
+            flags |= EDGE_VARIANCE_INT
+            numbers[E_VARIANCE_INT] = variance
+        else:
+            row[E_VARIANCE] = index(variance)
+        return flags
+
+    def add(self, from_node, to_node, key, attributes):
+        index = self._strings.index
+        row = [-1] * (E_TAGS + 1)
+        numbers = [0, 0, 0]
+        flags = 0
+        row[E_U] = index(from_node)
+        row[E_V] = index(to_node)
+        row[E_KEY] = index(key)
+        keys = ()
+        if _has_keys(attributes, EDGE_KEYS):
+            try:
+                flags = self._standard_columns(attributes, row, numbers)
+                keys = EDGE_KEYS
+            except TypeError:
+                row[E_KEY + 1:] = [-1] * (E_TAGS - E_KEY)
+                numbers = [0, 0, 0]
+        if flags:
+            pos = attributes.get('pos')
+            if type(pos) is line.Field and pos.name == 'pos' \
+              and _is_optional_int(pos.value) and pos.value is not None:
+                flags |= EDGE_POS
+                numbers[E_POS] = pos.value
+                keys = EDGE_KEYS + ('pos',)
+
+        tags, extras = _split_attributes(attributes, keys)
+        row[E_TAGS] = index(tags or None)
+        if extras:
+            self.extras[len(self.flags)] = extras
+        self.strings.append(row)
+        self.numbers.append(numbers)
+        self.flags.append(flags)
+
+
+def _array(values, dtype, columns=None):
+    array = np.array(values, dtype=dtype)
+    if columns is not None:
+        array = array.reshape(-1, columns)
+    return array
+
+
+def save_snapshot(gfa_, path):
+    """Write a snapshot of the graph to the given path.
+
+    Nodes and edges whose id is not a string are not supported,
+    and neither are attribute values other than JSON values, tuples,
+    dictionaries, bytes, fields and subgraphs.
+
+    :raises SnapshotError: If the graph can't be stored.
+    """
+    strings = _StringTable()
+    nodes = _NodeColumns(strings)
+    edges = _EdgeColumns(strings)
+    try:
+        for nid, attributes in gfa_._graph.node.items():
+            nodes.add(nid, attributes)
+        for from_node, to_node, key, attributes in \
+          gfa_._graph.edges_iter(keys=True, data=True):
+            edges.add(from_node, to_node, key, attributes)
+        extras = json.dumps(_encode({'nodes': nodes.extras, \
+                                     'edges': edges.extras, \
+                                     'subgraphs': gfa_._subgraphs}))
+    except TypeError as type_error:
+        raise SnapshotError(type_error)
+    sections = [ \
+        ('strings', np.frombuffer(\
+            str.join(_SEPARATOR, strings.strings).encode(), dtype=np.uint8)), \
+        ('node_strings', _array(nodes.strings, np.int32, N_TAGS + 1)), \
+        ('node_numbers', _array(nodes.numbers, np.int64, N_LENGTH + 1)), \
+        ('node_flags', _array(nodes.flags, np.uint8)), \
+        ('exceptions', _array(nodes.exceptions, np.int64)), \
+        ('exception_starts', _array(nodes.exception_starts, np.int64)), \
+        ('exception_runs', _array(nodes.exception_runs, np.int32)), \
+        ('lowercase', _array(nodes.lowercase, np.int64)), \
+        ('lowercase_runs', _array(nodes.lowercase_runs, np.int64, 2)), \
+        ('sequences', np.frombuffer(bytes(nodes.sequences), dtype=np.uint8)), \
+        ('edge_strings', _array(edges.strings, np.int32, E_TAGS + 1)), \
+        ('edge_numbers', _array(edges.numbers, np.int64, E_POS + 1)), \
+        ('edge_flags', _array(edges.flags, np.uint8)), \
+        ('extras', np.frombuffer(extras.encode(), dtype=np.uint8)) \
+        ]
+
+    sections_.write_sections(path, MAGIC, VERSION, \
+                             {'next_virtual_id': gfa_._next_virtual_id}, \
+                             sections)
+
+
+def _node_runs(pointers, runs):
+    """Group the runs of the sequences by node, only for the nodes
+    that have any.
+
+    :param pointers: The position of the first run of each node.
+    """
+    runs = list(runs)
+    node_runs = {}
+    for node_index in np.flatnonzero(np.diff(pointers)).tolist():
+        node_runs[node_index] = \
+          tuple(runs[pointers[node_index]:pointers[node_index + 1]])
+    return node_runs
+
+
+def _attributes(attributes, raw_tags, extras):
+    if raw_tags is not None:
+        attributes = LazyOptFields(attributes, raw_tags)
+    if extras is not None:
+        attributes.update(extras)
+    return attributes
+
+
+def load_snapshot(gfa_, path, sequence_store=None):
+    """Add to the graph the elements of the snapshot in path.
+
+    No field is validated again: the snapshot is supposed to have
+    been written by `save_snapshot`. Only data is read from the
+    file, no code is run, but a snapshot from an untrusted source
+    can still give a graph with invalid fields.
+
+    :param sequence_store: If given, a PackedSequenceStore where the
+        packed sequences are copied, the nodes then hold a handle to
+        them instead of the strings.
+    :raises SnapshotError: If the file is not a snapshot or has an
+        unsupported version.
+    """
+    index, sections = sections_.read_sections(path, MAGIC, VERSION, \
+                                              SnapshotError)
+    # only new objects are created while loading, so the garbage
+    # collector would traverse the growing graph again and again
+    # without finding anything to free
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        _load_sections(gfa_, index, sections, sequence_store)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _load_sections(gfa_, index, sections, sequence_store):
+    strings = sections['strings'].tobytes().decode().split(_SEPARATOR)
+    strings.append(None) # index -1
+    # resolve the string columns in a single step
+    strings = np.array(strings, dtype=object)
+    try:
+        extras = _decode(json.loads(sections['extras'].tobytes().decode()))
+    except (ValueError, KeyError, TypeError) as error:
+        raise SnapshotError("Invalid snapshot: {0}".format(error))
+
+    packed = sections['sequences']
+    bases = base_offset = None
+    if sequence_store is not None:
+        base_offset = sequence_store.add_packed(packed.tobytes())
+    else:
+        bases = ss.unpack_bases(packed)
+
+    exceptions = _node_runs(sections['exceptions'], \
+                            zip(sections['exception_starts'].tolist(), \
+                                strings[sections['exception_runs']]))
+    lowercase = _node_runs(sections['lowercase'], \
+                           (tuple(bounds) for bounds in \
+                            sections['lowercase_runs'].tolist()))
+    node_extras = extras['nodes']
+    for node_index, ((nid, sequence, tags), \
+                     (slen, offset, length), \
+                     flags) in enumerate(zip(\
+                        strings[sections['node_strings']].tolist(), \
+                        sections['node_numbers'].tolist(), \
+                        sections['node_flags'].tolist())):
+        attributes = {}
+        if flags & NODE_SEGMENT:
+            if flags & NODE_PACKED:
+                runs = exceptions.get(node_index)
+                lower = lowercase.get(node_index)
+                if sequence_store is not None:
+                    sequence = ss.PackedSequence(sequence_store, \
+                                                 base_offset + offset, \
+                                                 length, runs, lower)
+                elif runs is None and lower is None:
+                    sequence = bases[offset * 4:offset * 4 + length]
+                else:
+                    sequence = ss.unpack(\
+                        packed[offset:offset + ((length + 3) >> 2)], \
+                        0, length, runs, lower)
+            attributes = {'nid': nid, \
+                          'sequence': sequence, \
+                          'slen': slen if flags & NODE_SLEN else None}
+        gfa_._add_node_attributes(nid, _attributes(\
+            attributes, tags, node_extras.get(node_index)))
+
+    edge_extras = extras['edges']
+    for edge_index, (row, numbers, flags) in enumerate(zip(\
+                        strings[sections['edge_strings']].tolist(), \
+                        sections['edge_numbers'].tolist(), \
+                        sections['edge_flags'].tolist())):
+        attributes = {}
+        if flags & EDGE_STANDARD:
+            variance = numbers[E_VARIANCE_INT] \
+                       if flags & EDGE_VARIANCE_INT \
+                       else row[E_VARIANCE]
+            attributes = {'eid': row[E_EID], \
+                          'from_node': row[E_FROM_NODE], \
+                          'from_orn': row[E_FROM_ORN], \
+                          'to_node': row[E_TO_NODE], \
+                          'to_orn': row[E_TO_ORN], \
+                          'from_positions': (row[E_FROM_BEG], \
+                                             row[E_FROM_END]), \
+                          'to_positions': (row[E_TO_BEG], row[E_TO_END]), \
+                          'alignment': row[E_ALIGNMENT], \
+                          'distance': numbers[E_DISTANCE] \
+                                      if flags & EDGE_DISTANCE else None, \
+                          'variance': variance, \
+                          'is_dovetail': bool(flags & EDGE_DOVETAIL), \
+                          'from_segment_end': row[E_FROM_SEGMENT_END], \
+                          'to_segment_end': row[E_TO_SEGMENT_END]}
+            if flags & EDGE_POS:
+                attributes['pos'] = line.Field('pos', numbers[E_POS])
+        gfa_._add_edge_attributes(row[E_U], row[E_V], row[E_KEY], \
+                                  _attributes(attributes, row[E_TAGS], \
+                                              edge_extras.get(edge_index)))
+
+    gfa_._subgraphs.update(extras['subgraphs'])
+    gfa_._next_virtual_id = max(gfa_._next_virtual_id, \
+                                index['next_virtual_id'])
+
+
+if __name__ == '__main__': # pragma: no cover
+    pass
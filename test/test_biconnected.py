@@ -4,7 +4,14 @@ sys.path.insert(0, '../')
 from networkx.exception import NetworkXError
 import unittest
 
+import networkx as nx
+import random
+
+import numpy as np
+
 import pygfa
+from pygfa import frozen_gfa
+from pygfa.dovetail_operations.components import biconnected
 
 gfa_file = str.join("", ["S\ts1\t25\t*\n" \
                         + "S\ts2\t21\t*\n" \
@@ -45,6 +52,69 @@ class TestLine (unittest.TestCase):
         self.assertTrue(set(self.graph.neighbors("s7")) == {"s5", "s6"})
         self.assertTrue(set(self.graph.dovetails_neighbors("s7")) == {"s6"})
         self.assertTrue(set(pygfa.dovetails_articulation_points(self.graph)) == {"s2", "s3"})
+        self.assertTrue(\
+            set(pygfa.dovetails_articulation_points(self.graph.freeze())) \
+            == {"s2", "s3"})
+
+    def test_bridges(self):
+        self.assertTrue(sorted(sorted(bridge[:2]) + [bridge[2]] for bridge in \
+                               pygfa.dovetails_bridges(self.graph, keys=True)) \
+                        == [["s1", "s2", "l12r"], \
+                            ["s2", "s3", "l23"], \
+                            ["s6", "s7", "l76"]])
+        self.assertTrue(\
+            sorted(sorted(bridge) for bridge in \
+                   pygfa.dovetails_bridges(self.graph.freeze())) \
+            == [["s1", "s2"], ["s2", "s3"], ["s6", "s7"]])
+
+        # parallel overlaps are not bridges
+        graph = pygfa.gfa.GFA()
+        graph.from_string(str.join("\n", ["S\ta\t*", \
+                                          "S\tb\t*", \
+                                          "S\tc\t*", \
+                                          "L\ta\t+\tb\t+\t*", \
+                                          "L\ta\t-\tb\t-\t*", \
+                                          "L\tb\t+\tc\t+\t*"]))
+        self.assertTrue(list(pygfa.dovetails_bridges(graph)) in \
+                        ([("b", "c")], [("c", "b")]))
+        self.assertTrue(set(pygfa.dovetails_articulation_points(graph)) \
+                        == {"b"})
+
+    def test_biconnected_components(self):
+        components = sorted(sorted(component) for component in \
+                        pygfa.dovetails_biconnected_components(self.graph))
+        self.assertTrue(components == [["s1", "s2"], \
+                                       ["s2", "s3"], \
+                                       ["s3", "s4", "s5"], \
+                                       ["s6", "s7"]])
+        self.assertTrue(sorted(sorted(component) for component in \
+                    pygfa.dovetails_biconnected_components(\
+                                                self.graph.freeze())) \
+                        == components)
+
+    def test_biconnected_ids(self):
+        """Compare with networkx on random simple graphs."""
+        generator = random.Random(0)
+        for count in range(20):
+            size = generator.randint(1, 40)
+            graph = nx.gnm_random_graph(size, generator.randint(0, 2 * size), \
+                                        seed=count)
+            ends = np.array(graph.edges(), dtype=np.int64).reshape(-1, 2)
+            adjacency = [array.tolist() for array in frozen_gfa._incidences(\
+                            size, ends, np.arange(len(ends)))]
+            articulation_points, bridges, components = \
+              biconnected.biconnected_ids(*adjacency, components=True)
+            self.assertTrue(set(articulation_points) == \
+                            set(nx.articulation_points(graph)))
+            self.assertTrue(\
+                sorted(sorted(set(ends[component].ravel().tolist())) \
+                       for component in components) == \
+                sorted(sorted(component) for component in \
+                       nx.biconnected_components(graph)))
+            # a bridge is a biconnected component of a single edge
+            self.assertTrue(sorted(bridges) == \
+                            sorted(component[0] for component in components \
+                                   if len(component) == 1))
 
 
 if  __name__ == '__main__':
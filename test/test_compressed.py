@@ -0,0 +1,178 @@
+import sys
+sys.path.insert(0, '../')
+
+import gzip
+import io
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+
+import pygfa
+from pygfa.loader import compressed, parallel, segment_index
+from pygfa.serializer import compressed_writer
+
+BGZF_EOF = bytes.fromhex("1f8b08040000000000ff060042430200" \
+                         + "1b0003000000000000000000")
+
+
+def bgzf_compress(data, block_size):
+    """Compress data as BGZF blocks of block_size uncompressed bytes."""
+    blocks = []
+    for start in range(0, len(data), block_size):
+        block = data[start:start + block_size]
+        deflate = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+        cdata = deflate.compress(block) + deflate.flush()
+        blocks.append(struct.pack("<4BI2BH2sHH", 31, 139, 8, 4, 0, 0, 255, \
+                                  6, b"BC", 2, len(cdata) + 25))
+        blocks.append(cdata)
+        blocks.append(struct.pack("<2I", zlib.crc32(block), len(block)))
+    blocks.append(BGZF_EOF)
+    return b"".join(blocks)
+
+
+class TestCompressed (unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.plain = "../data/sample1.gfa"
+        with open(self.plain, 'rb') as file_handler:
+            self.data = file_handler.read()
+        self.gzip = os.path.join(self.directory.name, "sample1.gfa.gz")
+        with gzip.open(self.gzip, 'wb') as file_handler:
+            file_handler.write(self.data)
+        self.bgzf = os.path.join(self.directory.name, "sample1.gfa.bgz")
+        with open(self.bgzf, 'wb') as file_handler:
+            file_handler.write(bgzf_compress(self.data, 100))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_detect_compression(self):
+        self.assertTrue(compressed.detect_compression(self.plain) == \
+                        compressed.PLAIN)
+        self.assertTrue(compressed.detect_compression(self.gzip) == \
+                        compressed.GZIP)
+        self.assertTrue(compressed.detect_compression(self.bgzf) == \
+                        compressed.BGZF)
+
+    def test_bgzf_reader(self):
+        index = compressed.block_index(self.bgzf)
+        self.assertTrue(len(index) == -(-len(self.data) // 100) + 1)
+        self.assertTrue(index[-1] == (len(self.data), \
+                                      os.path.getsize(self.bgzf)))
+
+        with compressed.BGZFReader(self.bgzf) as reader:
+            self.assertTrue(reader.read() == self.data)
+            for position in (0, 99, 100, 150, len(self.data) - 1):
+                reader.seek(compressed.virtual_offset(index, position))
+                self.assertTrue(reader.read(120) == \
+                                self.data[position:position + 120])
+
+            reader.seek(0)
+            lines = list(reader)
+            self.assertTrue(lines == \
+                            io.BytesIO(self.data).readlines())
+
+            # the position after a line, used to resume from it
+            reader.seek(0)
+            reader.readline()
+            offset = reader.tell()
+            rest = reader.read()
+            reader.seek(offset)
+            self.assertTrue(reader.read_to(None) == rest)
+            reader.seek(0)
+            self.assertTrue(reader.read_to(offset) == lines[0])
+
+        chunks = compressed.bgzf_chunk_offsets(self.bgzf, 200, min_chunks=3)
+        self.assertTrue(len(chunks) >= 3)
+        self.assertTrue(chunks[-1][1] is None)
+        parts = []
+        with compressed.BGZFReader(self.bgzf) as reader:
+            for start, end in chunks:
+                reader.seek(start)
+                parts.append(reader.read_to(end))
+        self.assertTrue(b"".join(parts) == self.data)
+        self.assertTrue(all(part.endswith(b"\n") for part in parts[:-1]))
+
+    def test_line_reader(self):
+        with compressed.open_lines(self.gzip, read_size=64) as lines:
+            self.assertTrue(list(lines) == self.data.decode().splitlines())
+        with compressed.ThreadedLineReader(io.BytesIO(b"a\nb"), 1) as lines:
+            self.assertTrue(list(lines) == ["a", "b"])
+        batches = list(parallel.line_batches(["aaa", "b", "cc"], 5))
+        self.assertTrue(batches == [["aaa", "b"], ["cc"]])
+        with self.assertRaises(compressed.CompressionError):
+            compressed.open_binary(self.plain, "lzma")
+
+    def test_from_file(self):
+        graph = pygfa.gfa.GFA.from_file(self.plain)
+        for path in (self.gzip, self.bgzf):
+            self.assertTrue(graph == pygfa.gfa.GFA.from_file(path))
+            self.assertTrue(graph == pygfa.gfa.GFA.from_file(path, \
+                                                             mode="records"))
+            same_graph = pygfa.gfa.GFA()
+            parallel.load_file(same_graph, path, 2, chunk_size=200)
+            self.assertTrue(graph == same_graph)
+            self.assertTrue(graph.dump() == same_graph.dump())
+
+    def test_compressed_output(self):
+        # long sequences, so the BGZF file has more blocks
+        lines = ["H\tVN:Z:1.0"]
+        for nid in range(60):
+            lines.append("S\t{0}\t{1}".format(nid, "ACGTTGCA" * 600))
+            if nid > 0:
+                lines.append("L\t{0}\t+\t{1}\t+\t4M".format(nid - 1, nid))
+        path = os.path.join(self.directory.name, "long.gfa")
+        with open(path, 'w') as file_handler:
+            file_handler.write(str.join("\n", lines) + "\n")
+        graph = pygfa.gfa.GFA.from_file(path)
+        dump_ = graph.dump()
+
+        for compression, workers in ((compressed.BGZF, None), \
+                                     (compressed.BGZF, 2), \
+                                     (compressed.GZIP, None)):
+            out = os.path.join(self.directory.name, "out.gfa.gz")
+            graph.dump(out=out, compression=compression, \
+                       compression_level=1, workers=workers)
+            self.assertTrue(compressed.detect_compression(out) == compression)
+            with open(out, 'rb') as file_handler:
+                self.assertTrue(gzip.decompress(file_handler.read()) \
+                                .decode() == dump_)
+
+        # the index is built while the file is written
+        out = os.path.join(self.directory.name, "out.gfa.bgz")
+        graph.dump(out=out, compression=compressed.BGZF, index=True)
+        self.assertTrue(len(compressed.block_index(out)) > 3)
+        index = segment_index.read_index(segment_index.index_path(out))
+        self.assertTrue(index.is_current(out))
+        scanned = segment_index.build_index(out, out + ".scanned")
+        for name in ("segment_offsets", "edge_offsets", "edge_ends", \
+                     "incidences"):
+            self.assertTrue((getattr(index, "_" + name) == \
+                             getattr(scanned, "_" + name)).all())
+        region = pygfa.gfa.GFA.load_region(out, "30", radius=2)
+        self.assertTrue(set(region.nodes()) == \
+                        set(["28", "29", "30", "31", "32"]))
+
+        plain = os.path.join(self.directory.name, "out.gfa")
+        graph.dump(out=plain, index=plain + ".idx")
+        scanned = segment_index.build_index(plain, plain + ".scanned")
+        index = segment_index.read_index(plain + ".idx")
+        self.assertTrue((index._segment_offsets == \
+                         scanned._segment_offsets).all())
+
+        with self.assertRaises(segment_index.SegmentIndexError):
+            graph.dump(out=out, compression=compressed.GZIP, index=True)
+        with self.assertRaises(compressed.CompressionError):
+            graph.dump(out=out, compression="lzma")
+        with self.assertRaises(pygfa.gfa.GFAError):
+            graph.dump(compression=compressed.BGZF)
+        with open(out, 'wb') as file_handler:
+            with self.assertRaises(compressed.CompressionError):
+                compressed_writer.CompressedWriter(file_handler, "zstd")
+
+
+if  __name__ == '__main__':
+    unittest.main()
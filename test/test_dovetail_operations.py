@@ -34,6 +34,31 @@ gfa_file = str.join("", [\
 # [s6_s6] --- [s7_s7]                [s8_s8_s8]
 #
 
+#
+# [a] -- [b] -- [c] -- [d] -- [z]   backbone, 100bp each
+#          \     /      \
+#         [t1] [t2]     [h] -- [e1]
+#                |         \-- [e2]
+#              [t3]
+#
+# [p] -- [q]   [i]
+#
+tips_file = str.join("\n", ["S\t{0}\t*\tLN:i:{1}".format(nid, length) \
+                            for nid, length in [("a", 100), ("b", 100), \
+                                                ("c", 100), ("d", 100), \
+                                                ("z", 100), ("t1", 10), \
+                                                ("t2", 5), ("t3", 5), \
+                                                ("h", 10), ("e1", 5), \
+                                                ("e2", 5), ("p", 5), \
+                                                ("q", 5), ("i", 5)]] \
+                      + ["L\t{0}\t+\t{1}\t+\t*".format(from_node, to_node) \
+                         for from_node, to_node in [("a", "b"), ("b", "c"), \
+                                                    ("c", "d"), ("d", "z"), \
+                                                    ("b", "t1"), ("t3", "t2"), \
+                                                    ("t2", "c"), ("d", "h"), \
+                                                    ("h", "e1"), ("h", "e2"), \
+                                                    ("p", "q")]])
+
 class TestLine (unittest.TestCase):
 
     graph = pygfa.gfa.GFA()
@@ -131,6 +156,47 @@ class TestLine (unittest.TestCase):
         with self.assertRaises(ValueError):
             pygfa.dovetails_remove_dead_ends(copy_, -1)
 
+    def test_dovetails_clip_tips(self):
+        backbone = {"a", "b", "c", "d", "z"}
+        isolated = {"p", "q", "i"}
+        graph = pygfa.gfa.GFA()
+        graph.from_string(tips_file)
+        pygfa.dovetails_clip_tips(graph, 20)
+        # h becomes a tip once e1 or e2 is clipped
+        self.assertTrue(set(graph.nodes()) == backbone | isolated)
+        self.assertTrue(graph.right("b") == ["c"])
+        self.assertTrue(graph.left("c") == ["b"])
+        self.assertTrue(graph.right("d") == ["z"])
+
+        graph = pygfa.gfa.GFA()
+        graph.from_string(tips_file)
+        pygfa.dovetails_clip_tips(graph, 20, max_segments=1)
+        self.assertTrue(set(graph.nodes()) == \
+                        backbone | isolated | {"t2", "t3", "h", "e2"} \
+                        or set(graph.nodes()) == \
+                        backbone | isolated | {"t2", "t3", "h", "e1"})
+
+        graph = pygfa.gfa.GFA()
+        graph.from_string(tips_file)
+        pygfa.dovetails_clip_tips(graph, 15)
+        # t2 and t3 are 10bp, h with one of e1 and e2 is 15bp
+        self.assertTrue(set(graph.nodes()) == \
+                        backbone | isolated | {"h", "e2"} \
+                        or set(graph.nodes()) == \
+                        backbone | isolated | {"h", "e1"})
+
+        graph = pygfa.gfa.GFA()
+        graph.from_string(tips_file)
+        graph.add_node("S\tt1\t*\tLN:i:10\tRC:i:1000")
+        pygfa.dovetails_clip_tips(graph, 20, coverage_tag="RC", \
+                                  min_coverage=50)
+        self.assertTrue(set(graph.nodes()) == backbone | isolated | {"t1"})
+
+        with self.assertRaises(ValueError):
+            pygfa.dovetails_clip_tips(graph, -1)
+        with self.assertRaises(ValueError):
+            pygfa.dovetails_clip_tips(graph, 1, max_segments=0)
+
 
 if  __name__ == '__main__':
     unittest.main()
@@ -128,6 +128,64 @@ class TestLine (unittest.TestCase):
         self.assertTrue(set(graph.dovetails_linear_path_iter("42")) == set())
 
         self.assertTrue(set(graph.dovetails_linear_path_iter("s5")) == set())
+
+
+    def test_segment_ends_index(self):
+        """The index of the segment ends follows every change of the
+        graph and gives the same results of a scan of the edges."""
+        def scan(graph, nid, end):
+            ends = []
+            for from_, to_, key, edge_ in \
+              graph.dovetails_iter(nid, keys=True, data=True):
+                if nid == edge_["from_node"] \
+                  and edge_["from_segment_end"] == end:
+                    ends.append((from_, to_, key))
+                if nid == edge_["to_node"] \
+                  and edge_["to_segment_end"] == end:
+                    ends.append((from_, to_, key))
+            return sorted(ends)
+
+        def check(graph):
+            for nid in graph.nodes():
+                self.assertTrue(sorted(graph.right_end_iter(nid, keys=True)) \
+                                == scan(graph, nid, "R"))
+                self.assertTrue(sorted(graph.left_end_iter(nid, keys=True)) \
+                                == scan(graph, nid, "L"))
+                self.assertTrue(graph.right_degree(nid) == \
+                                len(scan(graph, nid, "R")))
+                self.assertTrue(graph.left_degree(nid) == \
+                                len(scan(graph, nid, "L")))
+            self.assertTrue(all(graph._dovetail_ends.values()))
+
+        graph = pygfa.gfa.GFA()
+        graph.from_string(linear_path + "L\ts5\t+\ts5\t-\t*\n")
+        check(graph)
+        self.assertTrue(graph.right("s5") == ["s5", "s5"])
+        self.assertTrue(graph.right_degree() == \
+                        {"s1": 2, "s2": 1, "s3": 1, "s4": 1, "s5": 2, "s6": 1})
+        self.assertTrue(list(graph.left_end_iter("s2", data=True)) == \
+                        [("s2", "s1", graph.edge(("s1", "s2", "virtual_0")))])
+
+        graph.remove_edge("virtual_4")
+        check(graph)
+        self.assertTrue(graph.right("s1") == ["s2"])
+        graph.remove_edge(("s2", "s3", "virtual_1"))
+        graph.remove_edges("s4", "s5")
+        check(graph)
+        graph.remove_node("s6")
+        check(graph)
+        self.assertTrue(graph.right_degree("s3") == 0)
+        self.assertTrue(graph.left_degree("s4") == 0)
+        graph.add_edge("L\ts3\t-\ts4\t+\t*")
+        check(graph)
+        self.assertTrue(graph.left("s3") == ["s4"])
+        self.assertTrue(graph.left("s4") == ["s3"])
+
+        other = pygfa.gfa.GFA(graph._graph)
+        self.assertTrue(other._dovetail_ends == graph._dovetail_ends)
+        graph.clear()
+        self.assertTrue(graph._dovetail_ends == {})
+        self.assertTrue(graph.right("s1") == [])
         
 
 if  __name__ == '__main__':
@@ -0,0 +1,127 @@
+import sys
+sys.path.insert(0, '../')
+
+import random
+import unittest
+
+import pygfa
+from pygfa.dovetail_operations.components.connected import _plain_bfs_dovetails
+from networkx.algorithms.components.connected import node_connected_component as nx_node_connected_component
+
+#
+# --- = dovetail overlap
+# ~~~ = other overlap
+#
+# [s1] --- [s2] --- [s3] ~~~ [s4] --- [s5]    [s6]
+#
+gfa_file = str.join("", ["S\ts1\t25\t*\n", \
+                         "S\ts2\t21\t*\n", \
+                         "S\ts3\t10\t*\n", \
+                         "S\ts4\t12\t*\n", \
+                         "S\ts5\t21\t*\n", \
+                         "S\ts6\t7\t*\n", \
+                         "E\tl12\ts1+\ts2+\t20\t24$\t0\t4\t*\n", \
+                         "E\tl23\ts2+\ts3+\t18\t20$\t0\t2\t*\n", \
+                         "E\tlgeneric34\ts3+\ts4+\t5\t8\t0\t3\t*\n", \
+                         "E\tl45\ts4+\ts5+\t9\t11$\t0\t2\t*\n"])
+
+class TestDynamicComponents(unittest.TestCase):
+
+    graph = pygfa.gfa.GFA()
+
+    def test_track_components(self):
+        self.graph.clear()
+        self.graph.track_components()
+        self.graph.from_string(gfa_file)
+        self.assertTrue(pygfa.nodes_connected_component(self.graph, "s1") \
+                        == {"s1", "s2", "s3", "s4", "s5"})
+        self.assertTrue(\
+            pygfa.dovetails_nodes_connected_component(self.graph, "s1") \
+            == {"s1", "s2", "s3"})
+        self.assertTrue(\
+            pygfa.dovetails_nodes_connected_component(self.graph, "s6") \
+            == {"s6"})
+
+        self.graph.remove_edge("lgeneric34")
+        self.assertTrue(pygfa.nodes_connected_component(self.graph, "s1") \
+                        == {"s1", "s2", "s3"})
+        self.assertTrue(pygfa.nodes_connected_component(self.graph, "s5") \
+                        == {"s4", "s5"})
+
+        self.graph.add_edge("L\ts5\t+\ts6\t+\t*")
+        self.assertTrue(\
+            pygfa.dovetails_nodes_connected_component(self.graph, "s4") \
+            == {"s4", "s5", "s6"})
+
+        self.graph.remove_node("s2")
+        self.assertTrue(\
+            pygfa.dovetails_nodes_connected_component(self.graph, "s1") \
+            == {"s1"})
+        self.assertTrue(\
+            pygfa.dovetails_nodes_connected_component(self.graph, "s3") \
+            == {"s3"})
+        self.assertTrue(sorted(sorted(component) for component in \
+                               pygfa.nodes_connected_components(self.graph)) \
+                        == [["s1"], ["s3"], ["s4", "s5", "s6"]])
+
+        self.graph.add_node("S\ts2\t*")
+        self.assertTrue(pygfa.nodes_connected_component(self.graph, "s2") \
+                        == {"s2"})
+
+        self.graph.clear()
+        self.graph.from_string(gfa_file)
+        self.assertTrue(pygfa.nodes_connected_component(self.graph, "s6") \
+                        == {"s6"})
+        self.graph.track_components(False)
+        self.assertTrue(self.graph._components is None)
+
+    def test_unknown_ids(self):
+        """Edge keys are in the GFA but are not nodes, so they
+        must not be added to the tracked components.
+        """
+        self.graph.clear()
+        self.graph.track_components()
+        self.graph.from_string(gfa_file)
+        self.assertTrue("l12" in self.graph)
+        with self.assertRaises(KeyError):
+            pygfa.nodes_connected_component(self.graph, "l12")
+        with self.assertRaises(KeyError):
+            self.graph._components.component("l12")
+        self.assertTrue(sorted(sorted(component) for component in \
+                               pygfa.nodes_connected_components(self.graph)) \
+                        == [["s1", "s2", "s3", "s4", "s5"], ["s6"]])
+        self.graph.track_components(False)
+
+    def test_random_edits(self):
+        graph = pygfa.gfa.GFA()
+        graph.track_components()
+        generator = random.Random(0)
+        nodes = ["s{0}".format(x) for x in range(30)]
+        for nid in nodes:
+            graph.add_node("S\t{0}\t*".format(nid))
+        for count in range(300):
+            if generator.random() < 0.6:
+                graph.add_edge("L\t{0}\t+\t{1}\t{2}\t*".format(\
+                    generator.choice(nodes), \
+                    generator.choice(nodes), \
+                    generator.choice("+-")))
+            elif generator.random() < 0.8 and graph.edges():
+                graph.remove_edge(generator.choice(graph.edges(keys=True)))
+            else:
+                nid = generator.choice(nodes)
+                if nid in graph:
+                    graph.remove_node(nid)
+                else:
+                    graph.add_node("S\t{0}\t*".format(nid))
+            nid = generator.choice(nodes)
+            if nid in graph:
+                self.assertTrue(\
+                    pygfa.nodes_connected_component(graph, nid) \
+                    == nx_node_connected_component(graph._graph, nid))
+                self.assertTrue(\
+                    pygfa.dovetails_nodes_connected_component(graph, nid) \
+                    == set(_plain_bfs_dovetails(graph, nid)))
+
+
+if  __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import sys
+sys.path.insert(0, '../')
+
+import unittest
+
+import pygfa
+from pygfa import frozen_gfa
+
+gfa_file = str.join("", ["S\ts1\t9\t*\n" \
+                        + "S\ts2\t11\t*\n" \
+                        + "S\ts3\t23\t*\n" \
+                        + "S\ts4\t3\t*\n" \
+                        + "S\ts5\t50\t*\n" \
+                        + "E\tl12\ts1+\ts2+\t3\t8$\t0\t4\t*\n" \
+                        + "E\tl23\ts2-\ts3+\t0\t2\t7\t10$\t*\n" \
+                        + "E\tc14\ts1+\ts4+\t5\t7\t0\t2$\t*\n" \
+                        + "E\tl15\ts1-\ts5+\t0\t5\t0\t5\t*\n"])
+
+data_files = ["../data/sample1.gfa", \
+              "../data/sample2.gfa", \
+              "../data/example1.gfa", \
+              "../data/check_overlap_test.gfa"]
+
+def sorted_edges(edges):
+    return sorted(tuple(sorted(edge_)) for edge_ in edges)
+
+def sorted_sets(sets):
+    return sorted(sorted(set_) for set_ in sets)
+
+class TestFrozenGFA(unittest.TestCase):
+
+    def test_columns(self):
+        graph = pygfa.gfa.GFA()
+        graph.from_string(gfa_file)
+        frozen = graph.freeze()
+        self.assertTrue(isinstance(frozen, frozen_gfa.FrozenGFA))
+        self.assertTrue(frozen.nodes() == graph.nodes())
+        self.assertTrue(frozen.slen.tolist() == [9, 11, 23, 3, 50])
+        self.assertTrue(len(frozen.edge_types) == 4)
+
+        edge_ = frozen._key_ids["l23"]
+        self.assertTrue(frozen.edge_types[edge_] == frozen_gfa.DOVETAIL)
+        self.assertTrue(frozen.edge_ends[edge_].tolist() == [1, 2])
+        self.assertTrue(frozen.edge_orientations[edge_].tolist() == [1, 0])
+        self.assertTrue(frozen.edge_segment_ends[edge_].tolist() == [1, 1])
+        self.assertTrue(frozen.edge_overlaps[edge_] == 2)
+        edge_ = frozen._key_ids["c14"]
+        self.assertTrue(frozen.edge_types[edge_] == frozen_gfa.INTERNAL)
+        self.assertTrue(frozen.edge_segment_ends[edge_].tolist() == [-1, -1])
+
+        self.assertTrue("s1" in frozen)
+        self.assertTrue("l12" in frozen)
+        self.assertFalse("s42" in frozen)
+        self.assertTrue(frozen.node("s1") == graph.node("s1"))
+        self.assertTrue(frozen.edge("l12") == graph.edge("l12"))
+        self.assertTrue(dict(frozen.edge(("s1", "s2"))) == \
+                        graph.edge(("s1", "s2")))
+        self.assertTrue(frozen.edge(("s1", "s2", "l12")) == \
+                        graph.edge(("s1", "s2", "l12")))
+        self.assertTrue(sorted(frozen.neighbors("s1")) == \
+                        sorted(graph.neighbors("s1")))
+        with self.assertRaises(TypeError):
+            frozen.node("s1")["slen"] = 10
+        with self.assertRaises(frozen_gfa.FrozenGFAError):
+            frozen.neighbors("s42")
+
+        # the structure doesn't follow the graph
+        graph.remove_node("s2")
+        self.assertTrue(frozen.right("s1") == ["s2"])
+        self.assertTrue(frozen.right("s3") == ["s2"])
+
+    def test_dovetail_iterator(self):
+        for file_ in data_files:
+            graph = pygfa.gfa.GFA.from_file(file_)
+            frozen = graph.freeze()
+            self.assertTrue(sorted_edges(frozen.edges()) == \
+                            sorted_edges(graph.edges()))
+            self.assertTrue(sorted_edges(frozen.dovetails_iter()) == \
+                            sorted_edges(graph.dovetails_iter()))
+            self.assertTrue(frozen.right_degree() == graph.right_degree())
+            self.assertTrue(frozen.left_degree() == graph.left_degree())
+            for nid in graph.nodes():
+                self.assertTrue(sorted(frozen.right(nid)) == \
+                                sorted(graph.right(nid)))
+                self.assertTrue(sorted(frozen.left(nid)) == \
+                                sorted(graph.left(nid)))
+                self.assertTrue(frozen.right_degree(nid) == \
+                                graph.right_degree(nid))
+                self.assertTrue(sorted(frozen.dovetails_neighbors(nid)) == \
+                                sorted(graph.dovetails_neighbors(nid)))
+                self.assertTrue(\
+                    set(frozen.dovetails_linear_path_traverse_nodes_iter(nid)) \
+                    == set(graph.dovetails_linear_path_traverse_nodes_iter(nid)))
+                self.assertTrue(sorted_edges(\
+                    frozen.dovetails_linear_path_traverse_edges_iter(nid)) \
+                    == sorted_edges(\
+                    graph.dovetails_linear_path_traverse_edges_iter(nid)))
+                self.assertTrue(\
+                    len(list(frozen.dovetails_linear_path_iter(nid))) == \
+                    len(list(graph.dovetails_linear_path_iter(nid))))
+
+    def test_dovetail_operations(self):
+        for file_ in data_files:
+            graph = pygfa.gfa.GFA.from_file(file_)
+            frozen = graph.freeze()
+            self.assertTrue(\
+                sorted_sets(pygfa.nodes_connected_components(frozen)) == \
+                sorted_sets(pygfa.nodes_connected_components(graph)))
+            for with_sequence in (True, False):
+                self.assertTrue(sorted_sets(\
+                    pygfa.dovetails_nodes_connected_components(\
+                        frozen, with_sequence=with_sequence)) == \
+                    sorted_sets(pygfa.dovetails_nodes_connected_components(\
+                        graph, with_sequence=with_sequence)))
+            for nid in graph.nodes():
+                self.assertTrue(\
+                    pygfa.dovetails_nodes_connected_component(frozen, nid) \
+                    == pygfa.dovetails_nodes_connected_component(graph, nid))
+                self.assertTrue(pygfa.nodes_connected_component(frozen, nid) \
+                                == pygfa.nodes_connected_component(graph, nid))
+            self.assertTrue(\
+                sorted(sorted_edges(path_) for path_ in \
+                       pygfa.dovetails_linear_paths(frozen)) == \
+                sorted(sorted_edges(path_) for path_ in \
+                       pygfa.dovetails_linear_paths(graph)))
+            self.assertTrue(\
+                set(pygfa.dovetails_articulation_points(frozen)) == \
+                set(pygfa.dovetails_articulation_points(graph)))
+
+        graph = pygfa.gfa.GFA.from_file("../data/sample1.gfa")
+        frozen = graph.freeze()
+        for source in graph.nodes():
+            for target in graph.nodes():
+                self.assertTrue(sorted(\
+                    pygfa.dovetails_all_simple_paths(frozen, source, target)) \
+                    == sorted(\
+                    pygfa.dovetails_all_simple_paths(graph, source, target)))
+
+    def test_component_labels(self):
+        ends = frozen_gfa.np.array([[4, 3], [3, 2], [0, 1], [6, 6]])
+        self.assertTrue(frozen_gfa.component_labels(7, ends).tolist() == \
+                        [0, 0, 2, 2, 2, 5, 6])
+
+
+if  __name__ == '__main__':
+    unittest.main()
@@ -255,6 +255,44 @@ class TestLine (unittest.TestCase):
             self.graph.add_edge ("Z\t3\t4-\t0\t140$\t0\t140\t11M") # invalid line
 
 
+    def test_edge_key_index(self):
+        """The end nodes of each edge key are kept up to date with
+        the graph."""
+        def ends(table):
+            # the order of the end nodes is not relevant
+            return {key: set(nodes) for key, nodes in table.items()}
+
+        self.graph.clear()
+        self.graph.from_string(sample_gfa2)
+        table = self.graph._make_edge_table()
+        self.assertTrue(ends(self.graph._edge_ends) == ends(table))
+        for key, (from_node, to_node) in table.items():
+            self.assertTrue(key in self.graph)
+            self.assertTrue(self.graph.edge(key) is \
+                            self.graph.edge((from_node, to_node, key)))
+        self.assertFalse("not_an_edge" in self.graph)
+        self.assertFalse(["unhashable"] in self.graph)
+
+        self.graph.remove_edge("11_to_13")
+        self.assertFalse("11_to_13" in self.graph)
+        self.assertFalse("11_to_13" in self.graph._edge_ends)
+        self.graph.remove_edge(("1", "2", "1_to_2"))
+        self.assertFalse("1_to_2" in self.graph._edge_ends)
+        self.graph.remove_edges("11", "12")
+        self.assertFalse("11_to_12" in self.graph._edge_ends)
+        self.graph.remove_node("1")
+        self.assertTrue(ends(self.graph._edge_ends) == \
+                        ends(self.graph._make_edge_table()))
+        self.assertFalse("1_to_3" in self.graph)
+
+        # a graph built on a networkx graph indexes its edges
+        other = gfa.GFA(self.graph._graph)
+        self.assertTrue(ends(other._edge_ends) == \
+                        ends(self.graph._edge_ends))
+        self.graph.clear()
+        self.assertTrue(self.graph._edge_ends == {})
+
+
     def test_add_subgraphs (self):
         self.graph.clear ()
 
@@ -283,6 +321,33 @@ class TestLine (unittest.TestCase):
         with self.assertRaises(sg.InvalidSubgraphError):
             self.graph.remove_subgraph("42")
 
+    def test_copy_on_write_subgraphs (self):
+        self.graph.clear ()
+        self.graph.from_string(sample_gfa2)
+        sb = sg.Subgraph.from_line(\
+                path.Path.from_string("P\t14\t11+,12+\t122M"))
+        self.graph.add_subgraph(sb)
+        stored = self.graph.subgraphs("14")
+        self.assertTrue(stored is not sb)
+        self.assertTrue(stored._elements is sb._elements)
+
+        # the first access makes a copy of the shared elements
+        sb.elements["13"] = "+"
+        self.assertTrue(list(stored.elements) == ["11", "12"])
+        self.assertTrue(list(sb.elements) == ["11", "12", "13"])
+
+        copied = self.graph.as_graph_element("14")
+        self.assertTrue(copied == stored)
+        copied.elements.pop("11")
+        self.assertTrue(list(stored.elements) == ["11", "12"])
+
+        # the elements of a subgraph extracted don't change the graph
+        subgraph_15 = self.graph.get_subgraph("15")
+        subgraph_15.node("11")['slen'] = 42
+        self.assertTrue(self.graph.node("11")['slen'] != 42)
+        self.assertTrue(subgraph_15.node("11")['sequence'] == \
+                        self.graph.node("11")['sequence'])
+
 
     def test_as_graph_element (self):
         self.graph.clear ()
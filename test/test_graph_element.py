@@ -5,6 +5,7 @@ import re
 sys.path.insert(0, '../')
 
 from pygfa.graph_element import node, edge as graph_edge, subgraph
+from pygfa.graph_element.lazy_opt_fields import LazyOptFields
 from pygfa.graph_element.parser import header, segment, link, path, containment
 from pygfa.graph_element.parser import fragment, edge, gap, group
 from pygfa.graph_element.parser import line
@@ -389,7 +390,66 @@ class TestGraphElement (unittest.TestCase):
         self.assertTrue (sb.opt_fields['xx'].value == line.fields['xx'].value)
 
 
-        
-        
+    def test_lazy_opt_fields (self):
+        raw_tags = "RC:i:10\txx:Z:a tag\tKC:i:3"
+        eager = {'nid': "1", \
+                 'RC': line.OptField.from_string("RC:i:10"), \
+                 'xx': line.OptField.from_string("xx:Z:a tag"), \
+                 'KC': line.OptField.from_string("KC:i:3")}
+        fields = LazyOptFields({'nid': "1"}, raw_tags)
+        self.assertTrue ('xx' in fields and not 'yy' in fields)
+        self.assertTrue (fields.raw_tags == raw_tags)
+        self.assertTrue (fields['xx'].value == "a tag")
+        self.assertTrue (fields.raw_tags == "RC:i:10\tKC:i:3")
+        self.assertTrue (fields.get('KC').value == 3)
+        self.assertTrue (fields.get('yy') is None)
+        with self.assertRaises (KeyError):
+            fields['yy']
+        self.assertTrue (fields.raw_tags == "RC:i:10")
+
+        copied = copy.deepcopy (fields)
+        self.assertTrue (copied.raw_tags == "RC:i:10")
+        self.assertTrue (copied.pop ('RC').value == 10)
+        self.assertTrue (copied.raw_tags == "" and fields.raw_tags == "RC:i:10")
+        del(fields['RC'])
+        self.assertFalse ('RC' in fields)
+
+        fields = LazyOptFields({'nid': "1"}, raw_tags)
+        self.assertTrue (fields == eager and eager == fields)
+        self.assertTrue (fields.raw_tags == "")
+        fields = LazyOptFields({'nid': "1"}, raw_tags)
+        self.assertTrue (len (fields) == 4)
+        self.assertTrue (sorted (fields.keys()) == sorted (eager.keys()))
+
+    def test_slotted_elements (self):
+        opt_fields = {'RC': line.OptField ('RC', "10", "i"), \
+                      'xx': line.Field ('xx', ["a", "b"])}
+        node_ = node.Node ("1", "ACGT", 4, opt_fields)
+        edge_ = graph_edge.Edge ("e1", "1", "+", "2", "-", \
+                                 ("2", "4$"), ("0", "2"), "2M", \
+                                 opt_fields=opt_fields)
+        for element in (node_, edge_, opt_fields['RC'], opt_fields['xx']):
+            self.assertFalse (hasattr (element, '__dict__'))
+            with self.assertRaises (AttributeError):
+                element.other = None
+
+        # immutable fields are shared, the others are copied
+        for element in (node_, edge_):
+            self.assertTrue (element.opt_fields['RC'] is opt_fields['RC'])
+            self.assertFalse (element.opt_fields['xx'] is opt_fields['xx'])
+            self.assertTrue (element.opt_fields['xx'] == opt_fields['xx'])
+            self.assertTrue (copy.deepcopy (element) == element)
+        self.assertTrue (edge_.from_positions == ("2", "4$"))
+
+        class Positions (tuple):
+            pass
+        positions = Positions (("0", "2"))
+        edge_ = graph_edge.Edge ("e1", "1", "+", "2", "-", \
+                                 positions, positions, "2M")
+        self.assertTrue (type (edge_.from_positions) is tuple)
+        self.assertFalse (edge_.to_positions is positions)
+        self.assertTrue (edge_.to_positions == ("0", "2"))
+
+
 if  __name__ == '__main__':
     unittest.main()
@@ -53,7 +53,33 @@ class TestLine(unittest.TestCase):
         with self.assertRaises(fv.UnknownDataTypeError):
             fv.is_valid("3", "a custom datatype")
 
-    
+    def test_validation_level(self):
+        self.assertTrue(fv.get_validation_level() == fv.STRICT)
+        self.assertTrue(fv.is_valid("ACGT=.acgt", fv.GFA1_SEQUENCE))
+        self.assertTrue(fv.is_valid("*", fv.GFA1_SEQUENCE))
+        self.assertFalse(fv.is_valid("ACG*", fv.GFA1_SEQUENCE))
+        self.assertFalse(fv.is_valid("", fv.GFA1_SEQUENCE))
+        self.assertFalse(fv.is_valid("ACGTà", fv.GFA2_SEQUENCE))
+        self.assertFalse(fv.is_valid("AC GT", fv.GFA2_SEQUENCE))
+        with self.assertRaises(fv.FormatError):
+            fv.is_valid(None, fv.GFA1_SEQUENCE)
+
+        with fv.validation_level(fv.STRUCTURAL):
+            self.assertTrue(fv.get_validation_level() == fv.STRUCTURAL)
+            self.assertTrue(fv.is_valid("AC GT", fv.GFA2_SEQUENCE))
+            self.assertFalse(fv.is_valid("a", fv.GFA2_INT))
+            self.assertFalse(fv.matches("AC GT", fv.GFA2_SEQUENCE))
+            with fv.validation_level(fv.TRUSTED):
+                self.assertTrue(fv.is_valid("a", fv.GFA2_INT))
+                self.assertTrue(fv.validate("1 2", fv.GFA2_IDS) == ["1", "2"])
+            self.assertTrue(fv.get_validation_level() == fv.STRUCTURAL)
+        self.assertTrue(fv.get_validation_level() == fv.STRICT)
+
+        with self.assertRaises(fv.UnknownValidationLevelError):
+            fv.set_validation_level("lazy")
+        self.assertTrue(fv.get_validation_level() == fv.STRICT)
+
+
     def test_field_type(self):
         """Use TestField to check how the different field data types
         are managed.
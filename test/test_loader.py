@@ -0,0 +1,223 @@
+import sys
+sys.path.insert(0, '../')
+
+import io
+import unittest
+
+import pygfa
+from pygfa.loader import stream, parallel, records, record_parser
+from pygfa.graph_element.parser import line, field_validator as fv
+from pygfa.graph_element import node, edge as ge, subgraph as sg
+
+gfa_file = str.join("", ["H\tVN:Z:1.0\n", \
+                         "S\t1\tACGTTGCA\n", \
+                         "S\t2\t*\tLN:i:12\n", \
+                         "S\t3\tTTGCAACG\txx:Z:tag\n", \
+                         "L\t1\t+\t2\t+\t3M\tID:Z:1_to_2\n", \
+                         "L\t2\t-\t3\t+\t2M\n", \
+                         "C\t1\t+\t3\t-\t2\t4M\n", \
+                         "# a comment\n", \
+                         "\n", \
+                         "P\tp1\t1+,2+\t3M\n"])
+
+
+class TestLine (unittest.TestCase):
+
+    def test_parse_line(self):
+        self.assertTrue(stream.parse_line("H\tVN:Z:1.0") is None)
+        self.assertTrue(stream.parse_line("# comment\n") is None)
+        self.assertTrue(stream.parse_line("   \n") is None)
+        self.assertTrue(node.is_node(stream.parse_line("S\t1\tACGT\n")))
+        self.assertTrue(node.is_node(stream.parse_line("S\t1\t4\tACGT\n")))
+        self.assertTrue(ge.is_edge(stream.parse_line("L\t1\t+\t2\t+\t3M")))
+        self.assertTrue(ge.is_edge(\
+            stream.parse_line("E\t*\t1+\t2+\t0\t4\t0\t4\t4M")))
+        self.assertTrue(sg.is_subgraph(stream.parse_line("U\tu1\t1 2")))
+
+    def test_load_lines(self):
+        """Load the graph from a generator of lines and check that it's
+        equal to the one loaded from a whole string.
+        """
+        graph = pygfa.gfa.GFA()
+        lines = (line_ for line_ in io.StringIO(gfa_file))
+        count = stream.load_lines(graph, lines)
+        self.assertTrue(count == 10)
+        self.assertTrue(len(graph.nodes()) == 3)
+        self.assertTrue(len(graph.edges()) == 3)
+        self.assertTrue(len(graph.subgraphs()) == 1)
+        self.assertTrue(graph.edge("virtual_0")['from_node'] == "2")
+
+        same_graph = pygfa.gfa.GFA()
+        same_graph.from_string(gfa_file)
+        self.assertTrue(graph == same_graph)
+
+    def test_from_file(self):
+        graph = pygfa.gfa.GFA.from_file("../data/sample1.gfa")
+        with open("../data/sample1.gfa") as file_handler:
+            same_graph = pygfa.gfa.GFA()
+            same_graph.from_string(file_handler.read())
+        self.assertTrue(len(graph.nodes()) > 0)
+        self.assertTrue(graph == same_graph)
+
+    def test_chunk_offsets(self):
+        path = "../data/sample1.gfa"
+        with open(path, 'rb') as file_handler:
+            data = file_handler.read()
+        chunks = parallel.chunk_offsets(path, chunk_size=64)
+        self.assertTrue(len(chunks) > 1)
+        self.assertTrue(chunks[0][0] == 0 and chunks[-1][1] == len(data))
+        for (_, end), (start, _) in zip(chunks[:-1], chunks[1:]):
+            self.assertTrue(end == start)
+            self.assertTrue(data[start - 1:start] == b"\n")
+
+    def test_records(self):
+        graph = pygfa.gfa.GFA()
+        records.load_records(graph, \
+            parallel.parse_lines_records(gfa_file.split("\n")))
+        same_graph = pygfa.gfa.GFA()
+        same_graph.from_string(gfa_file)
+        self.assertTrue(graph == same_graph)
+        self.assertTrue(graph.edge("virtual_0")['from_node'] == "2")
+        with self.assertRaises(records.InvalidRecordError):
+            records.element_record("S\t1\t*")
+
+    def test_parallel_load(self):
+        path = "../data/sample1.gfa"
+        graph = pygfa.gfa.GFA()
+        parallel.load_file(graph, path, workers=2, chunk_size=64)
+        same_graph = pygfa.gfa.GFA.from_file(path)
+        self.assertTrue(graph == same_graph)
+        self.assertTrue(sorted(graph.edges(keys=True)) == \
+                        sorted(same_graph.edges(keys=True)))
+
+    def test_parse_record(self):
+        self.assertTrue(record_parser.parse_record("H\tVN:Z:1.0") is None)
+        self.assertTrue(record_parser.parse_record("# comment\n") is None)
+        self.assertTrue(record_parser.parse_record("   \n") is None)
+        self.assertTrue(record_parser.parse_record("S\t1\t*\tLN:i:4") == \
+            records.node_record(stream.parse_line("S\t1\t*\tLN:i:4")))
+        for line_ in ("S\t1\t4\tACGT\txx:Z:tag", \
+                      "L\t1\t+\t2\t-\t3M\tID:Z:l1", \
+                      "C\t1\t+\t2\t-\t2\t4M\tNM:i:0", \
+                      "E\t*\t1+\t2-\t10\t20$\t0\t10\t10M", \
+                      "G\tg1\t1+\t2-\t100\t*", \
+                      "F\t1\tread1+\t0\t10\t5\t15\t*", \
+                      "P\tp1\t1+,2-\t3M", \
+                      "O\to1\t1+ 2-", \
+                      "U\tu1\t1 2"):
+            record = record_parser.parse_record(line_)
+            same_record = records.element_record(stream.parse_line(line_))
+            if record[0] == records.SUBGRAPH:
+                self.assertTrue(record[1] == same_record[1])
+            else:
+                self.assertTrue(record == same_record)
+        with self.assertRaises(line.InvalidLineError):
+            record_parser.parse_record("L\t1\t+\t2")
+
+    def test_records_mode(self):
+        graph = pygfa.gfa.GFA()
+        graph.from_string(gfa_file, mode=stream.RECORDS)
+        same_graph = pygfa.gfa.GFA()
+        same_graph.from_string(gfa_file)
+        self.assertTrue(graph == same_graph)
+        self.assertTrue(graph.edge("virtual_0") == \
+                        same_graph.edge("virtual_0"))
+        with self.assertRaises(stream.InvalidModeError):
+            graph.from_string(gfa_file, mode="objects")
+
+        path = "../data/sample1.gfa"
+        graph = pygfa.gfa.GFA()
+        parallel.load_file(graph, path, workers=2, chunk_size=64, \
+                           mode=stream.RECORDS)
+        self.assertTrue(graph == pygfa.gfa.GFA.from_file(path))
+
+    def test_validation(self):
+        bad_sequence = "S\t1\t4\tACGT\nS\t2\t4\tAC GT\n"
+        for mode in (stream.LINES, stream.RECORDS):
+            graph = pygfa.gfa.GFA()
+            with self.assertRaises(Exception):
+                graph.from_string("S\t2\t4\tAC GT", mode=mode)
+            graph.from_string(bad_sequence, mode=mode, \
+                              validation=fv.TRUSTED)
+            self.assertTrue(graph.node("2")['sequence'] == "AC GT")
+            self.assertTrue(fv.get_validation_level() == fv.STRICT)
+            graph = pygfa.gfa.GFA()
+            graph.from_string(bad_sequence, mode=mode, \
+                              validation=fv.STRUCTURAL)
+            self.assertTrue(len(graph.nodes()) == 2)
+            with self.assertRaises(fv.InvalidFieldError):
+                graph.from_string("L\t1\t?\t2\t+\t*", mode=mode, \
+                                  validation=fv.STRUCTURAL)
+
+        path = "../data/sample1.gfa"
+        graph = pygfa.gfa.GFA()
+        parallel.load_file(graph, path, workers=2, chunk_size=64, \
+                           mode=stream.RECORDS, validation=fv.TRUSTED)
+        self.assertTrue(graph == pygfa.gfa.GFA.from_file(path))
+        self.assertTrue(graph.dump(validation=fv.TRUSTED) == graph.dump())
+
+    def test_lazy_mode(self):
+        graph = pygfa.gfa.GFA()
+        graph.from_string(gfa_file, mode=stream.LAZY)
+        self.assertTrue(graph.node("3").raw_tags == "xx:Z:tag")
+        self.assertTrue(graph.search(lambda node_: \
+            node_['xx'].value == "tag", pygfa.gfa.Element.NODE) == ["3"])
+        self.assertTrue(graph.node("3").raw_tags == "")
+        self.assertTrue(graph.edge("1_to_2")['eid'] == "1_to_2")
+        self.assertTrue(graph.node("2")['slen'] == 12)
+
+        same_graph = pygfa.gfa.GFA()
+        same_graph.from_string(gfa_file)
+        self.assertTrue(graph == same_graph)
+
+        path = "../data/sample1.gfa"
+        graph = pygfa.gfa.GFA.from_file(path, mode=stream.LAZY)
+        same_graph = pygfa.gfa.GFA.from_file(path)
+        self.assertTrue(graph.dump() == same_graph.dump())
+        self.assertTrue(graph.dump(2) == same_graph.dump(2))
+        graph = pygfa.gfa.GFA()
+        parallel.load_file(graph, path, workers=2, chunk_size=64, \
+                           mode=stream.LAZY)
+        self.assertTrue(graph.dump() == same_graph.dump())
+        self.assertTrue(graph == same_graph)
+
+    def test_lazy_mode_as_eager(self):
+        # repeated tags are rejected
+        for duplicate in ("S\t1\t*\tLN:i:4\txx:i:1\txx:i:2", \
+                          "L\t1\t+\t2\t+\t*\tID:Z:a\tID:Z:b"):
+            for mode in (stream.LINES, stream.RECORDS, stream.LAZY):
+                graph = pygfa.gfa.GFA()
+                with self.assertRaises(ValueError):
+                    graph.from_string(duplicate, mode=mode)
+
+        # below STRICT validation, lazy decoding keeps the last copy
+        duplicates = "S\t1\t*\tLN:i:4\txx:i:1\txx:i:2\n" \
+                     + "S\t2\t*\n" \
+                     + "L\t1\t+\t2\t+\t*\tID:Z:a\tID:Z:b\txx:i:1\txx:i:2\n"
+        graph = pygfa.gfa.GFA()
+        graph.from_string(duplicates, mode=stream.LAZY, \
+                          validation=fv.STRUCTURAL)
+        self.assertTrue(graph.node("1")['xx'].value == 2)
+        self.assertTrue(graph.edge("b")['xx'].value == 2)
+        graph = pygfa.gfa.GFA()
+        graph.from_string(duplicates, mode=stream.LAZY, \
+                          validation=fv.STRUCTURAL)
+        del graph.node("1")['xx']
+        self.assertTrue(not 'xx' in graph.node("1"))
+        self.assertTrue(not "xx" in graph.node("1").raw_tags)
+
+        # malformed tags are rejected at once with STRICT validation
+        for bad_tag in ("xx:i:four", "xx:x:4", "xx:i", "xx:Z:a:b", "x:Z:a"):
+            bad_line = "S\t1\t*\t" + bad_tag
+            for mode in (stream.LINES, stream.RECORDS, stream.LAZY):
+                graph = pygfa.gfa.GFA()
+                with self.assertRaises((ValueError, fv.InvalidFieldError)):
+                    graph.from_string(bad_line, mode=mode)
+            graph = pygfa.gfa.GFA()
+            graph.from_string(bad_line, mode=stream.LAZY, \
+                              validation=fv.TRUSTED)
+            self.assertTrue(graph.node("1").raw_tags == bad_tag)
+
+
+if  __name__ == '__main__':
+    unittest.main()
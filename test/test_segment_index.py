@@ -0,0 +1,108 @@
+import sys
+sys.path.insert(0, '../')
+
+import gzip
+import os
+import tempfile
+import unittest
+
+from Bio import bgzf
+
+import pygfa
+from pygfa.loader import segment_index
+
+gfa_file = str.join("", ["H\tVN:Z:1.0\n", \
+                         "S\t1\tACGT\n", \
+                         "S\t2\tCGTA\n", \
+                         "S\t3\tGTAC\txx:Z:tag\n", \
+                         "S\t4\tTACG\n", \
+                         "S\t5\tACGG\n", \
+                         "S\t6\tCG\n", \
+                         "L\t1\t+\t2\t+\t3M\n", \
+                         "L\t2\t+\t3\t+\t3M\tID:Z:2_to_3\n", \
+                         "L\t3\t+\t4\t-\t3M\n", \
+                         "L\t4\t-\t5\t+\t3M\n", \
+                         "C\t1\t+\t6\t+\t1\t2M\n", \
+                         "L\t5\t+\t9\t+\t3M\n", \
+                         "P\tp1\t1+,2+\t3M\n"])
+
+
+class TestSegmentIndex (unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "graph.gfa")
+        with open(self.path, 'w') as file_handler:
+            file_handler.write(gfa_file)
+        self.graph = pygfa.gfa.GFA.from_file(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_region(self, region, nodes):
+        self.assertTrue(set(region.nodes()) == nodes)
+        for nid in nodes:
+            self.assertTrue(region.node(nid) == self.graph.node(nid))
+        # edges without id get different virtual ids, so they are
+        # compared by their attributes
+        edges = [data for u, v, data in self.graph.edges_iter(data=True) \
+                 if u in nodes and v in nodes]
+        region_edges = region.edges(data=True)
+        self.assertTrue(len(region_edges) == len(edges))
+        for u, v, data in region_edges:
+            self.assertTrue(data in edges)
+
+    def test_index(self):
+        index = segment_index.build_index(self.path)
+        self.assertTrue(os.path.exists(self.path + ".gfai"))
+        self.assertTrue(len(index) == 7)
+        self.assertTrue([index.name(position) for position in range(7)] == \
+                        ["1", "2", "3", "4", "5", "6", "9"])
+        self.assertTrue("9" in index and not "7" in index)
+        self.assertTrue(index.segment_offset("9") == -1)
+        with open(self.path, 'rb') as file_handler:
+            file_handler.seek(index.segment_offset("3"))
+            self.assertTrue(file_handler.readline() == \
+                            b"S\t3\tGTAC\txx:Z:tag\n")
+        self.assertTrue(sorted(index.dovetails_neighbors(index.find("1"))\
+                               .tolist()) == [index.find("2")])
+        self.assertTrue(index.is_current(self.path))
+
+    def test_load_region(self):
+        region = pygfa.gfa.GFA.load_region(self.path, "3")
+        self.check_region(region, {"2", "3", "4"})
+        region = pygfa.gfa.GFA.load_region(self.path, ["3"], radius=0)
+        self.check_region(region, {"3"})
+        # containments are loaded, but not followed
+        region = pygfa.gfa.GFA.load_region(self.path, ["1", "6"], radius=1, \
+                                           mode="records")
+        self.check_region(region, {"1", "2", "6"})
+        region = pygfa.gfa.GFA.load_region(self.path, ["1"], radius=10)
+        self.check_region(region, {"1", "2", "3", "4", "5", "9"})
+        region = pygfa.gfa.GFA.load_region(self.path, ["7"])
+        self.assertTrue(len(region.nodes()) == 0)
+
+        # the index is built again when the file changes
+        with open(self.path, 'a') as file_handler:
+            file_handler.write("S\t7\tAAAA\n")
+        region = pygfa.gfa.GFA.load_region(self.path, ["7"])
+        self.assertTrue(region.node("7")['sequence'] == "AAAA")
+
+    def test_compressed(self):
+        bgzf_path = self.path + ".bgz"
+        with bgzf.BgzfWriter(bgzf_path, 'wb') as file_handler:
+            file_handler.write(gfa_file.encode())
+        region = pygfa.gfa.GFA.load_region(bgzf_path, ["3"])
+        self.check_region(region, {"2", "3", "4"})
+
+        gzip_path = self.path + ".gz"
+        with gzip.open(gzip_path, 'wb') as file_handler:
+            file_handler.write(gfa_file.encode())
+        with self.assertRaises(segment_index.SegmentIndexError):
+            pygfa.gfa.GFA.load_region(gzip_path, ["3"])
+        with self.assertRaises(segment_index.SegmentIndexError):
+            segment_index.read_index(self.path)
+
+
+if  __name__ == '__main__':
+    unittest.main()
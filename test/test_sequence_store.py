@@ -0,0 +1,76 @@
+import sys
+sys.path.insert(0, '../')
+
+import copy
+import pickle
+import unittest
+
+import pygfa
+from pygfa.storage import sequence_store as ss
+
+
+class TestSequenceStore (unittest.TestCase):
+
+    def test_packed_sequence(self):
+        store = ss.PackedSequenceStore(buffer_size=8)
+        sequences = ["ACGTTGCA", "acgtNNNNRYacgtAC", "T", "GATTACA" * 10, \
+                     "ACGT-ACnnGT"]
+        handles = [store.add(sequence) for sequence in sequences]
+        for sequence, handle in zip(sequences, handles):
+            self.assertTrue(isinstance(handle, ss.PackedSequence))
+            self.assertTrue(len(handle) == len(sequence))
+            self.assertTrue(str(handle) == sequence)
+            self.assertTrue(handle == sequence and sequence == handle)
+            for start in range(len(sequence)):
+                for stop in range(start, len(sequence) + 1):
+                    self.assertTrue(handle[start:stop] == \
+                                    sequence[start:stop])
+            self.assertTrue(handle[-1] == sequence[-1])
+            self.assertTrue(handle[::-1] == sequence[::-1])
+            self.assertTrue(handle + "A" == sequence + "A")
+            self.assertTrue("A" + handle == "A" + sequence)
+            self.assertTrue(copy.deepcopy(handle) is handle)
+            self.assertTrue(pickle.loads(pickle.dumps(handle)) == sequence)
+        self.assertTrue(handles[0] != handles[1])
+        self.assertTrue(len(store) < sum(len(seq) for seq in sequences) / 2)
+        with self.assertRaises(IndexError):
+            handles[2][1]
+
+        self.assertTrue(store.add("*") == "*")
+        self.assertTrue(store.add(handles[0]) is handles[0])
+        self.assertTrue(ss.PackedSequenceStore(min_length=10).add("ACGT") \
+                        == "ACGT")
+        self.assertTrue(ss.reverse_complement(handles[1]) == \
+                        "GTacgtRYNNNNacgt")
+
+    def test_graph_sequence_store(self):
+        path = "../data/sample1.gfa"
+        graph = pygfa.gfa.GFA.from_file(path, \
+            sequence_store=ss.PackedSequenceStore())
+        same_graph = pygfa.gfa.GFA.from_file(path)
+        self.assertTrue(graph.dump() == same_graph.dump())
+        self.assertTrue(graph.dump(2) == same_graph.dump(2))
+        self.assertTrue(isinstance(graph.node("3")['sequence'], \
+                                   ss.PackedSequence))
+        self.assertTrue(graph.node("1")['sequence'] == "*")
+        self.assertTrue(graph.as_graph_element("3") == \
+                        same_graph.as_graph_element("3"))
+
+        path = "../data/compression_test.gfa"
+        graph = pygfa.gfa.GFA.from_file(path, \
+            sequence_store=ss.PackedSequenceStore())
+        graph.compression()
+        same_graph = pygfa.gfa.GFA.from_file(path)
+        same_graph.compression()
+        self.assertTrue(graph.dump() == same_graph.dump())
+
+        path = "../data/check_overlap_test.gfa"
+        graph = pygfa.gfa.GFA.from_file(path, \
+            sequence_store=ss.PackedSequenceStore())
+        same_graph = pygfa.gfa.GFA.from_file(path)
+        self.assertTrue(graph.overlap_consistency() == \
+                        same_graph.overlap_consistency())
+
+
+if  __name__ == '__main__':
+    unittest.main()
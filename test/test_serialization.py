@@ -1,6 +1,10 @@
 import copy
+import glob
+import io
+import os
 import sys
 import logging
+import tempfile
 sys.path.insert(0, '../')
 
 import networkx as nx
@@ -11,6 +15,7 @@ from pygfa.graph_element.parser import fragment, edge, gap, group
 from pygfa.graph_element.parser import line, field_validator as fv
 from pygfa.graph_element import node, edge as ge, subgraph as sg
 from pygfa.serializer import gfa1_serializer as gs1, gfa2_serializer as gs2
+from pygfa.serializer import converter, parallel
 from pygfa import gfa
 
 logging.basicConfig(level=logging.DEBUG)
@@ -480,6 +485,176 @@ class TestLine (unittest.TestCase):
         self.assertTrue(another_equal_graph.subgraphs() == \
                             same_graph.subgraphs())
 
+
+    def test_streaming_dump(self):
+        graph = gfa.GFA.from_file("../data/sample1.gfa")
+        for version in (1, 2):
+            dump_ = graph.dump(version)
+            lines = list(graph.iter_lines(version))
+            self.assertTrue(str.join("", [line_ + "\n" for line_ in lines]) \
+                            == dump_)
+            out = io.StringIO()
+            graph.dump(version, out=out, buffer_size=10)
+            self.assertTrue(out.getvalue() == dump_)
+            with tempfile.TemporaryDirectory() as directory:
+                path_ = os.path.join(directory, "graph.gfa")
+                graph.dump(version, out=path_)
+                with open(path_) as file_handler:
+                    self.assertTrue(file_handler.read() == dump_)
+
+        serializer = (gs1, gs2)
+        for version in (1, 2):
+            without_header = serializer[version - 1].serialize_graph(\
+                                graph._graph, write_header=False)
+            self.assertTrue(not without_header.startswith("H"))
+            self.assertTrue(graph.dump(version).startswith(\
+                                "H\tVN:Z:{0}.0\n".format(version)))
+
+        # the validation level is set only while the lines are made
+        lines = graph.iter_lines(validation=fv.TRUSTED)
+        next(lines)
+        self.assertTrue(fv.get_validation_level() != fv.TRUSTED)
+        with self.assertRaises(ValueError):
+            graph.iter_lines(3)
+
+    def test_parallel_dump(self):
+        for path_ in ("../data/sample1.gfa", "../data/sample2.gfa"):
+            graph = gfa.GFA.from_file(path_)
+            for version in (1, 2):
+                dump_ = graph.dump(version)
+                self.assertTrue(parallel.dump(graph, None, 2, version, \
+                                              chunk_size=2) == dump_)
+                self.assertTrue(graph.dump(version, workers=2) == dump_)
+                out = io.StringIO()
+                graph.dump(version, out=out, workers=2)
+                self.assertTrue(out.getvalue() == dump_)
+
+    def test_trusted_serialization(self):
+        # the trusted fast path must give the same output
+        # of the validating serializers
+        for path_ in sorted(glob.glob("../data/*.gfa")):
+            for mode in ("lines", "records", "lazy"):
+                graph = gfa.GFA.from_file(path_, mode=mode)
+                for version in (1, 2):
+                    self.assertTrue(graph.dump(version) == \
+                                    graph.dump(version, \
+                                               validation=fv.TRUSTED))
+
+    def check_edge_lines(self, converted, dump):
+        """Check that the edges already with positions are kept as
+        they are, and that the positions of the edges converted from
+        links and containments are inside their segments, marked with
+        `$` at their end.
+        """
+        lines = converted.splitlines()
+        lengths = {line_.split("\t")[1]: int(line_.split("\t")[2]) \
+                   for line_ in lines if line_[0] == "S"}
+        edges = [line_ for line_ in lines if line_[0] == "E"]
+        kept = set(line_ for line_ in dump.splitlines() if line_[0] == "E")
+        self.assertTrue(kept <= set(edges))
+        for line_ in edges:
+            if line_ in kept:
+                continue
+            fields = line_.split("\t")
+            for reference, positions in ((fields[2], fields[4:6]), \
+                                         (fields[3], fields[6:8])):
+                length = lengths[reference[:-1]]
+                values = [int(position.rstrip("$")) for position in positions]
+                self.assertTrue(0 <= values[0] <= values[1] <= length)
+                for value, position in zip(values, positions):
+                    self.assertTrue((value == length) == \
+                                    position.endswith("$"))
+
+    def test_streaming_conversion(self):
+        def convert(path_, version):
+            out = io.StringIO()
+            converter.convert(path_, out, version)
+            return out.getvalue()
+
+        def elements(lines, skip="H"):
+            return sorted(line_ for line_ in lines.splitlines() \
+                          if line_[0] not in skip)
+
+        for path_ in sorted(glob.glob("../data/*.gfa")):
+            graph = gfa.GFA.from_file(path_)
+            for version in (1, 2):
+                converted = convert(path_, version)
+                self.assertTrue(converted.splitlines()[0] == \
+                                graph.dump(version).splitlines()[0])
+                # the graph path drops links and containments
+                # in GFA2, they become edges here
+                self.assertTrue(elements(converted, "HE") == \
+                                elements(graph.dump(version), "HE"))
+                if version == 2:
+                    self.check_edge_lines(converted, graph.dump(2))
+
+        # segment 0 has no sequence (and a trailing blank), so its
+        # links have no positions
+        converted = convert("../data/check_overlap_test.gfa", 2)
+        self.assertTrue("E\t1_to_2\t1+\t2+\t0$\t5\t0\t5\t5M" \
+                        not in converted.splitlines())
+        self.assertTrue("E\t2_to_6\t2+\t6+\t8\t12$\t0\t4\t4M" \
+                        in converted.splitlines())
+        self.assertTrue(not any(line_.startswith("E\t0_to_") \
+                                for line_ in converted.splitlines()))
+
+        # overlaps longer than their segments have no positions
+        attributes = {'eid': "1_to_2", 'from_node': "1", 'from_orn': "+", \
+                      'to_node': "2", 'to_orn': "+", 'alignment': "6M"}
+        with self.assertRaises(converter.ConversionError):
+            converter.edge_line(attributes, {"1": 5, "2": 10})
+        with self.assertRaises(converter.ConversionError):
+            converter.edge_line(attributes, {"1": 10, "2": 5})
+        self.assertTrue(converter.edge_line(attributes, {"1": 6, "2": 6}) \
+                        == "E\t1_to_2\t1+\t2+\t0\t6$\t0\t6$\t6M")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # links round trip through GFA2 edges (only the dovetails
+            # between segments with the same orientation are
+            # recognized in GFA2)
+            gfa2_path = os.path.join(tmp_dir, "example1.gfa")
+            with open(gfa2_path, "w") as gfa2_file:
+                converter.convert("../data/example1.gfa", gfa2_file, 2)
+            with open("../data/example1.gfa") as gfa1_file:
+                gfa1_lines = elements(gfa1_file.read())
+            gfa1_links = [line_ for line_ in gfa1_lines \
+                          if line_[0] == "L" \
+                          and line_.split("\t")[2] == line_.split("\t")[4]]
+            back = elements(convert(gfa2_path, 1))
+            self.assertTrue(set(back) <= set(gfa1_lines))
+            self.assertTrue(set(gfa1_links) <= set(back))
+            gfa2 = gfa.GFA.from_file(gfa2_path)
+            gfa1 = gfa.GFA.from_file("../data/example1.gfa")
+            self.assertTrue(len(gfa2.edges()) == len(gfa1.edges()) == 24)
+
+            path_ = os.path.join(tmp_dir, "graph.gfa")
+            with open(path_, "w") as gfa_file:
+                gfa_file.write(str.join("\n", [ \
+                    "H\tVN:Z:1.0\tac:Z:test", \
+                    "S\t1\tACGTACGTAC", \
+                    "S\t2\t*\tLN:i:8", \
+                    "S\t3\tACGT", \
+                    "S\t4\t*", \
+                    "L\t1\t-\t2\t-\t3M1D2M\tID:Z:1_to_2\txx:i:1", \
+                    "L\t1\t+\t4\t+\t3M", \
+                    "L\t2\t+\t3\t+\t*", \
+                    "C\t1\t+\t3\t-\t6\t4M", \
+                    "P\t5\t1+,2-\t*"]))
+            converted = convert(path_, 2).splitlines()
+            self.assertTrue(converted == [ \
+                "H\tVN:Z:2.0", \
+                "H\tac:Z:test", \
+                "S\t1\t10\tACGTACGTAC", \
+                "S\t2\t8\t*", \
+                "S\t3\t4\tACGT", \
+                "S\t4\t0\t*", \
+                "E\t1_to_2\t1-\t2-\t0\t6\t3\t8$\t3M1D2M\txx:i:1", \
+                "E\t*\t1+\t3-\t6\t10$\t0\t4$\t4M", \
+                "O\t5\t1+ 2-"])
+
+            with self.assertRaises(ValueError):
+                convert(path_, 3)
+
                     
 if  __name__ == '__main__': # pragma: no cover
     unittest.main()
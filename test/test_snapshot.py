@@ -0,0 +1,90 @@
+import sys
+sys.path.insert(0, '../')
+
+import os
+import tempfile
+import unittest
+
+import pygfa
+from pygfa.graph_element.parser import line
+from pygfa.loader import stream
+from pygfa.storage import snapshot, sequence_store as ss
+
+gfa_file = str.join("", ["H\tVN:Z:1.0\n", \
+                         "S\t1\tACGTTGCAnnnNNRYacgt\n", \
+                         "S\t2\t*\tLN:i:12\n", \
+                         "S\t3\tTTGCAACG\txx:Z:tag\tzz:f:1.5\n", \
+                         "L\t1\t+\t2\t+\t3M\tID:Z:1_to_2\n", \
+                         "L\t2\t-\t3\t+\t2M\n", \
+                         "L\t3\t-\t4\t+\t2M\tab:i:3\n", \
+                         "C\t1\t+\t3\t-\t2\t4M\n", \
+                         "P\tp1\t1+,2+\t3M\n"])
+
+
+class TestSnapshot (unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".snapshot")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_snapshot(self):
+        for mode in (stream.LINES, stream.LAZY):
+            graph = pygfa.gfa.GFA()
+            graph.from_string(gfa_file, mode=mode)
+            graph.node("1")['extra'] = [1, 2]
+            graph.save_snapshot(self.path)
+            same_graph = pygfa.gfa.GFA.load_snapshot(self.path)
+            self.assertTrue(same_graph.node("3").raw_tags == \
+                            "xx:Z:tag\tzz:f:1.5")
+            self.assertTrue(graph == same_graph and same_graph == graph)
+            self.assertTrue(graph.dump() == same_graph.dump())
+            self.assertTrue(same_graph.node("1")['extra'] == [1, 2])
+            self.assertTrue(same_graph.node("4") == {})
+            self.assertTrue(same_graph.subgraphs("p1") is not None)
+            self.assertTrue(same_graph._get_virtual_id(False) == \
+                            graph._get_virtual_id(False))
+
+            same_graph = pygfa.gfa.GFA.load_snapshot(self.path, \
+                sequence_store=ss.PackedSequenceStore())
+            self.assertTrue(isinstance(same_graph.node("1")['sequence'], \
+                                       ss.PackedSequence))
+            self.assertTrue(graph == same_graph)
+
+        graph = pygfa.gfa.GFA.from_file("../data/sample2.gfa")
+        graph.save_snapshot(self.path)
+        same_graph = pygfa.gfa.GFA.load_snapshot(self.path)
+        self.assertTrue(graph == same_graph)
+        self.assertTrue(graph.dump(2) == same_graph.dump(2))
+
+        # the attributes that don't fit the columns are stored as data
+        graph = pygfa.gfa.GFA()
+        graph.from_string(gfa_file)
+        extras = {'tuple': (1, "a", None), \
+                  'dict': {1: [2.5, True], "b": {"c": b"\x00\xff"}}, \
+                  'field': line.Field('pos', [1, 2]), \
+                  'optfield': line.OptField('zz', '{"a": [1]}', 'J')}
+        graph.node("1").update(extras)
+        graph.save_snapshot(self.path)
+        same_graph = pygfa.gfa.GFA.load_snapshot(self.path)
+        for key, value in extras.items():
+            self.assertTrue(same_graph.node("1")[key] == value)
+        self.assertTrue(isinstance(same_graph.node("1")['tuple'], tuple))
+        self.assertTrue(same_graph.subgraphs("p1").elements == \
+                        graph.subgraphs("p1").elements)
+        self.assertTrue(graph == same_graph)
+
+        graph.node("1")['object'] = object()
+        with self.assertRaises(snapshot.SnapshotError):
+            graph.save_snapshot(self.path)
+
+        with open(self.path, 'wb') as file_handler:
+            file_handler.write(b"S\t1\t*\n" * 4)
+        with self.assertRaises(snapshot.SnapshotError):
+            pygfa.gfa.GFA.load_snapshot(self.path)
+
+
+if  __name__ == '__main__':
+    unittest.main()
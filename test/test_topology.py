@@ -0,0 +1,86 @@
+import sys
+sys.path.insert(0, '../')
+
+import gzip
+import os
+import tempfile
+import unittest
+
+import pygfa
+from pygfa.loader import topology, compressed
+from pygfa.storage import file_sequences as fs, sequence_store as ss
+
+
+class TestTopology (unittest.TestCase):
+
+    def test_sequence_span(self):
+        line_ = b"S\t11\tACGT\tLN:i:4\n"
+        start, end = topology.sequence_span(line_)
+        self.assertTrue(line_[start:end] == b"ACGT")
+        line_ = b"S\t11\t4\tACGT\n"
+        start, end = topology.sequence_span(line_)
+        self.assertTrue(line_[start:end] == b"ACGT")
+        line_ = b"S\t11\tACGT\r\n"
+        start, end = topology.sequence_span(line_)
+        self.assertTrue(line_[start:end] == b"ACGT")
+        self.assertTrue(topology.sequence_span(b"S\t11\n") is None)
+        line_ = b"S\t0\t* \n"
+        start, end = topology.sequence_span(line_)
+        self.assertTrue(line_[start:end] == b"*")
+
+    def test_topology_only(self):
+        # check_overlap_test.gfa has a segment line with a trailing blank
+        for path in ("../data/sample1.gfa", "../data/sample2.gfa", \
+                     "../data/compression_test.gfa", \
+                     "../data/check_overlap_test.gfa"):
+            graph = pygfa.gfa.GFA.from_file(path)
+            for mode in ("lines", "records", "lazy"):
+                same_graph = pygfa.gfa.GFA.from_file(path, mode=mode, \
+                                                     topology_only=True)
+                self.assertTrue(graph == same_graph)
+                self.assertTrue(graph.dump() == same_graph.dump())
+                self.assertTrue(graph.dump(2) == same_graph.dump(2))
+
+        graph = pygfa.gfa.GFA.from_file("../data/sample1.gfa", \
+                                        topology_only=True, cache_size=100)
+        self.assertTrue(graph.node("1")['sequence'] == "*")
+        sequence = graph.node("3")['sequence']
+        self.assertTrue(isinstance(sequence, fs.FileSequence))
+        self.assertTrue(sequence[:4] == "CGAT")
+        self.assertTrue(sequence.reverse_complement() == \
+                        ss.reverse_complement(str(sequence)))
+        self.assertTrue(graph.node("3")['slen'] == len(sequence) == 29)
+
+        with self.assertRaises(pygfa.gfa.GFAError):
+            pygfa.gfa.GFA.from_file("../data/sample1.gfa", \
+                                    topology_only=True, \
+                                    sequence_store=ss.PackedSequenceStore())
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sample1.gfa.gz")
+            with gzip.open(path, 'wb') as file_handler:
+                with open("../data/sample1.gfa", 'rb') as source:
+                    file_handler.write(source.read())
+            with self.assertRaises(compressed.CompressionError):
+                pygfa.gfa.GFA.from_file(path, topology_only=True)
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sequences")
+            with open(path, 'w') as file_handler:
+                file_handler.write("AAAACCCCGGGG")
+            source = fs.FileSequenceSource(path, cache_size=8)
+            first = source.sequence(0, 4)
+            second = source.sequence(4, 4)
+            third = source.sequence(8, 4)
+            self.assertTrue(first[1:3] == "AA" and len(source._cache) == 0)
+            self.assertTrue(str(first) == "AAAA")
+            self.assertTrue(str(second) == "CCCC")
+            self.assertTrue(str(third) == "GGGG")
+            self.assertTrue(list(source._cache) == [4, 8])
+            self.assertTrue(first == "AAAA" and first != second)
+            self.assertTrue(first == source.sequence(0, 4))
+            source.close()
+
+
+if  __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import sys
+sys.path.insert(0, '../')
+
+import unittest
+
+import numpy as np
+
+import pygfa
+from pygfa.dovetail_operations.components import union_find
+
+#
+# --- = dovetail overlap
+# ~~~ = other overlap
+#
+# [s1] --- [s2] --- [s3] ~~~ [s4] --- [s5]    [s6]
+#
+gfa_file = str.join("", ["S\ts1\t25\t*\n", \
+                         "S\ts2\t21\t*\n", \
+                         "S\ts3\t10\t*\n", \
+                         "S\ts4\t12\t*\n", \
+                         "S\ts5\t*\n", \
+                         "S\ts6\t7\t*\n", \
+                         "E\tl12\ts1+\ts2+\t20\t24$\t0\t4\t*\n", \
+                         "E\tl23\ts2+\ts3+\t18\t20$\t0\t2\t*\n", \
+                         "E\tlgeneric34\ts3+\ts4+\t5\t8\t0\t3\t*\n", \
+                         "E\tl45\ts4+\ts5+\t9\t11$\t0\t2\t*\n"])
+
+class TestUnionFind(unittest.TestCase):
+
+    graph = pygfa.gfa.GFA()
+
+    def test_dovetails_component_labels(self):
+        self.graph.clear()
+        self.graph.from_string(gfa_file)
+        nodes, labels, sizes, lengths = \
+            pygfa.dovetails_component_labels(self.graph)
+        components = {nid: label for nid, label in zip(nodes, labels)}
+        self.assertTrue(components["s1"] == components["s2"] \
+                        == components["s3"])
+        self.assertTrue(components["s4"] == components["s5"])
+        self.assertTrue(len(set(components.values())) == 3)
+        self.assertTrue(sizes[components["s1"]] == 3)
+        self.assertTrue(lengths[components["s1"]] == 56)
+        # s5 has no known length
+        self.assertTrue(lengths[components["s4"]] == 12)
+        self.assertTrue(lengths[components["s6"]] == 7)
+
+        frozen_nodes, frozen_labels, frozen_sizes, frozen_lengths = \
+            pygfa.dovetails_component_labels(self.graph.freeze())
+        frozen_components = {nid: label for nid, label \
+                             in zip(frozen_nodes, frozen_labels)}
+        self.assertTrue(frozen_components == components)
+        self.assertTrue(frozen_sizes.tolist() == sizes.tolist())
+        self.assertTrue(frozen_lengths.tolist() == lengths.tolist())
+
+    def test_union_find_labels(self):
+        random = np.random.RandomState(0)
+        from_nodes = random.randint(0, 1000, size=600)
+        to_nodes = random.randint(0, 1000, size=600)
+        roots = union_find.union_find_labels(1000, from_nodes, to_nodes)
+        # the root of each component is its smallest node
+        for from_node, to_node in zip(from_nodes, to_nodes):
+            self.assertTrue(roots[from_node] == roots[to_node])
+            self.assertTrue(roots[from_node] <= min(from_node, to_node))
+        self.assertTrue(np.all(roots[roots] == roots))
+        self.assertTrue(len(np.unique(roots)) == \
+                        1000 - len(union_find.forest_pairs(from_nodes, \
+                                                           to_nodes)[0]))
+
+        parallel = union_find.union_find_labels(1000, from_nodes, to_nodes, \
+                                                workers=2, chunk_size=50)
+        self.assertTrue(parallel.tolist() == roots.tolist())
+
+    def test_no_edges(self):
+        roots = union_find.union_find_labels(3, [], [])
+        self.assertTrue(roots.tolist() == [0, 1, 2])
+        self.graph.clear()
+        nodes, labels, sizes, lengths = \
+            pygfa.dovetails_component_labels(self.graph)
+        self.assertTrue(nodes == [] and len(labels) == 0 \
+                        and len(sizes) == 0 and len(lengths) == 0)
+
+
+if  __name__ == '__main__':
+    unittest.main()
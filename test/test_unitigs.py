@@ -0,0 +1,80 @@
+import sys
+sys.path.insert(0, '../')
+
+import unittest
+
+import pygfa
+from pygfa.dovetail_operations import unitigs
+
+#
+# [a+] --- [b-] --- [c+] --- [d+]
+#                       \--- [e+]
+#
+# [f+] --- [g+] --- [h-] --- (back to f+)
+#
+# [i+] --- (back to i+), [j] overlaps itself on its right end,
+# [k] has no overlaps
+#
+gfa_file = str.join("\n", ["S\ta\t*", \
+                           "S\tb\t*", \
+                           "S\tc\t*", \
+                           "S\td\t*", \
+                           "S\te\t*", \
+                           "S\tf\t*", \
+                           "S\tg\t*", \
+                           "S\th\t*", \
+                           "S\ti\t*", \
+                           "S\tj\t*", \
+                           "S\tk\t*", \
+                           "L\ta\t+\tb\t-\t*", \
+                           "L\tb\t-\tc\t+\t*", \
+                           "L\tc\t+\td\t+\t*", \
+                           "L\tc\t+\te\t+\t*", \
+                           "L\tf\t+\tg\t+\t*", \
+                           "L\tg\t+\th\t-\t*", \
+                           "L\th\t-\tf\t+\t*", \
+                           "L\ti\t+\ti\t+\t*", \
+                           "L\tj\t+\tj\t-\t*"])
+
+class TestUnitigs(unittest.TestCase):
+
+    graph = pygfa.gfa.GFA()
+
+    def test_dovetails_unitigs(self):
+        self.graph.clear()
+        self.graph.from_string(gfa_file)
+        unitigs_ = list(pygfa.dovetails_unitigs(self.graph))
+        self.assertTrue(unitigs_ == [[("a", "+"), ("b", "-"), ("c", "+")], \
+                                     [("d", "+")], \
+                                     [("e", "+")], \
+                                     [("j", "+")], \
+                                     [("k", "+")], \
+                                     [("f", "+"), ("g", "+"), ("h", "-")], \
+                                     [("i", "+")]])
+        self.assertTrue(list(pygfa.dovetails_unitigs(self.graph.freeze())) \
+                        == unitigs_)
+
+        self.graph.remove_edge(("c", "e"))
+        self.assertTrue(\
+            [("a", "+"), ("b", "-"), ("c", "+"), ("d", "+")] in \
+            pygfa.dovetails_unitigs(self.graph))
+
+    def test_unitigs_cover_the_graph(self):
+        graph = pygfa.gfa.GFA.from_file("../data/example1.gfa")
+        unitigs_ = list(pygfa.dovetails_unitigs(graph))
+        nodes = [nid for unitig in unitigs_ for nid, _ in unitig]
+        self.assertTrue(sorted(nodes) == sorted(graph.nodes()))
+        for unitig in unitigs_:
+            for (from_node, _), (to_node, _) in zip(unitig, unitig[1:]):
+                self.assertTrue(to_node in graph.dovetails_neighbors(from_node))
+
+    def test_end_partners(self):
+        # a self loop on a single segment end counts as two overlaps
+        partners = unitigs.end_partners(3, [[0, 1], [2, 2]], [[1, 0], [1, 1]])
+        self.assertTrue(partners.tolist() == [-1, 2, 1, -1, -1, -1])
+        self.assertTrue(list(unitigs.unitig_ids(partners)) == \
+                        [[0, 2], [4]])
+
+
+if  __name__ == '__main__':
+    unittest.main()